@@ -1,17 +1,25 @@
 from __future__ import annotations
 
 import os
+import queue
+import re
+import select
+import selectors
+import socket
 import subprocess
 import threading
-import time
 from dataclasses import dataclass
-from typing import Callable, Optional
-
-import psutil
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 
 from logger import Logger
+from core.scanner import net_connections, process_names
 from core.settings_manager import SettingsManager
 
+_CONFIGS_DIR_READY = False
+
+# anchored at the start: only scans leading whitespace, never the whole (possibly MB-sized) config
+_JSON_OBJ_START = re.compile(r"[ \t\r\n]*\{")
+
 
 @dataclass
 class EngineStatus:
@@ -20,11 +28,18 @@ class EngineStatus:
     message: str
 
 
+class PortInfo(NamedTuple):
+    port: int
+    pid: int
+    name: str
+
+
 @dataclass
 class CoreSpec:
     name: str
     binary: Optional[str]
     kind: str
+    has_children: bool = False  # core forks helpers that must be stopped with it
 
 
 class EngineManager:
@@ -44,21 +59,34 @@ class EngineManager:
         self.logger = logger or Logger()
         self._running = False
 
-        self._stop_evt = threading.Event()
-        self._worker: Optional[threading.Thread] = None
-
         self._proc: Optional[subprocess.Popen] = None
+        self._core_has_children = False
+        self._core_alive = False  # plain bool; written under _proc_lock, read lock-free
         self._proc_lock = threading.Lock()
 
         self._status_msg = "Engine is OFF"
 
+        self._singbox_path: Optional[str] = None
+
+        # called (from any thread) when engine/core state changes, e.g. so the UI can re-read ports
+        self._state_listeners: List[Callable[[], None]] = []
+
+    def add_state_listener(self, cb: Callable[[], None]):
+        self._state_listeners.append(cb)
+
+    def _notify_state(self):
+        for cb in list(self._state_listeners):
+            try:
+                cb()
+            except Exception:
+                pass
+
     def set_log_callback(self, cb: Optional[Callable[[str], None]]):
         self.logger.set_callback(cb)
 
     def status(self) -> EngineStatus:
-        with self._proc_lock:
-            core_on = self._proc is not None and self._proc.poll() is None
-        return EngineStatus(running=self._running, core_process=core_on, message=self._status_msg)
+        # _core_alive is kept current by the shared core watcher
+        return EngineStatus(running=self._running, core_process=self._core_alive, message=self._status_msg)
 
     def is_running(self) -> bool:
         return self._running
@@ -68,15 +96,12 @@ class EngineManager:
             self.logger.warn("Engine already running.")
             return False
 
-        self._stop_evt.clear()
+        # no per-engine thread: crashed cores are detected by the shared _WATCHER
         self._running = True
         self._status_msg = "Engine is ON"
 
-        # Lightweight worker to keep state consistent and detect crashed core
-        self._worker = threading.Thread(target=self._run_loop, name="UmbraEngineLoop", daemon=True)
-        self._worker.start()
-
         self.logger.info("Engine started.")
+        self._notify_state()
         return True
 
     def stop_engine(self) -> bool:
@@ -84,46 +109,41 @@ class EngineManager:
             return False
 
         self.logger.info("Stopping engine...")
-        self._stop_evt.set()
 
         # stop core process first (if any)
         self._stop_core_process()
 
-        # stop worker thread
-        if self._worker and self._worker.is_alive():
-            self._worker.join(timeout=3.0)
-
-        self._worker = None
         self._running = False
         self._status_msg = "Engine is OFF"
         self.logger.info("Engine stopped.")
+        self._notify_state()
         return True
 
-    def detect_listening_ports(self, limit: int = 8):
-        ports = []
+    def detect_listening_ports(self, limit: int = 8) -> List[PortInfo]:
+        import psutil
+
+        ports: List[PortInfo] = []
         try:
-            conns = psutil.net_connections(kind="inet")
+            conns = net_connections(kind="inet")
         except Exception:
             return ports
+        listening = []
         for c in conns:
             try:
                 if c.status != psutil.CONN_LISTEN:
                     continue
-                laddr = c.laddr
-                port = getattr(laddr, "port", None)
+                port = getattr(c.laddr, "port", None)
                 if not port:
                     continue
-                pid = c.pid or 0
-                name = "-"
-                if pid:
-                    try:
-                        name = psutil.Process(pid).name()
-                    except Exception:
-                        name = "-"
-                ports.append({"port": int(port), "pid": int(pid), "name": name})
+                listening.append((int(port), int(c.pid or 0)))
             except Exception:
                 continue
-        ports = sorted(ports, key=lambda x: x["port"])
+
+        # many sockets usually share a few pids; resolve each pid once
+        names = process_names(pid for _, pid in listening if pid)
+        for port, pid in listening:
+            ports.append(PortInfo(port, pid, names.get(pid, "-") if pid else "-"))
+        ports.sort()  # PortInfo orders by port first
         return ports[: max(0, limit)]
 
     def _core_spec(self, core_name: str) -> CoreSpec:
@@ -134,9 +154,9 @@ class EngineManager:
         if core_name in {"clash", "mihomo"}:
             return CoreSpec(name="clash", binary=None, kind="yaml")
         if core_name == "openvpn":
-            return CoreSpec(name="openvpn", binary=paths.get("openvpn") or None, kind="ovpn")
+            return CoreSpec(name="openvpn", binary=paths.get("openvpn") or None, kind="ovpn", has_children=True)
         if core_name == "openconnect":
-            return CoreSpec(name="openconnect", binary=paths.get("openconnect") or None, kind="url")
+            return CoreSpec(name="openconnect", binary=paths.get("openconnect") or None, kind="url", has_children=True)
         return CoreSpec(name=core_name, binary=None, kind="unknown")
 
     def _start_unsupported_core(self, spec: CoreSpec) -> bool:
@@ -155,14 +175,14 @@ class EngineManager:
                 self.logger.warn("Core already running.")
                 return False
 
-        raw = (cfg.get("raw") or "").strip()
-        if not raw:
+        raw = cfg.get("raw") or ""
+        if not raw or raw.isspace():
             self.logger.error("Config is empty; cannot start core.")
             return False
 
         spec = self._core_spec(str(cfg.get("core", "auto") or "auto"))
         if spec.name == "singbox":
-            return self._start_singbox(raw)
+            return self._start_singbox(raw, has_children=spec.has_children)
         if spec.name in {"clash", "openvpn", "openconnect"}:
             return self._start_unsupported_core(spec)
 
@@ -173,8 +193,8 @@ class EngineManager:
         self._stop_core_process()
         return True
 
-    def _start_singbox(self, raw: str) -> bool:
-        if not raw.lstrip().startswith("{"):
+    def _start_singbox(self, raw: str, has_children: bool = False) -> bool:
+        if not _JSON_OBJ_START.match(raw):
             self.logger.error("Sing-box requires JSON config; provided config is not JSON.")
             return False
 
@@ -189,32 +209,55 @@ class EngineManager:
             return False
 
         try:
-            proc = subprocess.Popen([core_path, "run", "-c", cfg_path])
+            proc = _spawn([core_path, "run", "-c", cfg_path])
             with self._proc_lock:
                 self._proc = proc
+                self._core_has_children = has_children
+                self._core_alive = True
+            _WATCHER.watch(proc, self._on_core_exit)
             self._status_msg = "Core running: sing-box"
             self.logger.info("Sing-box core started.")
+            self._notify_state()
             return True
         except Exception as exc:
             self.logger.error(f"Failed to start sing-box: {exc}")
             return False
 
+    def invalidate_core_paths(self):
+        # call after installing/replacing core binaries (Updates page)
+        self._singbox_path = None
+
     def _find_singbox_binary(self) -> Optional[str]:
+        if self._singbox_path is not None:
+            return self._singbox_path
         candidates = [
             "cores/sing-box/sing-box",
             "cores/sing-box/sing-box.exe",
         ]
         for path in candidates:
             if os.path.exists(path):
+                self._singbox_path = path
                 return path
         return None
 
     def _write_active_config(self, core_name: str, raw: str) -> Optional[str]:
+        global _CONFIGS_DIR_READY
         try:
-            os.makedirs("configs", exist_ok=True)
+            if not _CONFIGS_DIR_READY:
+                os.makedirs("configs", exist_ok=True)
+                _CONFIGS_DIR_READY = True
             path = os.path.join("configs", f"active_{core_name}.json")
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(raw)
+            tmp = path + ".tmp"
+            # write to a temp file and rename, so a crash never leaves a half-written config
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+            try:
+                # os.write may write less than asked (large buffers); loop over a view, no copies
+                view = memoryview(raw.encode("utf-8"))
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+            os.replace(tmp, path)
             return path
         except Exception:
             return None
@@ -230,31 +273,55 @@ class EngineManager:
     # Internal
     # ---------------------
 
-    def _run_loop(self):
-        # No active bandwidth tests here. Only health checks.
-        while not self._stop_evt.is_set():
-            # if a core is running and it exited, notify
-            with self._proc_lock:
-                if self._proc is not None and self._proc.poll() is not None:
-                    self.logger.error("VPN core process exited unexpectedly.")
-                    self._proc = None
-            time.sleep(0.5)
+    def _on_core_exit(self, proc: subprocess.Popen):
+        # runs on the watcher thread
+        with self._proc_lock:
+            if self._proc is not proc:
+                return  # already stopped / replaced
+            self.logger.error("VPN core process exited unexpectedly.")
+            self._proc = None
+            self._core_alive = False
+        self._notify_state()
 
     def _stop_core_process(self):
         with self._proc_lock:
             proc = self._proc
+            has_children = self._core_has_children
             self._proc = None
+            self._core_alive = False
 
         if not proc:
             return
+        _WATCHER.unwatch(proc)
 
         try:
             self.logger.info("Stopping VPN core process...")
-            self._terminate_process_tree(proc.pid, timeout=3.0)
+            if has_children:
+                self._terminate_process_tree(proc.pid, timeout=3.0)
+            else:
+                self._terminate_single(proc, timeout=3.0)
         except Exception as e:
             self.logger.error(f"Failed to stop core process: {e}")
+        self._notify_state()
+
+    def _terminate_single(self, proc: subprocess.Popen, timeout: float = 3.0):
+        # cores that don't fork: no children(recursive=True) walk, and a blocking
+        # wait instead of psutil.wait_procs' 10 ms poll loop
+        try:
+            proc.terminate()
+        except Exception:
+            pass
+        if _wait_exit(proc, timeout):
+            return
+        try:
+            proc.kill()
+        except Exception:
+            pass
+        _wait_exit(proc, 1.0)
 
     def _terminate_process_tree(self, pid: int, timeout: float = 3.0):
+        import psutil
+
         try:
             parent = psutil.Process(pid)
         except Exception:
@@ -284,3 +351,160 @@ class EngineManager:
                 p.kill()
             except Exception:
                 pass
+
+
+def _spawn(argv: list) -> subprocess.Popen:
+    # POSIX: CPython >= 3.10 already launches through vfork, so Popen is the fast path.
+    # Windows: cores are console binaries; skip allocating a console (conhost) for them.
+    kwargs = {"stdin": subprocess.DEVNULL}
+    if os.name == "nt":
+        kwargs["creationflags"] = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+    return subprocess.Popen(argv, **kwargs)
+
+
+def _wait_exit(proc: subprocess.Popen, timeout: float) -> bool:
+    """Block (in the kernel, not a sleep loop) until proc exits or timeout; reaps it. True if it exited."""
+    pidfd = _open_pidfd(proc.pid)
+    if pidfd is not None:
+        try:
+            ready, _, _ = select.select([pidfd], [], [], timeout)
+        finally:
+            os.close(pidfd)
+        if not ready:
+            return False
+        proc.poll()
+        return True
+    # Windows: Popen.wait() is WaitForSingleObject on the process handle
+    try:
+        proc.wait(timeout)
+        return True
+    except subprocess.TimeoutExpired:
+        return False
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    # Linux >= 5.3: a pidfd becomes readable when the process exits.
+    opener = getattr(os, "pidfd_open", None)
+    if opener is None:
+        return None
+    try:
+        return opener(pid)
+    except OSError:
+        return None
+
+
+class _CoreWatcher:
+    """
+    One daemon thread shared by every EngineManager: blocks until a watched core exits
+    (pidfd) and calls its callback. Requests arrive on a queue plus a one-byte self-pipe wakeup.
+    Where pidfd is unavailable (Windows), a helper thread per core blocks in proc.wait()
+    (WaitForSingleObject) and reports the exit through the same wakeup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._requests: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._exits: "queue.SimpleQueue" = queue.SimpleQueue()  # procs whose waiter thread saw them exit
+        self._wake_r: Optional[socket.socket] = None
+        self._wake_w: Optional[socket.socket] = None
+
+    def watch(self, proc: subprocess.Popen, on_exit: Callable[[subprocess.Popen], None]):
+        self._ensure_started()
+        self._requests.put((proc, on_exit))
+        self._wake()
+
+    def unwatch(self, proc: subprocess.Popen):
+        if self._thread is None:
+            return
+        self._requests.put((proc, None))
+        self._wake()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self._wake_w.setblocking(False)
+            self._thread = threading.Thread(target=self._run, name="UmbraCoreWatcher", daemon=True)
+            self._thread.start()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass  # buffer full: a wakeup is already pending
+
+    def _wait_in_thread(self, proc: subprocess.Popen):
+        try:
+            proc.wait()
+        except Exception:
+            pass
+        self._exits.put(proc)
+        self._wake()
+
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(64):
+                pass
+        except OSError:
+            pass
+
+    def _run(self):
+        sel = selectors.DefaultSelector()
+        sel.register(self._wake_r, selectors.EVENT_READ)
+        # proc -> (pidfd or None, callback); the watcher owns the pidfds it opens
+        watched: Dict[subprocess.Popen, Tuple[Optional[int], Callable]] = {}
+
+        def drop(proc):
+            pidfd, _ = watched.pop(proc)
+            if pidfd is not None:
+                sel.unregister(pidfd)
+                os.close(pidfd)
+
+        while True:
+            while True:
+                try:
+                    proc, cb = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if proc in watched:
+                    drop(proc)
+                if cb is None:
+                    continue
+                pidfd = _open_pidfd(proc.pid)
+                if pidfd is not None:
+                    sel.register(pidfd, selectors.EVENT_READ, proc)
+                else:
+                    # a stale report from an earlier watch of the same proc is harmless: it has exited either way
+                    threading.Thread(
+                        target=self._wait_in_thread, args=(proc,), name="UmbraCoreWaiter", daemon=True
+                    ).start()
+                watched[proc] = (pidfd, cb)
+
+            exited = []
+            for key, _ in sel.select(None):
+                if key.fileobj is self._wake_r:
+                    self._drain_wake()
+                else:
+                    exited.append(key.data)
+            while True:
+                try:
+                    exited.append(self._exits.get_nowait())
+                except queue.Empty:
+                    break
+
+            for proc in exited:
+                if proc not in watched:
+                    continue
+                cb = watched[proc][1]
+                drop(proc)
+                proc.poll()  # reap
+                try:
+                    cb(proc)
+                except Exception:
+                    pass
+
+
+_WATCHER = _CoreWatcher()
@@ -1,10 +1,93 @@
 from __future__ import annotations
 
+import os
+import sys
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-import psutil
+# psutil is imported lazily inside the functions that use it (keeps module import cheap)
+
+_IS_LINUX = sys.platform.startswith("linux")
+
+# TASK_COMM_LEN - 1: /proc/<pid>/comm cuts longer names at this many bytes
+_COMM_MAX = 15
+
+_CONN_TTL_S = 1.0
+_NAME_CACHE_MAX = 512
+
+_cache_lock = threading.Lock()
+_CONN_CACHE: Dict[str, Tuple[float, list]] = {}
+_NAME_CACHE: "OrderedDict[int, Tuple[float, str]]" = OrderedDict()
+
+
+def net_connections(kind: str = "inet") -> list:
+    """
+    psutil.net_connections() with a short TTL, so UI refreshes that land close
+    together share one connection-table read. The returned list is shared; do not mutate.
+    """
+    import psutil
+
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _CONN_CACHE.get(kind)
+        if hit and now - hit[0] < _CONN_TTL_S:
+            return hit[1]
+    conns = psutil.net_connections(kind=kind)
+    with _cache_lock:
+        _CONN_CACHE[kind] = (now, conns)
+    return conns
+
+
+def process_name(pid: int) -> str:
+    """Process name for pid (LRU cached; validated by create_time since pids get reused)."""
+    import psutil
+
+    try:
+        proc = psutil.Process(pid)
+        created = proc.create_time()
+    except Exception:
+        return "-"
+    with _cache_lock:
+        hit = _NAME_CACHE.get(pid)
+        if hit and hit[0] == created:
+            _NAME_CACHE.move_to_end(pid)
+            return hit[1]
+    try:
+        name = proc.name()
+    except Exception:
+        return "-"
+    with _cache_lock:
+        _NAME_CACHE[pid] = (created, name)
+        _NAME_CACHE.move_to_end(pid)
+        while len(_NAME_CACHE) > _NAME_CACHE_MAX:
+            _NAME_CACHE.popitem(last=False)
+    return name
+
+
+def process_names(pids) -> Dict[int, str]:
+    """Resolve a batch of pids to names in one pass ("-" for anything unreadable)."""
+    out: Dict[int, str] = {}
+    for pid in set(pids):
+        name = _read_comm(pid) if _IS_LINUX else None
+        out[pid] = name or process_name(pid)
+    return out
+
+
+def _read_comm(pid) -> Optional[str]:
+    """Name from /proc/<pid>/comm; one at the 15-byte cut goes through psutil, which restores it from cmdline."""
+    try:
+        with open(f"/proc/{pid}/comm", "rb") as f:
+            raw = f.read().rstrip(b"\n")
+    except OSError:
+        return None
+    if len(raw) >= _COMM_MAX:
+        full = process_name(int(pid))
+        if full != "-":
+            return full
+    return raw.decode("utf-8", "replace")
 
 
 @dataclass
@@ -12,6 +95,8 @@ class ProcNetInfo:
     pid: int
     name: str
     connections: int
+    exe: str = ""  # exe/username only filled by list_processes(with_owner=True)
+    username: str = ""
 
 
 class NetworkScanner:
@@ -20,33 +105,97 @@ class NetworkScanner:
     NOTE: This does NOT run any bandwidth tests. It only reads OS counters (psutil).
     """
 
-    def list_processes(self, only_network_active: bool = False) -> List[ProcNetInfo]:
+    def __init__(self):
+        import psutil
+
+        # rolling baseline for get_total_net_mbps()
+        self._last_io = (psutil.net_io_counters(), time.monotonic())
+
+    def list_processes(self, only_network_active: bool = False, with_owner: bool = False) -> List[ProcNetInfo]:
+        """
+        with_owner also reads exe and username in the same pass (for the app filter's OS-owned check).
+        The /proc fast path leaves them empty: that check only matches Windows paths and accounts.
+        """
         out: List[ProcNetInfo] = []
-        for p in psutil.process_iter(attrs=["pid", "name"]):
-            try:
-                conns = p.net_connections(kind="inet")
-                c = len([x for x in conns if x.status])
+        counts = self._connection_counts()
+        if _IS_LINUX and counts is not None:
+            # /proc/<pid>/comm is a single short read; much cheaper than psutil's per-pid stat parse
+            for pid, name in self._iter_proc_comm():
+                c = counts.get(pid, 0)
                 if only_network_active and c == 0:
                     continue
-                out.append(ProcNetInfo(pid=p.info["pid"], name=p.info.get("name") or f"PID {p.info['pid']}", connections=c))
-            except (psutil.AccessDenied, psutil.NoSuchProcess):
-                continue
-            except Exception:
-                continue
+                out.append(ProcNetInfo(pid=pid, name=name or f"PID {pid}", connections=c))
+        else:
+            import psutil
+
+            # attrs= makes psutil swallow AccessDenied/NoSuchProcess per field (value None)
+            attrs = ["pid", "name", "exe", "username"] if with_owner else ["pid", "name"]
+            for p in psutil.process_iter(attrs=attrs):
+                try:
+                    pid = p.info["pid"]
+                    if counts is not None:
+                        c = counts.get(pid, 0)
+                    else:
+                        c = len([x for x in p.net_connections(kind="inet") if x.status])
+                    if only_network_active and c == 0:
+                        continue
+                    out.append(
+                        ProcNetInfo(
+                            pid=pid,
+                            name=p.info.get("name") or f"PID {pid}",
+                            connections=c,
+                            exe=p.info.get("exe") or "",
+                            username=p.info.get("username") or "",
+                        )
+                    )
+                except (psutil.AccessDenied, psutil.NoSuchProcess):
+                    continue
+                except Exception:
+                    continue
         out.sort(key=lambda x: (x.connections, x.name.lower()), reverse=True)
         return out
 
-    def get_total_net_mbps(self, interval: float = 0.0) -> Tuple[float, float]:
+    @staticmethod
+    def _iter_proc_comm():
+        try:
+            entries = os.listdir("/proc")
+        except OSError:
+            return
+        for pid_s in entries:
+            if not pid_s.isdigit():
+                continue
+            name = _read_comm(pid_s)
+            if name is None:
+                continue
+            yield int(pid_s), name
+
+    def _connection_counts(self) -> Optional[Dict[int, int]]:
         """
-        Returns (download_mbps, upload_mbps) using system IO counters.
-        If interval > 0, waits interval seconds and measures delta.
+        One system-wide connection table read, bucketed by pid.
+        Returns None when the global table is not readable (e.g. macOS without root);
+        callers then fall back to per-process queries.
         """
-        c1 = psutil.net_io_counters()
-        t1 = time.time()
-        if interval > 0:
-            time.sleep(interval)
+        try:
+            conns = net_connections(kind="inet")
+        except Exception:
+            return None
+        counts: Dict[int, int] = {}
+        for c in conns:
+            if c.status and c.pid:
+                counts[c.pid] = counts.get(c.pid, 0) + 1
+        return counts
+
+    def get_total_net_mbps(self) -> Tuple[float, float]:
+        """
+        Returns (download_mbps, upload_mbps) averaged since the previous call
+        (or since the scanner was created). Never sleeps.
+        """
+        import psutil
+
         c2 = psutil.net_io_counters()
-        t2 = time.time()
+        t2 = time.monotonic()
+        c1, t1 = self._last_io
+        self._last_io = (c2, t2)
         dt = max(0.001, t2 - t1)
         down_bps = (c2.bytes_recv - c1.bytes_recv) * 8.0 / dt
         up_bps = (c2.bytes_sent - c1.bytes_sent) * 8.0 / dt
@@ -1,17 +1,34 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import os
 import re
+import tempfile
+import threading
 import time
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import msgpack
+except Exception:
+    msgpack = None  # optional; the rank cache file falls back to JSON
 
 DEFAULT_SETTINGS_PATH = os.path.join("configs", "settings.json")
 
+# settings.json is written compact; set UMBRA_PRETTY_JSON=1 for a human-readable file while debugging
+_PRETTY_JSON = bool(os.environ.get("UMBRA_PRETTY_JSON"))
+
+# directories already created this run; saves happen on every mutation, skip the makedirs stat
+_ENSURED_DIRS: Set[str] = set()
+
 
 def _now() -> str:
     return time.strftime("%Y-%m-%d %H:%M:%S")
@@ -27,12 +44,67 @@ def _safe_json_load(path: str) -> Dict[str, Any]:
         return {}
 
 
+def _json_text(data: Dict[str, Any]) -> str:
+    if _PRETTY_JSON:
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _ensure_parent(path: str) -> None:
+    d = os.path.dirname(path)
+    if d and d not in _ENSURED_DIRS:
+        os.makedirs(d, exist_ok=True)
+        _ENSURED_DIRS.add(d)
+
+
+def _temp_beside(path: str) -> Tuple[int, str]:
+    # unique name per write: two overlapping saves must not share (and clobber) one temp file
+    _ensure_parent(path)
+    return tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path) or ".")
+
+
+def _replace_or_discard(tmp: str, path: str) -> None:
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _write_text_atomic(path: str, text: str) -> None:
+    fd, tmp = _temp_beside(path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+    except Exception:
+        os.remove(tmp)
+        raise
+    _replace_or_discard(tmp, path)
+
+
 def _safe_json_save(path: str, data: Dict[str, Any]) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    os.replace(tmp, path)
+    _write_text_atomic(path, _json_text(data))
+
+
+def _write_bytes_atomic(path: str, blob: bytes) -> None:
+    fd, tmp = _temp_beside(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+    except Exception:
+        os.remove(tmp)
+        raise
+    _replace_or_discard(tmp, path)
+
+
+def _digest(*parts: str) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+    return h.digest()
 
 
 # ---------------------
@@ -41,15 +113,39 @@ def _safe_json_save(path: str, data: Dict[str, Any]) -> None:
 
 _RE_SSH_INLINE = re.compile(r"^\s*ssh\s+(.*)$", re.IGNORECASE)
 _RE_WG = re.compile(r"^\s*\[Interface\]\s*", re.IGNORECASE | re.MULTILINE)
+_B64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+
+# "<scheme>://" -> config type. http(s) could be a subscription or an http proxy;
+# we treat it as subscription when used in the subscription UI.
+_SCHEME_MAP = {
+    "vmess": "vmess",
+    "vless": "vless",
+    "trojan": "trojan",
+    "ss": "shadowsocks",
+    "socks": "socks",
+    "socks5": "socks",
+    "http": "http",
+    "https": "http",
+    "hysteria2": "hysteria2",
+    "hy2": "hysteria2",
+    "ovpn": "openvpn",
+    "ssh": "ssh",
+}
+_SCHEME_MAX = max(len(k) for k in _SCHEME_MAP) + 3
 
 
 def _looks_base64(s: str) -> bool:
     s2 = s.strip()
     if len(s2) < 16:
         return False
-    if any(ch.isspace() for ch in s2):
+    # cheapest rejects first: a multi-line / spaced body fails at its first separator,
+    # before isascii() and the encode+translate pass touch the whole string
+    if "\n" in s2 or " " in s2 or "\t" in s2 or "\r" in s2:
+        return False
+    if not s2.isascii():
         return False
-    return re.fullmatch(r"[A-Za-z0-9+/=]+", s2) is not None
+    # deleting every alphabet byte in C leaves nothing iff the string is pure base64 (no whitespace)
+    return not s2.encode("ascii").translate(None, _B64_ALPHABET)
 
 
 def _b64_decode_maybe(s: str) -> Optional[str]:
@@ -65,29 +161,19 @@ def _detect_type(raw: str) -> str:
     t = raw.strip()
     if not t:
         return "unknown"
+    i = t.find("://", 0, _SCHEME_MAX)
+    if i > 0:
+        conf_type = _SCHEME_MAP.get(t[:i].lower())
+        if conf_type:
+            return conf_type
     low = t.lower()
-    if low.startswith("vmess://"):
-        return "vmess"
-    if low.startswith("vless://"):
-        return "vless"
-    if low.startswith("trojan://"):
-        return "trojan"
-    if low.startswith("ss://"):
-        return "shadowsocks"
-    if low.startswith("socks://") or low.startswith("socks5://"):
-        return "socks"
-    if low.startswith("http://") or low.startswith("https://"):
-        # could be subscription or http proxy; we treat as subscription when used in subscription UI
-        return "http"
-    if low.startswith("hysteria2://") or low.startswith("hy2://"):
-        return "hysteria2"
-    if "openvpn" in low or low.startswith("ovpn://") or low.endswith(".ovpn"):
+    if "openvpn" in low or low.endswith(".ovpn"):
         return "openvpn"
     if "openconnect" in low or "anyconnect" in low:
         return "openconnect"
     if _RE_WG.search(t):
         return "wireguard"
-    if _RE_SSH_INLINE.match(t) or low.startswith("ssh://"):
+    if _RE_SSH_INLINE.match(t):
         return "ssh"
     if t.lstrip().startswith("{") and ("outbounds" in t or "inbounds" in t):
         return "singbox_json"
@@ -107,6 +193,29 @@ def _suggest_core(conf_type: str) -> str:
     return "auto"
 
 
+def _fast_host(raw: str) -> str:
+    """urlparse(raw).hostname for share links, without urlparse's full split/normalize."""
+    i = raw.find("://")
+    if i < 0:
+        return ""
+    s = raw[i + 3:]
+    end = len(s)
+    for sep in "/?#":
+        j = s.find(sep, 0, end)
+        if j >= 0:
+            end = j
+    netloc = s[:end]
+    host = netloc[netloc.rfind("@") + 1:]  # userinfo ends at the last '@'
+    if host.startswith("["):
+        j = host.find("]")
+        return host[1:j].lower() if j > 0 else ""
+    j = host.find(":")
+    if j >= 0:
+        host = host[:j]
+    return host.lower()
+
+
+@lru_cache(maxsize=4096)
 def _infer_loc_from_host(host: str) -> str:
     h = (host or "").lower()
     if h.endswith(".ir") or ".ir/" in h:
@@ -184,6 +293,11 @@ def _default_profiles() -> Dict[str, Any]:
     }
 
 
+# Bump whenever _default_settings() gains keys: files stamped with the current rev skip
+# the defaults build + deep merge on load.
+_DEFAULTS_REV = 1
+
+
 def _default_settings() -> Dict[str, Any]:
     return {
         "meta": {
@@ -192,6 +306,7 @@ def _default_settings() -> Dict[str, Any]:
             "app": "Umbra",
             "version": "2.0.0-phase1",
             "first_run_completed": False,
+            "defaults_rev": _DEFAULTS_REV,
         },
         "ui": {
             "tray_enabled": True,
@@ -276,25 +391,139 @@ class SettingsManager:
     def __init__(self, path: str = DEFAULT_SETTINGS_PATH):
         self.path = path
         self.data: Dict[str, Any] = {}
+        # dedup indexes over data["configs"] raws (raw -> first position) / data["subscriptions"];
+        # built lazily, dropped whenever self.data is replaced (load / rollback)
+        self._raw_index: Optional[Dict[str, int]] = None
+        self._subs_index: Optional[Set[str]] = None
+        # save() inside batch() only marks dirty; the outermost batch writes once
+        # saves come from the GUI thread (timers) and pool threads (imports); this guards the write
+        # and the batch/dirty/digest state, not the whole batch() block (that can span network fetches)
+        self._save_lock = threading.RLock()
+        self._batch_depth = 0
+        self._dirty = False
+        self._saved_digest: Optional[bytes] = None  # blake2b of the last written settings (updated_at excluded)
+        self._http: Optional[requests.Session] = None
+        # called after every write; may run on a worker thread, so listeners must not touch widgets
+        self._save_listeners: List[Callable[[], None]] = []
+        # hot read-only lookups (get_speedtest_targets & co); cleared on save/load
+        self._views: Dict[str, Any] = {}
+        # schedule_save(): schedule(delay_ms, fn) supplied by the UI (QTimer.singleShot); None = save now
+        self._save_scheduler: Optional[Callable[[int, Callable[[], None]], None]] = None
+        self._save_pending = False
+        # dns.rank_cache is machine-written and lives in its own file (rank_cache.msgpack/.json), not in
+        # settings.json; updates between saves go to an append-only log. True while that file is behind memory.
+        self._rank_dirty = False
         self.load()
 
     def load(self):
         self.data = _safe_json_load(self.path)
+        self._invalidate_indexes()
+        self._rank_dirty = os.path.exists(self._rank_log_path())
+        if self.data:
+            rank = self._load_rank_file()
+            if rank is not None:
+                self.data.setdefault("dns", {})["rank_cache"] = rank
+            elif (self.data.get("dns", {}) or {}).get("rank_cache"):
+                self._rank_dirty = True  # older settings.json still carries it; the save() below moves it out
+            if self._rank_dirty:
+                self._replay_rank_log()  # the save() below compacts it into the rank file
         if not self.data:
             self.data = _default_settings()
             self.save()
             return
 
-        # ensure defaults / missing keys
-        defaults = _default_settings()
-        self._deep_merge_missing(self.data, defaults)
+        # ensure defaults / missing keys (skipped when the file already has this defaults rev)
+        meta = self.data.get("meta")
+        if not isinstance(meta, dict) or meta.get("defaults_rev") != _DEFAULTS_REV:
+            defaults = _default_settings()
+            self._deep_merge_missing(self.data, defaults)
+            self.data.setdefault("meta", {})["defaults_rev"] = _DEFAULTS_REV
 
         self.data.setdefault("meta", {})["updated_at"] = _now()
         self.save()
 
     def save(self):
-        self.data.setdefault("meta", {})["updated_at"] = _now()
-        _safe_json_save(self.path, self.data)
+        with self._save_lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        self._views.clear()
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._dirty = False
+        self._save_pending = False
+        if self._rank_dirty:
+            self._write_rank_file()
+        # many saves are no-ops (a toggle set back, a stamp rewritten); compare before touching the disk.
+        # The document is dumped once without "meta"; the digest covers that text plus meta minus
+        # updated_at, so the timestamp itself doesn't count as a change and the body is never re-dumped.
+        meta = self.data.setdefault("meta", {})
+        doc = self._settings_doc()
+        body = _json_text({k: v for k, v in doc.items() if k != "meta"})
+        digest = _digest(body, _json_text({k: v for k, v in meta.items() if k != "updated_at"}))
+        if digest == self._saved_digest:
+            return
+        meta["updated_at"] = _now()
+        if _PRETTY_JSON:
+            text = _json_text(self._settings_doc())  # debug layout; a second dump is fine here
+        else:
+            # splice meta in as the last key of the compact body: "{...}" -> "{...,"meta":{...}}"
+            text = body[:-1] + ("," if len(body) > 2 else "") + '"meta":' + _json_text(meta) + "}"
+        _write_text_atomic(self.path, text)
+        self._saved_digest = digest
+        for cb in list(self._save_listeners):
+            try:
+                cb()
+            except Exception:
+                pass
+
+    def _settings_doc(self) -> Dict[str, Any]:
+        """self.data as written to settings.json: everything but dns.rank_cache (shallow copies only)."""
+        dns = self.data.get("dns")
+        if not isinstance(dns, dict) or "rank_cache" not in dns:
+            return self.data
+        return {**self.data, "dns": {k: v for k, v in dns.items() if k != "rank_cache"}}
+
+    def add_save_listener(self, cb: Callable[[], None]) -> None:
+        self._save_listeners.append(cb)
+
+    def set_save_scheduler(self, schedule: Callable[[int, Callable[[], None]], None]) -> None:
+        """schedule(delay_ms, fn) must run fn later on the thread that owns the settings (e.g. QTimer.singleShot)."""
+        self._save_scheduler = schedule
+
+    def schedule_save(self, delay_ms: int = 500) -> None:
+        """save() shortly; a burst of small updates shares one write. Saves right away without a scheduler."""
+        if self._save_scheduler is None:
+            self.save()
+            return
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._save_scheduler(delay_ms, self.flush_save)
+
+    def flush_save(self) -> None:
+        """Write a pending schedule_save() or deferred batch save now (no-op when nothing is outstanding)."""
+        if self._save_pending or self._dirty:
+            self.save()
+
+    @contextmanager
+    def batch(self):
+        """Coalesce every save() made inside the block into a single write on exit."""
+        with self._save_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._save_lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._dirty:
+                    self._save_locked()
+
+    def _invalidate_indexes(self):
+        self._raw_index = None
+        self._subs_index = None
+        self._views.clear()
 
     def _deep_merge_missing(self, dst: Dict[str, Any], src: Dict[str, Any]):
         for k, v in src.items():
@@ -308,6 +537,89 @@ class SettingsManager:
     # DNS
     # ---------------------
 
+    def _rank_log_path(self) -> str:
+        return os.path.join(os.path.dirname(self.path) or ".", "rank_cache.jsonl")
+
+    def _rank_file_path(self) -> str:
+        return os.path.join(os.path.dirname(self.path) or ".", "rank_cache.msgpack" if msgpack else "rank_cache.json")
+
+    def _load_rank_file(self) -> Optional[Dict[str, Any]]:
+        path = self._rank_file_path()
+        try:
+            if msgpack is not None:
+                with open(path, "rb") as f:
+                    rank = msgpack.unpackb(f.read(), raw=False)
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    rank = json.load(f)
+        except Exception:
+            return None
+        return rank if isinstance(rank, dict) else None
+
+    def _write_rank_file(self) -> None:
+        rank = self._rank_cache()
+        try:
+            if msgpack is not None:
+                _write_bytes_atomic(self._rank_file_path(), msgpack.packb(rank, use_bin_type=True))
+            else:
+                _write_text_atomic(self._rank_file_path(), json.dumps(rank, ensure_ascii=False, separators=(",", ":")))
+        except Exception:
+            return  # keep the log; the next save() retries
+        try:
+            os.remove(self._rank_log_path())
+        except OSError:
+            pass
+        self._rank_dirty = False
+
+    def _rank_cache(self) -> Dict[str, Any]:
+        return self.data.setdefault("dns", {}).setdefault("rank_cache", {})
+
+    def _append_rank_log(self, entry: Dict[str, Any]) -> None:
+        # one short line per update instead of rewriting settings.json
+        try:
+            with self._save_lock, open(self._rank_log_path(), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+                self._rank_dirty = True
+        except OSError:
+            self.schedule_save()
+
+    def _apply_rank_entry(self, entry: Dict[str, Any]) -> None:
+        self._views.clear()  # get_path() may hold the values replaced here
+        cache = self._rank_cache()
+        if "set" in entry:
+            cache[str(entry["set"])] = entry.get("v")
+        elif "push" in entry:
+            windows = cache.setdefault("samples", {})
+            n = int(entry.get("n", 0) or 0)
+            for key, sample in (entry.get("push") or {}).items():
+                win = windows.setdefault(key, [])
+                win.append(sample)
+                if n > 0:
+                    del win[:-n]
+
+    def _replay_rank_log(self) -> None:
+        try:
+            with open(self._rank_log_path(), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._apply_rank_entry(json.loads(line))
+                    except Exception:
+                        continue  # torn last line after a crash
+        except OSError:
+            pass
+
+    def rank_cache_set(self, key: str, value: Any) -> None:
+        """dns.rank_cache[key] = value, persisted through the sidecar log."""
+        entry = {"set": key, "v": value}
+        self._apply_rank_entry(entry)
+        self._append_rank_log(entry)
+
+    def rank_cache_push(self, samples: Dict[str, Any], maxlen: int) -> None:
+        """Append one sample per key to dns.rank_cache.samples, keeping the last `maxlen` of each."""
+        entry = {"push": samples, "n": int(maxlen)}
+        self._apply_rank_entry(entry)
+        self._append_rank_log(entry)
+
     def add_dns(self, name: str, server: str, loc: str = "AUTO") -> bool:
         server = (server or "").strip()
         name = (name or "").strip()
@@ -361,17 +673,17 @@ class SettingsManager:
     # Configs / Subscription
     # ---------------------
 
-    def process_smart_input(self, text: str) -> int:
+    def split_smart_input(self, text: str) -> List[str]:
         """
-        Import from clipboard or subscription content. Accepts:
+        Break clipboard or subscription content into import entries. Accepts:
         - multiple lines of share links
         - base64 subscriptions (decoded into lines)
         - raw sing-box JSON
         - wireguard ini
-        Returns number of configs added.
+        Does not touch self.data, so it is safe off the UI thread.
         """
         if not text:
-            return 0
+            return []
         raw = text.strip()
 
         # try decode if looks like base64 subscription
@@ -381,18 +693,50 @@ class SettingsManager:
                 raw = decoded
 
         # split lines or handle json/ini as single
-        items: List[str]
         if raw.lstrip().startswith("{") and raw.rstrip().endswith("}"):
-            items = [raw]
-        elif _RE_WG.search(raw):
-            items = [raw]
-        else:
-            items = [ln.strip() for ln in raw.splitlines() if ln.strip()]
-
+            return [raw]
+        if _RE_WG.search(raw):
+            return [raw]
+        return [ln.strip() for ln in raw.splitlines() if ln.strip()]
+
+    def import_entries(
+        self, items: List[str], on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None, batch_size: int = 200
+    ) -> int:
+        """
+        Append configs for entries not stored yet; every batch_size new configs are handed to on_batch
+        as they land. Does not save: the caller decides when (save() / schedule_save()).
+        Must run on the thread that owns the settings. Returns number of configs added.
+        """
+        index = self._config_index()
+        configs = self.data.setdefault("configs", [])
+        added_at = _now()
         added = 0
+        pending: List[Dict[str, Any]] = []
+
+        def flush():
+            configs.extend(pending)
+            if on_batch is not None:
+                on_batch(pending)
+
         for it in items:
-            added += 1 if self._add_config(it, source="clipboard") else 0
+            cfg = self._build_config(it, "clipboard", added_at)
+            if cfg is not None:
+                index[cfg["raw"]] = len(configs) + len(pending)  # also dedups repeats within this import
+                pending.append(cfg)
+                added += 1
+                if len(pending) >= batch_size:
+                    flush()
+                    pending = []
+
+        if pending:
+            flush()
+        return added
 
+    def process_smart_input(
+        self, text: str, on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None, batch_size: int = 200
+    ) -> int:
+        """split_smart_input() + import_entries() with a single save at the end. Returns number of configs added."""
+        added = self.import_entries(self.split_smart_input(text), on_batch=on_batch, batch_size=batch_size)
         if added:
             self.save()
         return added
@@ -402,42 +746,117 @@ class SettingsManager:
         if not url:
             return False
         subs = self.data.get("subscriptions", []) or []
-        if url in subs:
+        if self._subs_index is None:
+            self._subs_index = set(subs)
+        if url in self._subs_index:
             return False
         subs.append(url)
+        self._subs_index.add(url)
         self.data["subscriptions"] = subs
         self.save()
         return True
 
-    def update_subscription(self, url: str, timeout: int = 20) -> int:
+    def _session(self) -> requests.Session:
+        # one pooled session: repeated fetches to the same host reuse the TLS connection
+        if self._http is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=16)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            self._http = s
+        return self._http
+
+    def update_subscription(
+        self, url: str, timeout: int = 20, on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ) -> int:
         url = (url or "").strip()
         if not url:
             return 0
-        r = requests.get(url, timeout=timeout)
+        return self.process_smart_input(self._fetch_subscription(url, timeout), on_batch=on_batch)
+
+    def fetch_subscriptions(self, urls: List[str], timeout: int = 20, max_workers: int = 8):
+        """
+        Download urls concurrently and yield (url, entries, error) in order as results land, entries
+        already split by split_smart_input(). Does not touch self.data, so it is safe off the UI thread.
+        """
+        if not urls:
+            return
+
+        def fetch(url: str):
+            try:
+                return url, self.split_smart_input(self._fetch_subscription(url, timeout)), None
+            except Exception as e:
+                return url, None, e
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as pool:
+            yield from pool.map(fetch, urls)  # yields in submit order as results land
+
+    def refresh_all_subscriptions(
+        self, timeout: int = 20, max_workers: int = 8, on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ) -> int:
+        """
+        Fetch every subscription concurrently, then import the results in order with a single save.
+        Raises the first error only if every fetch failed.
+        """
+        subs = [u for u in (self.data.get("subscriptions", []) or []) if str(u or "").strip()]
+        if not subs:
+            return 0
+
+        fetched: List[List[str]] = []
+        errors: List[Exception] = []
+        for _url, entries, err in self.fetch_subscriptions(subs, timeout, max_workers):
+            if err is not None:
+                errors.append(err)
+            elif entries:
+                fetched.append(entries)
+        if len(errors) == len(subs):
+            raise errors[0]
+
+        # nothing is held open across the downloads; the imports themselves are quick
+        added = sum(self.import_entries(entries, on_batch=on_batch) for entries in fetched)
+        if added:
+            self.save()
+        return added
+
+    def _fetch_subscription(self, url: str, timeout: int = 20) -> str:
+        r = self._session().get(url.strip(), timeout=timeout)
         r.raise_for_status()
-        text = r.text.strip()
+        # decode explicitly: r.text runs charset detection over the whole body
+        body = r.content
+        text = body.decode("utf-8", errors="ignore").strip()
 
-        # Many subs are base64; decode if needed
-        if _looks_base64(text) and "://" not in text:
+        # Many subs are base64; decode if needed (bytes-level check first)
+        if b"://" not in body and _looks_base64(text):
             dec = _b64_decode_maybe(text)
             if dec:
                 text = dec
-
-        return self.process_smart_input(text)
-
-    def _add_config(self, raw: str, source: str = "manual") -> bool:
+        return text
+
+    def _config_index(self) -> Dict[str, int]:
+        if self._raw_index is None:
+            index: Dict[str, int] = {}
+            for i, c in enumerate(self.data.get("configs", []) or []):
+                index.setdefault((c.get("raw") or "").strip(), i)
+            self._raw_index = index
+        return self._raw_index
+
+    def config_position(self, raw: str) -> int:
+        """Index of the first config in data["configs"] with this raw, or -1."""
+        return self._config_index().get((raw or "").strip(), -1)
+
+    def _build_config(self, raw: str, source: str = "manual", added_at: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Config entry for raw, or None if empty / already stored. Does not touch self.data."""
         raw = raw.strip()
         if not raw:
-            return False
+            return None
+
+        # Dedup by raw (simple but effective)
+        if raw in self._config_index():
+            return None
 
         conf_type = _detect_type(raw)
         core = _suggest_core(conf_type)
 
-        # Dedup by raw (simple but effective)
-        for c in self.data.get("configs", []) or []:
-            if (c.get("raw") or "").strip() == raw:
-                return False
-
         name = self._auto_name(raw, conf_type)
         cfg = {
             "name": name,
@@ -445,19 +864,17 @@ class SettingsManager:
             "core": core,
             "raw": raw,
             "source": source,
-            "added_at": _now(),
+            "added_at": added_at or _now(),
             "tags": [],
         }
-        self.data.setdefault("configs", []).append(cfg)
-        return True
+        return cfg
 
     def _auto_name(self, raw: str, conf_type: str) -> str:
         # Lightweight: try to extract host and loc.
         host = ""
         try:
             if "://" in raw and not raw.lstrip().startswith("{"):
-                u = urlparse(raw.strip())
-                host = u.hostname or ""
+                host = _fast_host(raw.strip())
         except Exception:
             host = ""
 
@@ -472,9 +889,59 @@ class SettingsManager:
     # Profiles helpers
     # ---------------------
 
+    # ---------------------
+    # Cached views (callers must not mutate the returned objects)
+    # ---------------------
+
+    def _view(self, key: str, build: Callable[[], Any]) -> Any:
+        try:
+            return self._views[key]
+        except KeyError:
+            v = self._views[key] = build()
+            return v
+
+    def get_path(self, keys: Tuple[str, ...], default: Any = None) -> Any:
+        """data[k0][k1]..., or `default` when a step is missing/None. Hits are memoized like the views."""
+        key = "path:" + "/".join(keys)
+        try:
+            return self._views[key]
+        except KeyError:
+            pass
+        node: Any = self.data
+        for k in keys:
+            node = node.get(k) if isinstance(node, dict) else None
+            if node is None:
+                return default
+        self._views[key] = node
+        return node
+
+    def ui(self) -> Dict[str, Any]:
+        return self._view("ui", lambda: self.data.get("ui", {}) or {})
+
+    def get_speedtest_config(self) -> Dict[str, Any]:
+        return self._view("speedtest", lambda: self.data.get("speedtest", {}) or {})
+
+    def get_speedtest_targets(self) -> List[Dict[str, Any]]:
+        return self._view("speedtest_targets", lambda: self.get_speedtest_config().get("targets", []) or [])
+
+    def get_upload_endpoints(self) -> List[Dict[str, Any]]:
+        return self._view("upload_endpoints", lambda: self.get_speedtest_config().get("upload_endpoints", []) or [])
+
+    def get_port_override(self) -> str:
+        return self._view("port_override", lambda: str((self.data.get("engine", {}) or {}).get("port_override", "") or ""))
+
     def get_active_profile(self) -> str:
         return str((self.data.get("profiles", {}) or {}).get("active", "Gaming"))
 
+    def active_profile_dict(self) -> Dict[str, Any]:
+        """The active profile's settings dict (created if missing), for writing into; cached like the views."""
+        name = self.get_active_profile()
+        # keyed by name: the runtime profile switch sets "active" without a save()
+        return self._view(
+            "profile:" + name,
+            lambda: self.data.setdefault("profiles", {}).setdefault("items", {}).setdefault(name, {}),
+        )
+
     def get_profile_names(self) -> List[str]:
         items = (self.data.get("profiles", {}) or {}).get("items", {}) or {}
         return list(items.keys())
@@ -536,26 +1003,42 @@ class SettingsManager:
         """Create a lightweight snapshot before applying changes."""
         label = str(label or "Snapshot")
         snap_id = str(int(time.time() * 1000))
-        payload = json.loads(json.dumps(self.data))  # deep copy, JSON-safe
-        # Prevent infinite growth
-        payload.pop("history", None)
+        # Snapshot body goes to its own file (serializing it is the copy), so settings.json
+        # only carries the index and stays small. History itself is never snapshotted, and neither
+        # is dns.rank_cache (it has its own file and is measurement data, not configuration).
+        snap_path = os.path.join(self._history_dir(), f"{snap_id}.json")
+        _safe_json_save(snap_path, {k: v for k, v in self._settings_doc().items() if k != "history"})
 
         snap = {
             "id": snap_id,
             "at": _now(),
             "label": label,
-            "data": payload,
+            "path": snap_path,
         }
         hist = self.data.setdefault("history", {})
         snaps = hist.setdefault("snapshots", [])
         snaps.insert(0, snap)
         # keep last 10
         if len(snaps) > 10:
+            for old in snaps[10:]:
+                self._remove_snapshot_file(old)
             del snaps[10:]
         hist["last_snapshot_id"] = snap_id
         self.save()
         return snap_id
 
+    def _history_dir(self) -> str:
+        return os.path.join(os.path.dirname(self.path) or ".", "history")
+
+    def _remove_snapshot_file(self, snap: Dict[str, Any]) -> None:
+        path = snap.get("path")
+        if not path:
+            return
+        try:
+            os.remove(str(path))
+        except OSError:
+            pass
+
     def rollback_last_snapshot(self) -> bool:
         hist = self.data.get("history", {}) or {}
         snaps = hist.get("snapshots", []) or []
@@ -575,13 +1058,23 @@ class SettingsManager:
         if not target:
             return False
 
-        payload = target.get("data")
-        if not isinstance(payload, dict):
+        if target.get("path"):
+            # freshly parsed from disk: already a private copy, used as-is
+            new_data = _safe_json_load(str(target["path"]))
+        else:
+            # snapshots written before they moved to configs/history/ are stored inline;
+            # move the payload out to a file (so the entry stays usable) and adopt the dict itself
+            payload = target.pop("data", None)
+            if not isinstance(payload, dict):
+                return False
+            target["path"] = os.path.join(self._history_dir(), f"{snap_id}.json")
+            _safe_json_save(target["path"], payload)
+            new_data = payload
+        if not new_data:
             return False
 
         # Preserve history and critical meta fields
         old = self.data
-        new_data = json.loads(json.dumps(payload))
 
         # keep app/version/created_at from current
         old_meta = old.get("meta", {}) or {}
@@ -592,6 +1085,17 @@ class SettingsManager:
         new_data["meta"] = new_meta
         new_data["history"] = old.get("history", {})
 
+        # the live rank cache survives a rollback (older snapshots may still embed a stale one)
+        new_dns = new_data.get("dns")
+        if not isinstance(new_dns, dict):
+            new_dns = new_data["dns"] = {}
+        rank = (old.get("dns", {}) or {}).get("rank_cache")
+        if rank is not None:
+            new_dns["rank_cache"] = rank
+        else:
+            new_dns.pop("rank_cache", None)
+
         self.data = new_data
+        self._invalidate_indexes()
         self.save()
         return True
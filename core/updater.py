@@ -7,7 +7,7 @@ import shutil
 import zipfile
 import time
 from dataclasses import dataclass
-from typing import Callable, Optional, Tuple
+from typing import Callable, Optional, Pattern, Tuple, Union
 
 import requests
 
@@ -26,21 +26,31 @@ class CoreUpdater:
     - mihomo (MetaCubeX/mihomo) (Clash compatible)
     """
 
-    def __init__(self, cores_dir: str = "cores", log: Optional[Callable[[str], None]] = None):
+    def __init__(self, cores_dir: str = "cores", log: Optional[Callable[[str], None]] = None, tmp_dir: Optional[str] = None):
         self.cores_dir = cores_dir
+        # downloads land here; updaters running side by side need one each (cleanup_tmp removes it)
+        self.tmp_dir = tmp_dir or os.path.join(cores_dir, "_tmp")
+        self._backup_root = os.path.join(cores_dir, "_backups")
         self.log = log or (lambda s: None)
+        self._session = requests.Session()  # API call + asset download share connections
+        self._ensured_dirs = set()  # dirs created by this updater; see _ensure_dir()
         os.makedirs(self.cores_dir, exist_ok=True)
 
     def _log(self, msg: str):
         self.log(msg)
 
+    def _ensure_dir(self, path: str):
+        if path not in self._ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._ensured_dirs.add(path)
+
     def _backup_existing(self, out_bin: str, core_name: str) -> Optional[str]:
         """Back up existing core binary before replacing it. Returns backup path or None."""
         try:
             if not os.path.exists(out_bin):
                 return None
-            ts = re.sub(r"[^0-9]", "", str(int(time.time())))
-            bdir = os.path.join(self.cores_dir, "_backups", core_name, ts)
+            ts = str(int(time.time()))
+            bdir = os.path.join(self._backup_root, core_name, ts)
             os.makedirs(bdir, exist_ok=True)
             bpath = os.path.join(bdir, os.path.basename(out_bin))
             shutil.copy2(out_bin, bpath)
@@ -58,18 +68,20 @@ class CoreUpdater:
 
     def _gh_json(self, url: str, timeout: int = 20) -> dict:
         headers = {"Accept": "application/vnd.github+json", "User-Agent": "Umbra-Updater"}
-        r = requests.get(url, headers=headers, timeout=timeout)
+        r = self._session.get(url, headers=headers, timeout=timeout)
         r.raise_for_status()
         return r.json()
 
     def latest_release(self, repo: str) -> dict:
         return self._gh_json(f"https://api.github.com/repos/{repo}/releases/latest")
 
-    def find_asset(self, release: dict, patterns: Tuple[str, ...]) -> Optional[ReleaseAsset]:
+    def find_asset(self, release: dict, patterns: Tuple[Union[str, Pattern], ...]) -> Optional[ReleaseAsset]:
+        # compile once per call, not once per (asset, pattern) pair
+        compiled = [p if isinstance(p, re.Pattern) else re.compile(p, re.IGNORECASE) for p in patterns]
         assets = release.get("assets", []) or []
         for a in assets:
             name = a.get("name", "")
-            if any(re.search(p, name, re.IGNORECASE) for p in patterns):
+            if any(p.search(name) for p in compiled):
                 return ReleaseAsset(
                     name=name,
                     url=a.get("browser_download_url", ""),
@@ -99,14 +111,42 @@ class CoreUpdater:
 
         return os_name, arch_name
 
+    def _extract_member(self, archive_path: str, match: Callable[[str], bool], out_path: str) -> bool:
+        """
+        Stream the first zip member whose file name satisfies `match` straight to out_path
+        (via a temp file + rename). Nothing else in the archive touches the disk.
+        """
+        with zipfile.ZipFile(archive_path, "r") as z:
+            info = next((i for i in z.infolist() if not i.is_dir() and match(os.path.basename(i.filename))), None)
+            if info is None:
+                return False
+            tmp = out_path + ".tmp"
+            with z.open(info) as src, open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst, length=1 << 20)
+        if os.path.getsize(tmp) <= 0:
+            os.remove(tmp)
+            raise RuntimeError("Downloaded binary is empty.")
+        mode = (info.external_attr >> 16) & 0o777
+        if mode and os.name != "nt":
+            os.chmod(tmp, mode)
+        os.replace(tmp, out_path)
+        return True
+
     def download(self, url: str, out_path: str, timeout: int = 60):
         self._log(f"Downloading: {url}")
-        with requests.get(url, stream=True, timeout=timeout) as r:
+        with self._session.get(url, stream=True, timeout=timeout) as r:
             r.raise_for_status()
+            r.raw.decode_content = True  # honour Content-Encoding like iter_content did
+            size = int(r.headers.get("Content-Length") or 0)
             with open(out_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=1024 * 128):
-                    if chunk:
-                        f.write(chunk)
+                if size > 0 and hasattr(os, "posix_fallocate"):
+                    try:
+                        os.posix_fallocate(f.fileno(), 0, size)  # one contiguous allocation up front
+                    except OSError:
+                        pass
+                shutil.copyfileobj(r.raw, f, length=1 << 20)
+                if size > 0:
+                    f.truncate()  # encoded bodies can decode shorter/longer than Content-Length
 
     def update_singbox(self, repo: str) -> str:
         """
@@ -119,41 +159,30 @@ class CoreUpdater:
         # sing-box assets are usually zip containing binary
         # Example patterns:
         # sing-box-1.10.0-windows-amd64.zip
-        patt = (rf"sing-box-.*-{os_name}-{arch}\\.zip$", rf"sing-box-.*-{os_name}-{arch}\\.tar\\.gz$")
+        patt = (
+            re.compile(rf"sing-box-.*-{os_name}-{arch}\.zip$", re.IGNORECASE),
+            re.compile(rf"sing-box-.*-{os_name}-{arch}\.tar\.gz$", re.IGNORECASE),
+        )
         asset = self.find_asset(rel, patt)
         if not asset:
             raise RuntimeError("No matching sing-box release asset found for your OS/arch.")
 
-        tmp_dir = os.path.join(self.cores_dir, "_tmp")
-        os.makedirs(tmp_dir, exist_ok=True)
-        archive_path = os.path.join(tmp_dir, asset.name)
+        self._ensure_dir(self.tmp_dir)
+        archive_path = os.path.join(self.tmp_dir, asset.name)
         self.download(asset.url, archive_path)
 
         dest_dir = os.path.join(self.cores_dir, "sing-box")
-        os.makedirs(dest_dir, exist_ok=True)
+        self._ensure_dir(dest_dir)
 
-        if archive_path.lower().endswith(".zip"):
-            with zipfile.ZipFile(archive_path, "r") as z:
-                z.extractall(tmp_dir)
-        else:
+        if not archive_path.lower().endswith(".zip"):
             raise RuntimeError("Unsupported archive format for sing-box (expected zip).")
 
-        # find binary
         bin_name = "sing-box.exe" if os_name == "windows" else "sing-box"
-        found = None
-        for root, _, files in os.walk(tmp_dir):
-            if bin_name in files:
-                found = os.path.join(root, bin_name)
-                break
-        if not found:
-            raise RuntimeError("sing-box binary not found in archive.")
-
         out_bin = os.path.join(dest_dir, bin_name)
         backup = self._backup_existing(out_bin, "sing-box")
         try:
-            shutil.copy2(found, out_bin)
-            if os.path.getsize(out_bin) <= 0:
-                raise RuntimeError("Downloaded binary is empty.")
+            if not self._extract_member(archive_path, lambda fn: fn == bin_name, out_bin):
+                raise RuntimeError("sing-box binary not found in archive.")
         except Exception:
             self._restore_backup(backup, out_bin)
             raise
@@ -172,36 +201,27 @@ class CoreUpdater:
         # mihomo naming varies; use broad patterns.
         # common: mihomo-windows-amd64.zip or mihomo-windows-amd64.exe
         patt = (
-            rf"mihomo.*{os_name}.*{arch}.*\\.zip$",
-            rf"mihomo.*{os_name}.*{arch}.*\\.exe$",
+            re.compile(rf"mihomo.*{os_name}.*{arch}.*\.zip$", re.IGNORECASE),
+            re.compile(rf"mihomo.*{os_name}.*{arch}.*\.exe$", re.IGNORECASE),
         )
         asset = self.find_asset(rel, patt)
         if not asset:
             raise RuntimeError("No matching mihomo release asset found for your OS/arch.")
 
-        tmp_dir = os.path.join(self.cores_dir, "_tmp")
-        os.makedirs(tmp_dir, exist_ok=True)
-        archive_path = os.path.join(tmp_dir, asset.name)
+        self._ensure_dir(self.tmp_dir)
+        archive_path = os.path.join(self.tmp_dir, asset.name)
         self.download(asset.url, archive_path)
 
         dest_dir = os.path.join(self.cores_dir, "mihomo")
-        os.makedirs(dest_dir, exist_ok=True)
+        self._ensure_dir(dest_dir)
 
         if archive_path.lower().endswith(".zip"):
-            with zipfile.ZipFile(archive_path, "r") as z:
-                z.extractall(tmp_dir)
-            # find exe
-            found = None
-            for root, _, files in os.walk(tmp_dir):
-                for fn in files:
-                    if fn.lower().startswith("mihomo") and fn.lower().endswith(".exe"):
-                        found = os.path.join(root, fn)
-                        break
-                if found:
-                    break
-            if not found:
+            def is_exe(fn: str) -> bool:
+                fn = fn.lower()
+                return fn.startswith("mihomo") and fn.endswith(".exe")
+
+            if not self._extract_member(archive_path, is_exe, os.path.join(dest_dir, "mihomo.exe")):
                 raise RuntimeError("mihomo executable not found in zip.")
-            shutil.copy2(found, os.path.join(dest_dir, "mihomo.exe"))
         elif archive_path.lower().endswith(".exe"):
             shutil.copy2(archive_path, os.path.join(dest_dir, "mihomo.exe"))
         else:
@@ -211,8 +231,8 @@ class CoreUpdater:
         return tag
 
     def cleanup_tmp(self):
-        tmp_dir = os.path.join(self.cores_dir, "_tmp")
+        self._ensured_dirs.discard(self.tmp_dir)
         try:
-            shutil.rmtree(tmp_dir)
+            shutil.rmtree(self.tmp_dir)
         except Exception:
             pass
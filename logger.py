@@ -1,13 +1,54 @@
 from __future__ import annotations
 
+import atexit
 import os
 import time
 import threading
+import weakref
 from dataclasses import dataclass
 from typing import Callable, Optional
 
 _LOG_LOCK = threading.Lock()
 
+# buffered INFO lines are flushed after this many writes, or by the flusher thread this many
+# seconds after the first unflushed line; WARN/ERROR always flush immediately
+_FLUSH_EVERY_N = 32
+_FLUSH_EVERY_S = 1.0
+
+_LOGGERS: "weakref.WeakSet[Logger]" = weakref.WeakSet()
+_flush_wanted = threading.Event()
+_flusher: Optional[threading.Thread] = None
+
+
+def _flush_loop():
+    # one daemon thread for every Logger; idle until some INFO line is left in a buffer
+    while True:
+        _flush_wanted.wait()
+        time.sleep(_FLUSH_EVERY_S)
+        with _LOG_LOCK:
+            _flush_wanted.clear()
+            for lg in list(_LOGGERS):
+                try:
+                    if lg._pending:
+                        lg._flush_locked()
+                except Exception:
+                    pass
+
+
+def _want_flush_locked():
+    # caller holds _LOG_LOCK
+    global _flusher
+    if _flusher is None:
+        _flusher = threading.Thread(target=_flush_loop, name="log-flush", daemon=True)
+        _flusher.start()
+    _flush_wanted.set()
+
+
+@atexit.register
+def _close_all():
+    for lg in list(_LOGGERS):
+        lg.close()
+
 
 def _ts() -> str:
     return time.strftime("%H:%M:%S")
@@ -30,6 +71,9 @@ class Logger:
         self.log_path = log_path
         self.callback = callback
         os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        self._fh = None  # opened on first write, kept open
+        self._pending = 0
+        _LOGGERS.add(self)  # weak: closed at exit if still alive, without keeping it alive
 
     def set_callback(self, cb: Optional[Callable[[str], None]]):
         self.callback = cb
@@ -38,8 +82,14 @@ class Logger:
         line = f"[{_ts()}] [{level}] {msg}"
         with _LOG_LOCK:
             try:
-                with open(self.log_path, "a", encoding="utf-8") as f:
-                    f.write(line + "\n")
+                if self._fh is None:
+                    self._fh = open(self.log_path, "a", encoding="utf-8", buffering=1 << 16)
+                self._fh.write(line + "\n")
+                self._pending += 1
+                if level != "INFO" or self._pending >= _FLUSH_EVERY_N:
+                    self._flush_locked()
+                elif self._pending == 1:
+                    _want_flush_locked()
             except Exception:
                 pass
         if self.callback:
@@ -48,6 +98,22 @@ class Logger:
             except Exception:
                 pass
 
+    def _flush_locked(self):
+        # caller holds _LOG_LOCK
+        if self._fh is not None:
+            self._fh.flush()
+        self._pending = 0
+
+    def close(self):
+        with _LOG_LOCK:
+            self._pending = 0
+            fh, self._fh = self._fh, None
+            if fh is not None:
+                try:
+                    fh.close()
+                except Exception:
+                    pass
+
     def info(self, msg: str):
         self._write("INFO", msg)
 
@@ -4,7 +4,7 @@ import os
 import sys
 import traceback
 
-from PySide6 import QtWidgets
+from PySide6 import QtCore, QtWidgets
 
 from logger import Logger
 from core.settings_manager import SettingsManager
@@ -38,6 +38,7 @@ def main():
         app = QtWidgets.QApplication(sys.argv)
         app.setApplicationName("Umbra")
         load_style(app)
+        settings.set_save_scheduler(QtCore.QTimer.singleShot)
 
         # First run wizard (manual + opt-in)
         if settings.is_first_run_pending():
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Callable, Dict, Optional
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
@@ -10,6 +11,27 @@ from logger import Logger
 from ui.pages import AppLauncherPage, DashboardPage, VPNManagerPage, AppRoutingPage, SettingsPage
 
 
+@lru_cache(maxsize=None)
+def _pointing_cursor() -> QtGui.QCursor:
+    # built on first call, i.e. after QApplication exists
+    return QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor)
+
+
+_TRAY_AVAILABLE: Optional[bool] = None
+
+
+def _tray_available() -> bool:
+    global _TRAY_AVAILABLE
+    if _TRAY_AVAILABLE is None:
+        _TRAY_AVAILABLE = QtWidgets.QSystemTrayIcon.isSystemTrayAvailable()
+    return _TRAY_AVAILABLE
+
+
+@lru_cache(maxsize=None)
+def _computer_icon() -> QtGui.QIcon:
+    return QtWidgets.QApplication.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_ComputerIcon)
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self, engine: EngineManager, settings: SettingsManager, logger: Optional[Logger] = None):
         super().__init__()
@@ -21,8 +43,12 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setMinimumSize(1050, 720)
 
         self._tray: Optional[QtWidgets.QSystemTrayIcon] = None
+        self._refresh_paused = False
+        self._reload_ui_settings()
+        self.settings.add_save_listener(self._reload_ui_settings)
         self._build_ui()
-        self._setup_tray()
+        # tray probing is not needed for the first paint
+        QtCore.QTimer.singleShot(0, self._setup_tray)
         self._apply_close_behavior()
 
     # ---------------------
@@ -56,10 +82,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_settings = QtWidgets.QPushButton("Settings")
 
         for b in (self.btn_dashboard, self.btn_launcher, self.btn_vpn, self.btn_route, self.btn_settings):
-            b.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+            b.setCursor(_pointing_cursor())
             b.setMinimumHeight(44)
             b.setCheckable(True)
-            b.setAutoExclusive(True)
             b.setObjectName("navButton")
 
         nav_layout.addWidget(self.btn_dashboard)
@@ -72,77 +97,164 @@ class MainWindow(QtWidgets.QMainWindow):
         # Content
         self.stack = QtWidgets.QStackedWidget()
 
-        self.page_dashboard = DashboardPage(
-            self.engine,
-            self.settings,
-            go_to_settings_cb=self._go_settings,
-            is_refresh_paused_cb=self._is_refresh_paused,
-        )
-        self.page_launcher = AppLauncherPage(self.engine, self.settings, is_refresh_paused_cb=self._is_refresh_paused)
-        self.page_vpn = VPNManagerPage(self.engine, self.settings)
-        self.page_route = AppRoutingPage(
-            self.engine,
-            self.settings,
-            is_refresh_paused_cb=self._is_refresh_paused,
-        )
-        self.page_settings = SettingsPage(self.engine, self.settings)
-
-        self.stack.addWidget(self.page_dashboard)
-        self.stack.addWidget(self.page_launcher)
-        self.stack.addWidget(self.page_vpn)
-        self.stack.addWidget(self.page_route)
-        self.stack.addWidget(self.page_settings)
+        # Pages are built on first visit (see _page); only the landing dashboard is built now.
+        self._page_factories: Dict[str, Callable[[], QtWidgets.QWidget]] = {
+            "dashboard": lambda: DashboardPage(
+                self.engine,
+                self.settings,
+                go_to_settings_cb=self._go_settings,
+            ),
+            "launcher": lambda: AppLauncherPage(self.engine, self.settings),
+            "vpn": lambda: VPNManagerPage(self.engine, self.settings),
+            "route": lambda: AppRoutingPage(self.engine, self.settings),
+            "settings": lambda: SettingsPage(self.engine, self.settings),
+        }
+        self._nav_buttons: Dict[str, QtWidgets.QPushButton] = {
+            "dashboard": self.btn_dashboard,
+            "launcher": self.btn_launcher,
+            "vpn": self.btn_vpn,
+            "route": self.btn_route,
+            "settings": self.btn_settings,
+        }
+        self._pages: Dict[str, QtWidgets.QWidget] = {}
+        # empty placeholder per slot keeps stack indices stable until the page is built
+        self._placeholders: Dict[str, QtWidgets.QWidget] = {}
+        # page name -> stack index; a built page takes over its placeholder's index
+        self._idx: Dict[str, int] = {}
+        for name in self._page_factories:
+            ph = QtWidgets.QWidget()
+            self._placeholders[name] = ph
+            self._idx[name] = self.stack.addWidget(ph)
+
+        # shown for the one event-loop tick while a page is being built
+        self._loading = QtWidgets.QLabel("Loading…")
+        self._loading.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self._loading_idx = self.stack.addWidget(self._loading)
+        self._pending_page: Optional[str] = None
+
+        self.page_dashboard = self._page("dashboard")
 
         root_layout.addWidget(nav)
         root_layout.addWidget(self.stack, 1)
 
         self.setCentralWidget(root)
 
-        # Wiring
-        self.btn_dashboard.clicked.connect(lambda: self._set_active_page(self.page_dashboard, self.btn_dashboard))
-        self.btn_launcher.clicked.connect(lambda: self._set_active_page(self.page_launcher, self.btn_launcher))
-        self.btn_vpn.clicked.connect(lambda: self._set_active_page(self.page_vpn, self.btn_vpn))
-        self.btn_route.clicked.connect(lambda: self._set_active_page(self.page_route, self.btn_route))
-        self.btn_settings.clicked.connect(lambda: self._set_active_page(self.page_settings, self.btn_settings))
-
-        self._set_active_page(self.page_dashboard, self.btn_dashboard)
+        # Wiring: one QAction per page, shared by nav buttons and menus
+        nav_titles = {
+            "dashboard": "Dashboard",
+            "launcher": "App Launcher",
+            "vpn": "VPN Manager",
+            "route": "App Routing",
+            "settings": "Settings",
+        }
+        self._nav_actions: Dict[str, QtGui.QAction] = {}
+        for name, title in nav_titles.items():
+            act = QtGui.QAction(title, self)
+            act.triggered.connect(partial(self._show_page, name))
+            self._nav_actions[name] = act
+
+        # one exclusive group, one connection; button id == the page's stack index
+        self._nav_group = QtWidgets.QButtonGroup(self)
+        self._nav_group.setExclusive(True)
+        self._nav_names: Dict[int, str] = {}
+        for name, btn in self._nav_buttons.items():
+            self._nav_group.addButton(btn, self._idx[name])
+            self._nav_names[self._idx[name]] = name
+        self._nav_group.idClicked.connect(self._on_nav_clicked)
+        self._build_shared_actions()
+
+        self._show_page("dashboard")
         self._build_menu()
 
-    def _go_settings(self):
-        self._set_active_page(self.page_settings, self.btn_settings)
+    def _build_shared_actions(self):
+        # used by the menubar, quick-actions menu and tray alike
+        self.act_show = QtGui.QAction("Show", self)
+        self.act_show.triggered.connect(self._tray_show)
+        self.act_start = QtGui.QAction("Start Engine", self)
+        self.act_start.triggered.connect(self.engine.start_engine)
+        self.act_stop = QtGui.QAction("Stop Engine", self)
+        self.act_stop.triggered.connect(self.engine.stop_engine)
+        self.act_refresh = QtGui.QAction("Refresh App List", self)
+        self.act_refresh.triggered.connect(self._refresh_app_list)
+        self.act_exit = QtGui.QAction("Exit", self)
+        self.act_exit.triggered.connect(self._tray_exit)
+
+    def _on_nav_clicked(self, idx: int):
+        self._show_page(self._nav_names[idx])
 
-    def _set_active_page(self, page: QtWidgets.QWidget, button: QtWidgets.QPushButton):
-        self.stack.setCurrentWidget(page)
-        button.setChecked(True)
+    def _go_settings(self):
+        self._show_page("settings")
+
+    def _page(self, name: str) -> QtWidgets.QWidget:
+        page = self._pages.get(name)
+        if page is None:
+            page = self._page_factories[name]()
+            ph = self._placeholders.pop(name)
+            # remove first so the page lands exactly at the placeholder's index
+            self.stack.removeWidget(ph)
+            self.stack.insertWidget(self._idx[name], page)
+            ph.deleteLater()
+            self._pages[name] = page
+            if hasattr(page, "set_refresh_paused"):
+                page.set_refresh_paused(self._refresh_paused)
+        return page
+
+    def _show_page(self, name: str):
+        self._nav_buttons[name].setChecked(True)
+        page = self._pages.get(name)
+        if page is not None:
+            self._pending_page = None
+            self.stack.setCurrentIndex(self._idx[name])
+            return
+        # first visit: switch to the placeholder now, build on the next tick so the click paints first
+        self._pending_page = name
+        self.stack.setCurrentIndex(self._loading_idx)
+        QtCore.QTimer.singleShot(0, lambda: self._finish_show_page(name))
+
+    def _finish_show_page(self, name: str):
+        page = self._page(name)
+        if self._pending_page != name:
+            return  # user moved on while we were building
+        self._pending_page = None
+        self.stack.setCurrentIndex(self._idx[name])
+        self._fade_in(page)
+
+    def _fade_in(self, page: QtWidgets.QWidget):
+        effect = QtWidgets.QGraphicsOpacityEffect(page)
+        page.setGraphicsEffect(effect)
+        anim = QtCore.QPropertyAnimation(effect, b"opacity", page)
+        anim.setDuration(150)
+        anim.setStartValue(0.0)
+        anim.setEndValue(1.0)
+        # drop the effect afterwards (deleting it detaches it from the page);
+        # it would otherwise force offscreen rendering forever
+        anim.finished.connect(effect.deleteLater)
+        anim.start(QtCore.QAbstractAnimation.DeletionPolicy.DeleteWhenStopped)
+
+    def _refresh_app_list(self):
+        self._page("route").refresh_now()
 
     def _build_menu(self):
         menu = self.menuBar()
 
         view_menu = menu.addMenu("View")
-        view_menu.addAction("Dashboard", lambda: self._set_active_page(self.page_dashboard, self.btn_dashboard))
-        view_menu.addAction("App Launcher", lambda: self._set_active_page(self.page_launcher, self.btn_launcher))
-        view_menu.addAction("VPN Manager", lambda: self._set_active_page(self.page_vpn, self.btn_vpn))
-        view_menu.addAction("App Routing", lambda: self._set_active_page(self.page_route, self.btn_route))
-        view_menu.addAction("Settings", lambda: self._set_active_page(self.page_settings, self.btn_settings))
+        view_menu.addActions(list(self._nav_actions.values()))
 
         actions_menu = menu.addMenu("Actions")
-        actions_menu.addAction("Start Engine", self.engine.start_engine)
-        actions_menu.addAction("Stop Engine", self.engine.stop_engine)
-        actions_menu.addAction("Refresh App List", self.page_route.refresh_now)
+        actions_menu.addActions([self.act_start, self.act_stop, self.act_refresh])
         actions_menu.addSeparator()
         actions_menu.addAction("Quick Actions...", self._show_quick_actions)
+        actions_menu.addSeparator()
+        actions_menu.addAction(self.act_exit)
 
     def _show_quick_actions(self):
+        nav = self._nav_actions
         menu = QtWidgets.QMenu(self)
-        menu.addAction("Start Engine", self.engine.start_engine)
-        menu.addAction("Stop Engine", self.engine.stop_engine)
+        menu.addActions([self.act_start, self.act_stop])
         menu.addSeparator()
-        menu.addAction("Refresh App List", self.page_route.refresh_now)
-        menu.addAction("Open Settings", self._go_settings)
+        menu.addActions([self.act_refresh, nav["settings"]])
         menu.addSeparator()
-        menu.addAction("Show Dashboard", lambda: self._set_active_page(self.page_dashboard, self.btn_dashboard))
-        menu.addAction("Show App Launcher", lambda: self._set_active_page(self.page_launcher, self.btn_launcher))
-        menu.addAction("Show App Routing", lambda: self._set_active_page(self.page_route, self.btn_route))
+        menu.addActions([nav["dashboard"], nav["launcher"], nav["route"]])
         menu.exec(QtGui.QCursor.pos())
 
     # ---------------------
@@ -150,33 +262,19 @@ class MainWindow(QtWidgets.QMainWindow):
     # ---------------------
 
     def _setup_tray(self):
-        if not QtWidgets.QSystemTrayIcon.isSystemTrayAvailable():
+        if not _tray_available():
             return
 
-        icon = self.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_ComputerIcon)
-        tray = QtWidgets.QSystemTrayIcon(icon, self)
+        tray = QtWidgets.QSystemTrayIcon(_computer_icon(), self)
         tray.setToolTip("Umbra v2")
 
+        nav = self._nav_actions
         menu = QtWidgets.QMenu()
-        act_show = menu.addAction("Show")
-        act_start = menu.addAction("Start Engine")
-        act_stop = menu.addAction("Stop Engine")
+        menu.addActions([self.act_show, self.act_start, self.act_stop])
         menu.addSeparator()
-        act_apps = menu.addAction("Refresh App List")
-        act_settings = menu.addAction("Open Settings")
-        act_dashboard = menu.addAction("Open Dashboard")
-        act_route = menu.addAction("Open App Routing")
+        menu.addActions([self.act_refresh, nav["settings"], nav["dashboard"], nav["route"]])
         menu.addSeparator()
-        act_exit = menu.addAction("Exit")
-
-        act_show.triggered.connect(self._tray_show)
-        act_start.triggered.connect(self.engine.start_engine)
-        act_stop.triggered.connect(self.engine.stop_engine)
-        act_apps.triggered.connect(self.page_route.refresh_now)
-        act_settings.triggered.connect(self._go_settings)
-        act_dashboard.triggered.connect(lambda: self._set_active_page(self.page_dashboard, self.btn_dashboard))
-        act_route.triggered.connect(lambda: self._set_active_page(self.page_route, self.btn_route))
-        act_exit.triggered.connect(self._tray_exit)
+        menu.addAction(self.act_exit)
 
         tray.setContextMenu(menu)
         tray.activated.connect(self._tray_activated)
@@ -188,12 +286,40 @@ class MainWindow(QtWidgets.QMainWindow):
         # reads settings; called on init and when user changes behavior
         pass
 
+    def _reload_ui_settings(self):
+        # resolved "ui" settings; refreshed on every settings save
+        ui = self.settings.ui()
+        self._ui_cache = {
+            "pause_when_min": bool(ui.get("pause_refresh_when_minimized", True)),
+            "tray_enabled": bool(ui.get("tray_enabled", True)),
+            "close_action": str(ui.get("close_action", "minimize_to_tray")),
+        }
+
     def _is_refresh_paused(self) -> bool:
-        ui = (self.settings.data.get("ui", {}) or {})
-        pause_when_min = bool(ui.get("pause_refresh_when_minimized", True))
-        if not pause_when_min:
-            return False
-        return self.isMinimized() or not self.isVisible()
+        return self._ui_cache["pause_when_min"] and (self.isMinimized() or not self.isVisible())
+
+    def _update_refresh_paused(self):
+        # pages only hear about actual transitions, not every refresh tick
+        paused = self._is_refresh_paused()
+        if paused == self._refresh_paused:
+            return
+        self._refresh_paused = paused
+        for page in self._pages.values():
+            if hasattr(page, "set_refresh_paused"):
+                page.set_refresh_paused(paused)
+
+    def changeEvent(self, event: QtCore.QEvent):
+        super().changeEvent(event)
+        if event.type() == QtCore.QEvent.Type.WindowStateChange:
+            self._update_refresh_paused()
+
+    def showEvent(self, event: QtGui.QShowEvent):
+        super().showEvent(event)
+        self._update_refresh_paused()
+
+    def hideEvent(self, event: QtGui.QHideEvent):
+        super().hideEvent(event)
+        self._update_refresh_paused()
 
     def _tray_activated(self, reason: QtWidgets.QSystemTrayIcon.ActivationReason):
         if reason == QtWidgets.QSystemTrayIcon.ActivationReason.Trigger:
@@ -209,19 +335,21 @@ class MainWindow(QtWidgets.QMainWindow):
         QtWidgets.QApplication.quit()
 
     def _cleanup_before_exit(self):
-        try:
-            self.page_dashboard.shutdown()
-        except Exception:
-            pass
-        try:
+        # page and engine shutdown() are best-effort themselves; only a deleted Qt object can still raise
+        for name, page in self._pages.items():
+            if not hasattr(page, "shutdown"):
+                continue
+            try:
+                page.shutdown()
+            except RuntimeError as e:
+                self.logger.warn(f"{name} page shutdown failed: {e}")
+        if self.engine is not None:
             self.engine.shutdown()
-        except Exception:
-            pass
+        self.settings.flush_save()
 
     def closeEvent(self, event: QtGui.QCloseEvent):
-        ui = (self.settings.data.get("ui", {}) or {})
-        tray_enabled = bool(ui.get("tray_enabled", True))
-        close_action = str(ui.get("close_action", "minimize_to_tray"))
+        tray_enabled = self._ui_cache["tray_enabled"]
+        close_action = self._ui_cache["close_action"]
 
         if tray_enabled and close_action == "minimize_to_tray" and self._tray is not None:
             event.ignore()
@@ -3,15 +3,24 @@ from __future__ import annotations
 import webbrowser
 import os
 import platform
+import random
 import statistics
 import socket
+import struct
 import subprocess
+import threading
 import time
 import ipaddress
-from typing import Any, Callable, Dict, List, Optional
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import psutil
 import requests
+from requests.adapters import HTTPAdapter
 from PySide6 import QtCore, QtGui, QtWidgets
 
 # Compatibility shim:
@@ -22,8 +31,15 @@ if not hasattr(QtCore, "pyqtSignal") and hasattr(QtCore, "Signal"):
 
 try:
     import pyqtgraph as pg
+    import numpy as np  # always present with pyqtgraph; used for the plot ring buffers
 except Exception:
     pg = None  # optional
+    np = None
+
+try:
+    import icmplib
+except Exception:
+    icmplib = None  # optional; pings fall back to the system ping binary
 
 from core.engine_manager import EngineManager
 from core.settings_manager import SettingsManager
@@ -41,34 +57,160 @@ def human_mbps(v: float) -> str:
     return f"{v:.2f} Mbps"
 
 
-def _ping_cmd(host: str) -> List[str]:
-    sys = platform.system().lower()
-    if sys.startswith("win"):
-        return ["ping", "-n", "1", "-w", "1000", host]
-    return ["ping", "-c", "1", "-W", "1", host]
+_SYS_NAME = platform.system().lower()
+_IS_WIN = _SYS_NAME.startswith("win")
+# -n on unix: numeric output, no reverse lookup of the reply address
+_PING_ARGV_PREFIX = ("ping", "-n", "1", "-w", "1000") if _IS_WIN else ("ping", "-n", "-c", "1", "-W", "1")
 
 
-def _parse_ping_ms(output: str) -> Optional[float]:
-    out = output.lower()
-    # windows: time=12ms / time<1ms
-    # linux: time=12.3 ms
-    import re
+def _ping_cmd(host: str) -> Tuple[str, ...]:
+    # subprocess takes any sequence; a tuple skips the list build per probe
+    return (*_PING_ARGV_PREFIX, host)
+
+
+# windows: time=12ms / time<1ms (whole ms only)
+# linux/mac: time=12.3 ms  (the summary's "time 0ms" has no '=' and never matches)
+# sliced out of the raw bytes with find(): no decode, no regex match objects per probe
+
+
+def _ms_at(output: bytes, i: int) -> Optional[float]:
+    # output[i:] starts with "time=" / "time<"; float() takes bytes and ignores the space before "ms"
+    if i < 0:
+        return None
+    j = output.find(b"ms", i + 5)
+    if j < 0:
+        return None
+    try:
+        return float(output[i + 5:j])
+    except ValueError:
+        return None
+
+
+def _parse_ping_ms_win(output: bytes) -> Optional[float]:
+    i = output.find(b"time=")
+    return _ms_at(output, i if i >= 0 else output.find(b"time<"))
+
+
+def _parse_ping_ms_nix(output: bytes) -> Optional[float]:
+    return _ms_at(output, output.find(b"time="))
+
+
+_parse_ping_ms = _parse_ping_ms_win if _IS_WIN else _parse_ping_ms_nix
+
+
+# cleared on the first permission error so we stop retrying unprivileged ICMP sockets
+_ICMP_OK = True
+
+
+def _icmp_ping(host: str, count: int, interval: float) -> Optional[Tuple[Optional[float], float, float]]:
+    """
+    In-process ICMP via icmplib. Returns (avg_ms, loss, jitter_ms), avg_ms None when nothing came back,
+    or None when icmplib cannot be used here (caller falls back to the ping binary).
+    """
+    global _ICMP_OK
+    if icmplib is None or not _ICMP_OK:
+        return None
+    try:
+        h = icmplib.ping(host, count=count, interval=interval, timeout=1, privileged=False)
+    except icmplib.SocketPermissionError:
+        _ICMP_OK = False
+        return None
+    except icmplib.ICMPLibError:
+        return None, 1.0, 0.0  # e.g. name lookup failed: treat as all lost
+    return _host_stats(h)
+
+
+def _icmp_multiping(hosts: List[str], count: int, interval: float) -> Optional[List[Tuple[Optional[float], float, float]]]:
+    """_icmp_ping for many hosts at once (all in flight together); None when icmplib cannot be used."""
+    global _ICMP_OK
+    if icmplib is None or not _ICMP_OK:
+        return None
+    try:
+        res = icmplib.multiping(
+            hosts, count=count, interval=interval, timeout=1, concurrent_tasks=len(hosts), privileged=False
+        )
+    except icmplib.SocketPermissionError:
+        _ICMP_OK = False
+        return None
+    except icmplib.ICMPLibError:
+        return None  # one bad host fails the batch; let the caller ping them individually
+    return [_host_stats(h) for h in res]
+
+
+def _host_stats(h) -> Tuple[Optional[float], float, float]:
+    rtts = list(h.rtts)
+    if not rtts:
+        return None, 1.0, 0.0
+    # pstdev (not icmplib's jitter) so scores match the subprocess path
+    jitter = statistics.pstdev(rtts) if len(rtts) >= 2 else 0.0
+    return statistics.mean(rtts), h.packet_loss, jitter
+
+
+class _IcmpProbe:
+    """
+    Single echo requests over long-lived unprivileged ICMP sockets (one per address family),
+    for the once-a-second dashboard ping. Calls are serialized; the socket is shared.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._socks: Dict[int, Any] = {}
+        self._seq = 0
+
+    def ping(self, host: str, timeout: float = 1.0) -> Optional[float]:
+        """RTT in ms, or None when lost. Raises icmplib.SocketPermissionError if ICMP sockets are not allowed."""
+        with self._lock:
+            try:
+                addr = icmplib.resolve(host)[0] if icmplib.is_hostname(host) else host
+            except icmplib.ICMPLibError:
+                return None
+            family = 6 if icmplib.is_ipv6_address(addr) else 4
+            sock = self._socks.get(family)
+            if sock is None:
+                cls = icmplib.ICMPv6Socket if family == 6 else icmplib.ICMPv4Socket
+                sock = self._socks[family] = cls(privileged=False)
+            self._seq = (self._seq + 1) & 0xFFFF
+            req = icmplib.ICMPRequest(destination=addr, id=icmplib.PID, sequence=self._seq)
+            try:
+                sock.send(req)
+                reply = sock.receive(req, timeout)
+                reply.raise_for_status()
+            except icmplib.ICMPLibError:
+                return None
+            return (reply.time - req.time) * 1000.0
+
+
+_ICMP_PROBE = _IcmpProbe()
 
-    m = re.search(r"time[=<]\s*([0-9]+(?:\.[0-9]+)?)\s*ms", out)
-    if m:
-        try:
-            return float(m.group(1))
-        except Exception:
-            return None
 
-    m = re.search(r"time\s*=\s*([0-9]+)\s*ms", out)
-    if m:
+def _ping_once(host: str) -> Optional[float]:
+    global _ICMP_OK
+    if icmplib is not None and _ICMP_OK:
         try:
-            return float(m.group(1))
-        except Exception:
-            return None
+            return _ICMP_PROBE.ping(host)
+        except icmplib.SocketPermissionError:
+            _ICMP_OK = False
+    return _cmd_ping(host, 1, 0.0)[0]
+
+
+def _cmd_ping(host: str, count: int, interval: float) -> Tuple[Optional[float], float, float]:
+    samples: List[float] = []
+    for i in range(count):
+        if i:
+            time.sleep(interval)
+        p = subprocess.run(_ping_cmd(host), capture_output=True)
+        ms = _parse_ping_ms(p.stdout or b"")
+        if ms is not None and p.returncode == 0:
+            samples.append(ms)
+    if not samples:
+        return None, 1.0, 0.0
+    jitter = statistics.pstdev(samples) if len(samples) >= 2 else 0.0
+    return statistics.mean(samples), (count - len(samples)) / count, jitter
 
-    return None
+
+def _ping_stats(host: str, count: int = 1, interval: float = 0.08) -> Tuple[Optional[float], float, float]:
+    """(avg_ms or None, loss 0..1, jitter_ms) over `count` echo requests."""
+    return _icmp_ping(host, count, interval) or _cmd_ping(host, count, interval)
 
 
 def _split_args(raw: str) -> List[str]:
@@ -83,6 +225,31 @@ def _split_args(raw: str) -> List[str]:
         return raw.split()
 
 
+@contextmanager
+def _bulk_update(w: QtWidgets.QWidget):
+    """Rebuild a widget with repaints and change signals off; callers resync state afterwards."""
+    w.setUpdatesEnabled(False)
+    blocked = w.blockSignals(True)
+    try:
+        yield w
+    finally:
+        w.blockSignals(blocked)
+        w.setUpdatesEnabled(True)
+
+
+def _fill_table(table: QtWidgets.QTableWidget, rows: List[Tuple[str, ...]]):
+    """Replace a QTableWidget's contents with one repaint: size once, then set items with updates off."""
+    table.setUpdatesEnabled(False)
+    try:
+        table.setRowCount(0)
+        table.setRowCount(len(rows))
+        for r, cells in enumerate(rows):
+            for c, text in enumerate(cells):
+                table.setItem(r, c, QtWidgets.QTableWidgetItem(text))
+    finally:
+        table.setUpdatesEnabled(True)
+
+
 # ---------------------
 # Graph widgets (no zoom)
 # ---------------------
@@ -115,10 +282,8 @@ class PingWorker(QtCore.QThread):
 
     def run(self):
         try:
-            p = subprocess.run(_ping_cmd(self.host), capture_output=True, text=True)
-            out = (p.stdout or "") + "\n" + (p.stderr or "")
-            ms = _parse_ping_ms(out)
-            if ms is None or p.returncode != 0:
+            ms = _ping_once(self.host)
+            if ms is None:
                 self.result.emit(0.0, False)
             else:
                 self.result.emit(ms, True)
@@ -126,6 +291,61 @@ class PingWorker(QtCore.QThread):
             self.result.emit(0.0, False)
 
 
+class SafePingWorker(QtCore.QThread):
+    done = QtCore.pyqtSignal(float, float, float, int)  # ping ms, jitter ms, loss 0..1, count
+
+    def __init__(self, host: str, count: int = 10, parent=None):
+        super().__init__(parent)
+        self.host = host
+        self.count = count
+
+    def run(self):
+        try:
+            avg, loss, jitter = _ping_stats(self.host, self.count)
+        except Exception:
+            avg, loss, jitter = None, 1.0, 0.0
+        self.done.emit(avg or 0.0, jitter, loss, self.count)
+
+
+_SPEEDTEST_SESSION: Optional[requests.Session] = None
+
+
+def _speedtest_session() -> requests.Session:
+    # shared across runs: the upload reuses the download's connection when both hit the same host
+    global _SPEEDTEST_SESSION
+    if _SPEEDTEST_SESSION is None:
+        s = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        _SPEEDTEST_SESSION = s
+    return _SPEEDTEST_SESSION
+
+
+# upload test payload: one random block, repeated
+_RAND_BLOCK = os.urandom(256 * 1024)
+
+
+class _UploadBody:
+    """
+    Streams `total` bytes of _RAND_BLOCK. Having __len__ makes requests send a plain
+    Content-Length body instead of chunked transfer encoding.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        remaining = self.total
+        while remaining > 0:
+            n = min(len(_RAND_BLOCK), remaining)
+            yield _RAND_BLOCK if n == len(_RAND_BLOCK) else _RAND_BLOCK[:n]
+            remaining -= n
+
+
 class AdvancedSpeedtestWorker(QtCore.QThread):
     progress = QtCore.pyqtSignal(str, int)  # phase, percent
     finished = QtCore.pyqtSignal(dict)  # results dict
@@ -148,28 +368,26 @@ class AdvancedSpeedtestWorker(QtCore.QThread):
         try:
             # ---- download (Range)
             self.progress.emit("download", 0)
-            headers = {"Range": f"bytes=0-{self.download_bytes-1}"}
-            t0 = time.time()
-            with requests.get(self.download_url, headers=headers, stream=True, timeout=40) as r:
-                r.raise_for_status()
-                got = 0
-                for chunk in r.iter_content(chunk_size=256 * 1024):
-                    if not chunk:
-                        continue
-                    got += len(chunk)
-                    pc = min(100, int(got * 100 / max(1, self.download_bytes)))
-                    self.progress.emit("download", pc)
-                    if got >= self.download_bytes:
-                        break
-            dt = max(0.001, time.time() - t0)
+            self._last_pc = 0
+            # one reusable 1 MiB buffer; the payload is only counted, never kept
+            view = memoryview(bytearray(1 << 20))
+            got, dt, ranged = self._download(view)
+            if not ranged:
+                res["warning"] = "server ignored Range; stopped reading at the test size"
+            res["download_bytes"] = got
             res["download_mbps"] = (got * 8.0 / dt) / 1e6
 
+            http = _speedtest_session()
             # ---- upload (POST)
             self.progress.emit("upload", 0)
-            payload = os.urandom(self.upload_bytes)
             t1 = time.time()
             # Upload endpoint must accept POST; result ignored.
-            r2 = requests.post(self.upload_url, data=payload, timeout=40)
+            r2 = http.post(
+                self.upload_url,
+                data=_UploadBody(self.upload_bytes),
+                headers={"Content-Type": "application/octet-stream"},
+                timeout=40,
+            )
             _ = r2.status_code
             dt2 = max(0.001, time.time() - t1)
             res["upload_mbps"] = (self.upload_bytes * 8.0 / dt2) / 1e6
@@ -179,27 +397,146 @@ class AdvancedSpeedtestWorker(QtCore.QThread):
         except Exception as e:
             self.failed.emit(str(e))
 
+    def _download_progress(self, got: int, want: int):
+        pc = min(100, got * 100 // max(1, want))
+        if pc - self._last_pc >= 2 or (pc == 100 and self._last_pc < 100):  # ~50 signals per test regardless of size
+            self.progress.emit("download", pc)
+            self._last_pc = pc
+
+    def _download(self, view: memoryview) -> Tuple[int, float, bool]:
+        """Range GET read with readinto() into the reused buffer. Returns (bytes, seconds, range_honoured)."""
+        # identity: count what crosses the wire (raw reads don't decode anyway)
+        headers = {"Range": f"bytes=0-{self.download_bytes-1}", "Accept-Encoding": "identity"}
+        t0 = time.time()
+        with _speedtest_session().get(self.download_url, headers=headers, stream=True, timeout=40) as r:
+            r.raise_for_status()
+            want = self.download_bytes
+            if r.status_code != 206:
+                # Range ignored: the server sends the whole file; never expect more than it declares
+                size = int(r.headers.get("Content-Length") or 0)
+                if 0 < size < want:
+                    want = size
+            got = 0
+            while got < want:
+                n = r.raw.readinto(view[: min(len(view), want - got)])
+                if not n:
+                    break
+                got += n
+                self._download_progress(got, want)
+            dt = max(0.001, time.time() - t0)
+            # drop the connection now rather than letting anything left in flight drain
+            r.raw.close()
+            r.close()
+        return got, dt, r.status_code == 206
 
-class SubscriptionUpdateWorker(QtCore.QThread):
-    done = QtCore.pyqtSignal(int)
-    failed = QtCore.pyqtSignal(str)
 
-    def __init__(self, settings: SettingsManager, url: str, parent=None):
-        super().__init__(parent)
+class ConfigImportSignals(QtCore.QObject):
+    parsed = QtCore.pyqtSignal(object, object)  # key (subscription url, None = all subs, or text source), entries
+    done = QtCore.pyqtSignal(object)  # key; every parsed batch has already been delivered
+    failed = QtCore.pyqtSignal(object, str)  # key, error
+
+
+class SubscriptionUpdateWorker(QtCore.QRunnable):
+    """
+    Runs on QThreadPool.globalInstance(); results come back through `signals`, a QObject the
+    caller owns on the UI thread (runnables can't carry signals and are deleted after run()).
+    Only downloads and splits: the entries are imported on the UI thread, which owns settings.data.
+    """
+
+    def __init__(self, settings: SettingsManager, key: Optional[str], urls: List[str], signals: ConfigImportSignals):
+        super().__init__()
         self.settings = settings
-        self.url = url
+        self.key = key  # None: refresh every subscription
+        self.urls = urls
+        self.signals = signals
 
     def run(self):
         try:
-            n = self.settings.update_subscription(self.url, timeout=30)
-            self.done.emit(n)
+            errors: List[Exception] = []
+            for _url, entries, err in self.settings.fetch_subscriptions(self.urls, timeout=30):
+                if err is not None:
+                    errors.append(err)
+                elif entries:
+                    self.signals.parsed.emit(self.key, entries)
+            if errors and len(errors) == len(self.urls):
+                raise errors[0]
+            self.signals.done.emit(self.key)
         except Exception as e:
-            self.failed.emit(str(e))
+            self.signals.failed.emit(self.key, str(e))
+
+
+class TextImportWorker(QtCore.QRunnable):
+    """Decodes and splits pasted/clipboard text off the UI thread (large sub dumps take a while)."""
+
+    def __init__(self, settings: SettingsManager, text: str, key: str, signals: ConfigImportSignals):
+        super().__init__()
+        self.settings = settings
+        self.text = text
+        self.key = key
+        self.signals = signals
+
+    def run(self):
+        try:
+            self.signals.parsed.emit(self.key, self.settings.split_smart_input(self.text))
+            self.signals.done.emit(self.key)
+        except Exception as e:
+            self.signals.failed.emit(self.key, str(e))
+
+
+class CoreUpdateSignals(QtCore.QObject):
+    log = QtCore.pyqtSignal(str)
+    finished = QtCore.pyqtSignal(str, bool)  # core key ("singbox" / "clash"), installed
+
+
+class CoreUpdateWorker(QtCore.QRunnable):
+    """Downloads and installs one core on QThreadPool.globalInstance(); log lines come back through `signals`."""
+
+    _LABELS = {"singbox": "sing-box", "clash": "mihomo"}
+
+    def __init__(self, name: str, repo: str, signals: CoreUpdateSignals):
+        super().__init__()
+        self.name = name
+        self.repo = repo
+        self.signals = signals
+
+    def run(self):
+        log = self.signals.log.emit
+        label = self._LABELS.get(self.name, self.name)
+        # own updater (HTTP session) and temp dir per task, so both cores can download at once
+        updater = CoreUpdater(log=log, tmp_dir=os.path.join("cores", "_tmp", self.name))
+        ok = False
+        log(f"[INFO] Checking latest release: {self.repo}")
+        try:
+            if self.name == "singbox":
+                tag = updater.update_singbox(self.repo)
+            else:
+                tag = updater.update_mihomo(self.repo)
+            log(f"[INFO] {label} updated to {tag}")
+            ok = True
+        except Exception as e:
+            log(f"[ERROR] {label} update failed: {e}")
+        finally:
+            updater.cleanup_tmp()
+            self.signals.finished.emit(self.name, ok)
+
+
+# DNS suggestion: score over the last N optimizer runs, so one noisy run does not flip the pick
+_DNS_SCORE_WINDOW = 32
+_DNS_SUGGEST_TOP_K = 5
+_DNS_SUGGEST_SETTLE_RUNS = 3
+
+
+def _dns_window_score(samples: List[List[float]]) -> float:
+    """Mean of (1 - loss) / ping_ms over the [ping_ms, loss, jitter_ms] window."""
+    if not samples:
+        return 0.0
+    return sum((1.0 - loss) / max(ping, 1.0) for ping, loss, _jitter in samples) / len(samples)
 
 
 class OptimizeDnsWorker(QtCore.QThread):
     done = QtCore.pyqtSignal(dict)  # {"ranked": [(idx, name, server, ping, loss, jitter), ...]}
     failed = QtCore.pyqtSignal(str)
+    progress = QtCore.pyqtSignal(int, int)  # hosts done, hosts total
 
     def __init__(self, dns_servers: List[Dict[str, Any]], parent=None):
         super().__init__(parent)
@@ -207,69 +544,220 @@ class OptimizeDnsWorker(QtCore.QThread):
 
     def run(self):
         try:
-            ranked = []
+            todo = []
             for i, s in enumerate(self.dns_servers):
                 host = (s.get("server") or "").strip()
-                if not host:
-                    continue
-                samples = []
-                lost = 0
-                for _ in range(4):
-                    p = subprocess.run(_ping_cmd(host), capture_output=True, text=True)
-                    out = (p.stdout or "") + "\n" + (p.stderr or "")
-                    ms = _parse_ping_ms(out)
-                    if ms is None or p.returncode != 0:
-                        lost += 1
-                    else:
-                        samples.append(ms)
-                    time.sleep(0.08)
-
-                loss = lost / 4.0
-                ping = statistics.mean(samples) if samples else 999.0
-                jitter = statistics.pstdev(samples) if len(samples) >= 2 else 0.0
-                score = ping + jitter * 2.0 + loss * 2000.0
-                ranked.append((score, i, s.get("name", ""), host, ping, loss, jitter))
-
-            ranked.sort(key=lambda x: x[0])
-            out = {
-                "ranked": [(i, name, host, ping, loss, jitter) for _, i, name, host, ping, loss, jitter in ranked]
-            }
-            self.done.emit(out)
+                if host:
+                    todo.append((i, s, host))
+            stats = self._ping_all([host for _, _, host in todo]) if todo else []
+
+            rows = [
+                (i, s.get("name", ""), host, 999.0 if avg is None else avg, loss, jitter)
+                for (i, s, host), (avg, loss, jitter) in zip(todo, stats)
+            ]
+            # score = ping + 2*jitter + 2000*loss; rows are already in the emitted shape, sort them in place
+            rows.sort(key=lambda r: r[3] + r[5] * 2.0 + r[4] * 2000.0)
+            self.done.emit({"ranked": rows})
         except Exception as e:
             self.failed.emit(str(e))
 
+    def _ping_all(self, hosts: List[str]) -> List[Tuple[Optional[float], float, float]]:
+        # every server is probed concurrently; wall time is roughly one server's worth
+        n = len(hosts)
+        stats = _icmp_multiping(hosts, 4, 0.08)
+        if stats is not None:
+            self.progress.emit(n, n)
+            return stats
+        stats = [(None, 1.0, 0.0)] * n
+        with ThreadPoolExecutor(max_workers=min(32, n)) as ex:
+            futs = {ex.submit(_cmd_ping, host, 4, 0.08): k for k, host in enumerate(hosts)}
+            for finished, f in enumerate(as_completed(futs), 1):
+                stats[futs[f]] = f.result()
+                self.progress.emit(finished, n)
+        return stats
+
+
+def _safe_ping_ms(host: str) -> Optional[float]:
+    try:
+        out = subprocess.check_output(_ping_cmd(host), stderr=subprocess.STDOUT, timeout=3)
+    except Exception:
+        return None
+    return _parse_ping_ms(out)
+
+
+class DnsSafeCheckWorker(QtCore.QThread):
+    """A couple of echo requests per host, all hosts in flight together (first-run safe check)."""
+    done = QtCore.pyqtSignal(list)  # [(host, ms or None), ...] in input order
+    progress = QtCore.pyqtSignal(int, int)  # hosts done, hosts total
+
+    def __init__(self, hosts: List[str], parent=None):
+        super().__init__(parent)
+        self.hosts = hosts
+
+    def run(self):
+        results: List[Tuple[str, Optional[float]]] = []
+        try:
+            n = len(self.hosts)
+            if n:
+                # in-process ICMP first; the ping binary (one process per host) only when icmplib can't run here
+                stats = _icmp_multiping(self.hosts, 2, 0.05)
+                if stats is not None:
+                    results = [(h, avg) for h, (avg, _loss, _jitter) in zip(self.hosts, stats)]
+                    self.progress.emit(n, n)
+                else:
+                    ms: List[Optional[float]] = [None] * n
+                    with ThreadPoolExecutor(max_workers=n) as ex:
+                        futs = {ex.submit(_safe_ping_ms, h): k for k, h in enumerate(self.hosts)}
+                        for finished, f in enumerate(as_completed(futs), 1):
+                            ms[futs[f]] = f.result()
+                            self.progress.emit(finished, n)
+                    results = list(zip(self.hosts, ms))
+        finally:
+            self.done.emit(results)
+
+
+class _SamplerThread(QtCore.QThread):
+    """Calls `sample` every `interval` seconds off the GUI thread until stop()."""
+
+    def __init__(self, sample: Callable[[], None], interval: float, parent=None):
+        super().__init__(parent)
+        self._sample = sample
+        self.interval = interval
+        self.paused = False
+        self._stop_evt = threading.Event()
+
+    def run(self):
+        while not self._stop_evt.wait(self.interval):
+            try:
+                self._sample()
+            except Exception:
+                pass
+
+    def stop(self):
+        self._stop_evt.set()
+        self.wait(2000)
+
+
+class _NetSampler(_SamplerThread):
+    sample_ready = QtCore.pyqtSignal(float, float, int, int, int, int)  # down, up Mbps; pkts recv/sent; errin/out
+
+    def __init__(self, interval: float = 1.0, parent=None):
+        super().__init__(self._sample_net, interval, parent)
+        self._last = None  # (counters, ts); dropped while paused so a resume does not average over the gap
+
+    def _sample_net(self):
+        if self.paused:
+            self._last = None
+            return
+        c = psutil.net_io_counters()
+        t = time.monotonic()
+        last, self._last = self._last, (c, t)
+        if last is None:
+            return
+        c0, t0 = last
+        dt = max(0.001, t - t0)
+        down = ((c.bytes_recv - c0.bytes_recv) * 8.0 / dt) / 1e6
+        up = ((c.bytes_sent - c0.bytes_sent) * 8.0 / dt) / 1e6
+        self.sample_ready.emit(down, up, c.packets_recv, c.packets_sent, c.errin, c.errout)
+
+
+class _PortSampler(_SamplerThread):
+    """
+    Re-reads listening ports when the engine reports a state change (kick()), plus a slow
+    safety poll for ports opened by other apps.
+    """
+
+    ports_ready = QtCore.pyqtSignal(str)
+    SETTLE_S = 1.5  # a freshly started core binds its ports shortly after spawn
+
+    def __init__(self, engine: EngineManager, interval: float = 30.0, parent=None):
+        super().__init__(self._sample_ports, interval, parent)
+        self.engine = engine
+        self._kick = threading.Event()
+        engine.add_state_listener(self.kick)
+
+    def kick(self):
+        self._kick.set()
+
+    def run(self):
+        self._sample()  # don't leave the label empty until the first event
+        while not self._stop_evt.is_set():
+            if self._kick.wait(self.interval):
+                self._kick.clear()
+                self._stop_evt.wait(self.SETTLE_S)
+            if self._stop_evt.is_set():
+                break
+            try:
+                self._sample()
+            except Exception:
+                pass
+
+    def stop(self):
+        self._stop_evt.set()
+        self._kick.set()
+        self.wait(2000)
+
+    def _sample_ports(self):
+        if self.paused:
+            return
+        ports = self.engine.detect_listening_ports(limit=6)
+        self.ports_ready.emit(", ".join(f"{p.port}:{p.name}" for p in ports) if ports else "-")
+
 
 # ---------------------
 # Dashboard Page
 # ---------------------
 
+# Live Network metric selector (item data of cmb_metric)
+_METRIC_BANDWIDTH, _METRIC_PACKETS, _METRIC_ERRORS = 0, 1, 2
+
+# soft caps (not hard rules; user can override in OBS)
+_PLATFORM_CAP_KBPS = {
+    "Kick": 8000,
+    "Aparat": 6000,
+    "Twitch": 6000,
+    "YouTube": 9000,
+}
+
+
 class DashboardPage(QtWidgets.QWidget):
+    _log_wakeup = QtCore.pyqtSignal()  # queued to the GUI thread when engine logs arrive from elsewhere
+
     def __init__(
         self,
         engine: EngineManager,
         settings: SettingsManager,
         go_to_settings_cb: Optional[Callable[[], None]] = None,
-        is_refresh_paused_cb: Optional[Callable[[], bool]] = None,
     ):
         super().__init__()
         self.engine = engine
         self.settings = settings
         self.go_to_settings_cb = go_to_settings_cb
-        self.is_refresh_paused_cb = is_refresh_paused_cb
+        self._refresh_paused = False
 
         self.scanner = NetworkScanner()
 
         self._ping_host = "1.1.1.1"
-        self._ping_history: List[Optional[float]] = []  # 60 items; None=lost
-        self._last_io = psutil.net_io_counters()
-        self._last_ts = time.time()
+        self._ping_history: "deque[Optional[float]]" = deque(maxlen=60)  # None=lost
+        self._net_sample: Optional[Tuple[float, float, int, int, int, int]] = None  # latest from _NetSampler
         self._adv_last_results: Dict[str, Any] = {}
-        self._last_ports_ts = 0.0
         self._ports_cache = "-"
-        self._load_port_override()
+        self._last_engine_running: Optional[bool] = None  # terminal stylesheet is only rewritten on change
+        self._last_log_color: Optional[str] = None
+        self._tick_n = 0
+
+        # engine log lines are coalesced and written to the terminal at most every 50 ms
+        self._log_pending: List[str] = []
+        self._log_flush_pending = False
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_wakeup.connect(self._log_timer.start)
 
         self._build()
         self._wire()
+        self._load_port_override()
 
         # terminal callback
         self.engine.set_log_callback(self._append_terminal)
@@ -286,10 +774,20 @@ class DashboardPage(QtWidgets.QWidget):
         self._ping_timer.timeout.connect(self._ping_once_if_engine_on)
         self._ping_timer.start()
 
+        # counters and the port table are read on worker threads; _tick only formats
+        self._net_sampler = _NetSampler(1.0, self)
+        self._net_sampler.sample_ready.connect(self._on_net_sample)
+        self._net_sampler.start()
+        self._port_sampler = _PortSampler(self.engine, 30.0, self)
+        self._port_sampler.ports_ready.connect(self._on_ports)
+        self._port_sampler.start()
+
     def shutdown(self):
         try:
             self._timer.stop()
             self._ping_timer.stop()
+            self._net_sampler.stop()
+            self._port_sampler.stop()
         except Exception:
             pass
 
@@ -338,7 +836,7 @@ class DashboardPage(QtWidgets.QWidget):
         gb_speed = QtWidgets.QGroupBox("Speed Test")
         gbs = QtWidgets.QVBoxLayout(gb_speed)
         self.cmb_speed_target = QtWidgets.QComboBox()
-        for t in (self.settings.data.get("speedtest", {}) or {}).get("targets", []):
+        for t in self.settings.get_speedtest_targets():
             self.cmb_speed_target.addItem(f"{t.get('name','Target')} ({t.get('loc','')})")
         self.btn_pingtest = QtWidgets.QPushButton("Ping / Jitter / Loss (Safe)")
         self.btn_pingtest.setMinimumHeight(44)
@@ -373,7 +871,11 @@ class DashboardPage(QtWidgets.QWidget):
         gb_live = QtWidgets.QGroupBox("Live Network")
         gbl = QtWidgets.QVBoxLayout(gb_live)
         self.cmb_metric = QtWidgets.QComboBox()
-        self.cmb_metric.addItems(["Bandwidth (Down/Up)", "Packets (recv/sent)", "Errors (in/out)"])
+        self.cmb_metric.addItem("Bandwidth (Down/Up)", _METRIC_BANDWIDTH)
+        self.cmb_metric.addItem("Packets (recv/sent)", _METRIC_PACKETS)
+        self.cmb_metric.addItem("Errors (in/out)", _METRIC_ERRORS)
+        self._metric = _METRIC_BANDWIDTH
+        self.cmb_metric.currentIndexChanged.connect(lambda i: setattr(self, "_metric", self.cmb_metric.itemData(i)))
         self.lbl_live = QtWidgets.QLabel("Down: - | Up: -")
         self.lbl_live2 = QtWidgets.QLabel("Ping60s: -   Loss60s: -   Jitter60s: -")
         self.lbl_ports = QtWidgets.QLabel("Listening ports: -")
@@ -390,9 +892,10 @@ class DashboardPage(QtWidgets.QWidget):
             self.plot.showGrid(x=False, y=True, alpha=0.15)
             self.curve_down = self.plot.plot([1], [1], pen=pg.mkPen(width=2))
             self.curve_up = self.plot.plot([1], [1], pen=pg.mkPen(width=2))
-            self._x = list(range(60))
-            self._down_hist = [0.0] * 60
-            self._up_hist = [0.0] * 60
+            # fixed 60-sample ring buffers, shifted in place each tick
+            self._x = np.arange(60, dtype=np.float64)
+            self._down_hist = np.zeros(60, dtype=np.float64)
+            self._up_hist = np.zeros(60, dtype=np.float64)
         else:
             self.plot = QtWidgets.QLabel("pyqtgraph not installed (graph disabled).")
             self.plot.setFixedHeight(160)
@@ -423,6 +926,7 @@ class DashboardPage(QtWidgets.QWidget):
         self.terminal = QtWidgets.QTextEdit()
         self.terminal.setReadOnly(True)
         self.terminal.setFixedHeight(150)
+        self.terminal.document().setMaximumBlockCount(500)  # oldest lines drop off
 
         bottom.addWidget(self.btn_engine, 0)
         bottom.addWidget(self.terminal, 1)
@@ -484,19 +988,37 @@ class DashboardPage(QtWidgets.QWidget):
         self.btn_engine.clicked.connect(self._toggle_engine)
         self.btn_apply_profile.clicked.connect(self._apply_profile)
         self.cmb_profile.currentTextChanged.connect(lambda _: self._refresh_profile_ui())
-        self.spin_upload_mbps.valueChanged.connect(lambda _: self._update_bitrate_label())
-        self.bit_platform.currentTextChanged.connect(lambda _: self._update_bitrate_label())
+        # spinbox arrows/typing fire per step; refresh the bitrate labels once input settles
+        self._bitrate_debounce = QtCore.QTimer(self)
+        self._bitrate_debounce.setSingleShot(True)
+        self._bitrate_debounce.setInterval(150)
+        self._bitrate_debounce.timeout.connect(self._update_bitrate_label)
+        self.spin_upload_mbps.valueChanged.connect(lambda _: self._bitrate_debounce.start())
+        self.bit_platform.currentTextChanged.connect(lambda _: self._bitrate_debounce.start())
         self.chk_advanced.toggled.connect(self.btn_advtest.setEnabled)
         self.btn_pingtest.clicked.connect(self._run_safe_pingtest)
         self.btn_advtest.clicked.connect(self._run_advanced_speedtest)
         self.btn_apply_obs_stream_profile.clicked.connect(self._apply_obs_stream_profile)
 
     def _append_terminal(self, line: str):
+        # may be called from any thread (logger callback); widgets are only touched in _flush_log
+        self._log_pending.append(line)
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self._log_wakeup.emit()
+
+    def _flush_log(self):
+        self._log_flush_pending = False
+        lines, self._log_pending = self._log_pending, []
+        if not lines:
+            return
         # color engine state messages
         st = self.engine.status()
         color = "#6ee7b7" if st.running else "#fb7185"
-        self.terminal.setTextColor(QtGui.QColor(color))
-        self.terminal.append(line)
+        if color != self._last_log_color:
+            self.terminal.setTextColor(QtGui.QColor(color))
+            self._last_log_color = color
+        self.terminal.append("\n".join(lines))
         self.terminal.moveCursor(QtGui.QTextCursor.MoveOperation.End)
 
     def _toggle_engine(self):
@@ -543,7 +1065,7 @@ class DashboardPage(QtWidgets.QWidget):
         self._refresh_profile_ui()
 
     def _update_bitrate_label(self):
-        ui = (self.settings.data.get("ui", {}) or {})
+        ui = self.settings.ui()
         show_on_dash = bool(ui.get("show_stream_bitrate_on_dashboard", True))
         if not show_on_dash:
             self.lbl_bitrate.setText("Recommended bitrate: (hidden)")
@@ -555,13 +1077,7 @@ class DashboardPage(QtWidgets.QWidget):
         # safe headroom factor
         safe = max(0.0, upload * 0.70)
 
-        # soft caps (not hard rules; user can override in OBS)
-        cap_kbps = {
-            "Kick": 8000,
-            "Aparat": 6000,
-            "Twitch": 6000,
-            "YouTube": 9000,
-        }.get(platform_name, 8000)
+        cap_kbps = _PLATFORM_CAP_KBPS.get(platform_name, 8000)
 
         rec_kbps = int(min(cap_kbps, safe * 1000))
         self.lbl_bitrate.setText(f"Recommended bitrate ({platform_name}): ~{rec_kbps} kbps")
@@ -583,12 +1099,7 @@ class DashboardPage(QtWidgets.QWidget):
         platform_name = self.bit_platform.currentText().strip()
         upload = float(self.spin_upload_mbps.value())
         safe = max(0.0, upload * 0.70)
-        cap_kbps = {
-            "Kick": 8000,
-            "Aparat": 6000,
-            "Twitch": 6000,
-            "YouTube": 9000,
-        }.get(platform_name, 8000)
+        cap_kbps = _PLATFORM_CAP_KBPS.get(platform_name, 8000)
         rec_kbps = int(min(cap_kbps, safe * 1000))
 
         streaming = self.settings.data.setdefault("profiles", {}).setdefault("items", {}).setdefault("Streaming", {})
@@ -615,26 +1126,26 @@ class DashboardPage(QtWidgets.QWidget):
 
     def _ping_once_if_engine_on(self):
         # lightweight ICMP monitoring: only when engine is ON
-        if (self.settings.data.get("ui", {}) or {}).get("disable_automations", False):
+        if self.settings.ui().get("disable_automations", False):
             return
         if not self.engine.is_running():
             return
         # ping target comes from first speedtest target (cloudflare)
-        targets = (self.settings.data.get("speedtest", {}) or {}).get("targets", [])
+        targets = self.settings.get_speedtest_targets()
         if targets:
             self._ping_host = targets[1].get("host", "1.1.1.1") if len(targets) > 1 else targets[0].get("host", "1.1.1.1")
 
         w = PingWorker(self._ping_host, self)
         w.result.connect(self._on_ping_sample)
+        w.finished.connect(w.deleteLater)  # one of these per second; don't keep them parented forever
         w.start()
 
     def _on_ping_sample(self, ms: float, ok: bool):
         self._ping_history.append(ms if ok else None)
-        self._ping_history = self._ping_history[-60:]
         self._update_ping_stats_label()
 
     def _update_ping_stats_label(self):
-        hist = self._ping_history[-60:]
+        hist = self._ping_history
         if not hist:
             self.lbl_live2.setText("Ping60s: -   Loss60s: -   Jitter60s: -")
             return
@@ -645,8 +1156,7 @@ class DashboardPage(QtWidgets.QWidget):
         self.lbl_live2.setText(f"Ping60s: {ping:.0f} ms   Loss60s: {loss*100:.0f}%   Jitter60s: {jitter:.1f} ms")
 
     def _load_port_override(self):
-        override = (self.settings.data.get("engine", {}) or {}).get("port_override", "")
-        self.in_port_override.setText(str(override))
+        self.in_port_override.setText(self.settings.get_port_override())
 
     def _set_port_override(self):
         raw = self.in_port_override.text().strip()
@@ -661,58 +1171,64 @@ class DashboardPage(QtWidgets.QWidget):
         self.settings.save()
         QtWidgets.QMessageBox.information(self, "Port Override", "Manual port override saved.")
 
+    def set_refresh_paused(self, paused: bool):
+        # pushed by MainWindow on minimize/hide/show
+        self._refresh_paused = paused
+        self._net_sampler.paused = paused
+        self._port_sampler.paused = paused
+
+    def _on_net_sample(self, down: float, up: float, pkts_recv: int, pkts_sent: int, errin: int, errout: int):
+        self._net_sample = (down, up, pkts_recv, pkts_sent, errin, errout)
+
+    def _on_ports(self, text: str):
+        self._ports_cache = text
+
     def _tick(self):
-        if (self.settings.data.get("ui", {}) or {}).get("disable_automations", False):
+        if self.settings.ui().get("disable_automations", False):
             self.lbl_live.setText("Automations disabled")
             self.lbl_live2.setText("Ping60s: -   Loss60s: -   Jitter60s: -")
             return
-        if self.is_refresh_paused_cb and self.is_refresh_paused_cb():
+        if self._refresh_paused:
             return
         # engine state visuals
         self._update_engine_button()
 
-        # net stats
-        c = psutil.net_io_counters()
-        t = time.time()
-        dt = max(0.001, t - self._last_ts)
-        down_mbps = ((c.bytes_recv - self._last_io.bytes_recv) * 8.0 / dt) / 1e6
-        up_mbps = ((c.bytes_sent - self._last_io.bytes_sent) * 8.0 / dt) / 1e6
-        self._last_io = c
-        self._last_ts = t
-
-        metric = self.cmb_metric.currentText()
-        if metric.startswith("Bandwidth"):
-            self.lbl_live.setText(f"Down: {human_mbps(down_mbps)} | Up: {human_mbps(up_mbps)}")
-            if pg:
-                self._down_hist = (self._down_hist + [down_mbps])[-60:]
-                self._up_hist = (self._up_hist + [up_mbps])[-60:]
-                self.curve_down.setData(self._x[-len(self._down_hist):], self._down_hist)
-                self.curve_up.setData(self._x[-len(self._up_hist):], self._up_hist)
-        elif metric.startswith("Packets"):
-            self.lbl_live.setText(f"Packets recv: {c.packets_recv} | sent: {c.packets_sent}")
-        else:
-            self.lbl_live.setText(f"Errors in: {c.errin} | out: {c.errout}")
-
-        # listening ports (lightweight, throttled)
-        now_ports = time.time()
-        if now_ports - self._last_ports_ts >= 5:
-            ports = self.engine.detect_listening_ports(limit=6)
-            if ports:
-                port_text = ", ".join(f"{p['port']}:{p['name']}" for p in ports)
+        # net stats (sampled by _NetSampler)
+        if self._net_sample is not None:
+            down_mbps, up_mbps, pkts_recv, pkts_sent, errin, errout = self._net_sample
+            metric = self._metric
+            if metric == _METRIC_BANDWIDTH:
+                self.lbl_live.setText(f"Down: {human_mbps(down_mbps)} | Up: {human_mbps(up_mbps)}")
+                if pg:
+                    self._down_hist[:-1] = self._down_hist[1:]
+                    self._down_hist[-1] = down_mbps
+                    self._up_hist[:-1] = self._up_hist[1:]
+                    self._up_hist[-1] = up_mbps
+                    # buffers take every sample; the curves are redrawn every other tick, in one repaint
+                    self._tick_n += 1
+                    if not self._tick_n & 1:
+                        self.plot.setUpdatesEnabled(False)
+                        self.curve_down.setData(self._x, self._down_hist)
+                        self.curve_up.setData(self._x, self._up_hist)
+                        self.plot.setUpdatesEnabled(True)
+            elif metric == _METRIC_PACKETS:
+                self.lbl_live.setText(f"Packets recv: {pkts_recv} | sent: {pkts_sent}")
             else:
-                port_text = "-"
-            self._ports_cache = port_text
-            self._last_ports_ts = now_ports
-        override = (self.settings.data.get("engine", {}) or {}).get("port_override", "")
+                self.lbl_live.setText(f"Errors in: {errin} | out: {errout}")
+
+        # listening ports (sampled by _PortSampler on engine state changes)
+        override = self.settings.get_port_override()
         if override:
             self.lbl_ports.setText(f"Listening ports: {self._ports_cache} | Override: {override}")
         else:
             self.lbl_ports.setText(f"Listening ports: {self._ports_cache}")
 
         # Terminal color hint (engine running)
-        st = self.engine.status()
-        bg = "#0b0d12"
-        self.terminal.setStyleSheet(f"background:{bg}; color:{'#6ee7b7' if st.running else '#fb7185'};")
+        running = self.engine.status().running
+        if running != self._last_engine_running:
+            bg = "#0b0d12"
+            self.terminal.setStyleSheet(f"background:{bg}; color:{'#6ee7b7' if running else '#fb7185'};")
+            self._last_engine_running = running
 
     # ---------------------
     # Speed tests
@@ -731,29 +1247,21 @@ class DashboardPage(QtWidgets.QWidget):
         if mb.exec() != QtWidgets.QMessageBox.StandardButton.Yes:
             return
 
-        targets = (self.settings.data.get("speedtest", {}) or {}).get("targets", [])
+        targets = self.settings.get_speedtest_targets()
         idx = max(0, self.cmb_speed_target.currentIndex())
         host = targets[idx].get("host") if idx < len(targets) else "1.1.1.1" or "1.1.1.1"
 
-        samples: List[Optional[float]] = []
-        lost = 0
-        for _ in range(10):
-            p = subprocess.run(_ping_cmd(host), capture_output=True, text=True)
-            out = (p.stdout or "") + "\n" + (p.stderr or "")
-            ms = _parse_ping_ms(out)
-            if ms is None or p.returncode != 0:
-                lost += 1
-                samples.append(None)
-            else:
-                samples.append(ms)
-            QtWidgets.QApplication.processEvents()
-            time.sleep(0.08)
+        self.btn_pingtest.setEnabled(False)
+        self.lbl_pingtest.setText("Running ping test...")
+        self._safe_ping_worker = SafePingWorker(host, 10, self)
+        self._safe_ping_worker.done.connect(self._on_safe_ping_done)
+        self._safe_ping_worker.start()
 
-        oks = [x for x in samples if x is not None]
-        loss = lost / 10.0
-        ping = statistics.mean(oks) if oks else 0.0
-        jitter = statistics.pstdev(oks) if len(oks) >= 2 else 0.0
-        self.lbl_pingtest.setText(f"Result: Ping {ping:.0f} ms | Jitter {jitter:.1f} ms | Loss {loss*100:.0f}% (10 pings)")
+    def _on_safe_ping_done(self, ping: float, jitter: float, loss: float, count: int):
+        self.btn_pingtest.setEnabled(True)
+        self.lbl_pingtest.setText(
+            f"Result: Ping {ping:.0f} ms | Jitter {jitter:.1f} ms | Loss {loss*100:.0f}% ({count} pings)"
+        )
 
     def _run_advanced_speedtest(self):
         # Confirm (mandatory) - network impacting
@@ -768,15 +1276,16 @@ class DashboardPage(QtWidgets.QWidget):
         if mb.exec() != QtWidgets.QMessageBox.StandardButton.Yes:
             return
 
-        targets = (self.settings.data.get("speedtest", {}) or {}).get("targets", [])
+        targets = self.settings.get_speedtest_targets()
         idx = max(0, self.cmb_speed_target.currentIndex())
         target = targets[idx] if idx < len(targets) else (targets[0] if targets else {})
         download_url = target.get("download_url") or "https://cachefly.cachefly.net/10mb.test"
-        upload_eps = (self.settings.data.get("speedtest", {}) or {}).get("upload_endpoints", [])
+        upload_eps = self.settings.get_upload_endpoints()
         upload_url = upload_eps[0].get("url") if upload_eps else "https://httpbin.org/post"
 
-        bytes_down = int((self.settings.data.get("speedtest", {}) or {}).get("advanced_download_bytes", 10_000_000))
-        bytes_up = int((self.settings.data.get("speedtest", {}) or {}).get("advanced_upload_bytes", 2_000_000))
+        st_cfg = self.settings.get_speedtest_config()
+        bytes_down = int(st_cfg.get("advanced_download_bytes", 10_000_000))
+        bytes_up = int(st_cfg.get("advanced_upload_bytes", 2_000_000))
 
         self.pb_down.setValue(0)
         self.pb_up.setValue(0)
@@ -800,7 +1309,10 @@ class DashboardPage(QtWidgets.QWidget):
         self._adv_last_results = res
         d = res.get("download_mbps")
         u = res.get("upload_mbps")
-        self.lbl_pingtest.setText(f"Advanced: Down {human_mbps(d)} | Up {human_mbps(u)}")
+        msg = f"Advanced: Down {human_mbps(d)} | Up {human_mbps(u)}"
+        if res.get("warning"):
+            msg += f" ({res['warning']})"
+        self.lbl_pingtest.setText(msg)
         # update bitrate helper based on measured upload
         if u:
             self.spin_upload_mbps.setValue(float(u))
@@ -811,15 +1323,266 @@ class DashboardPage(QtWidgets.QWidget):
         self.btn_advtest.setEnabled(self.chk_advanced.isChecked())
 
 
+# ---------------------
+# Table models
+# ---------------------
+
+def _as_text(v: Any) -> str:
+    # cell text without a str() round-trip for values that already are strings (the common case)
+    return v if isinstance(v, str) else str(v)
+
+
+class _DictRowsModel(QtCore.QAbstractTableModel):
+    """Table over a list of settings dicts (the dicts themselves are shared, not copied)."""
+
+    HEADERS: Tuple[str, ...] = ()
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self._rows: List[Dict[str, Any]] = []
+        self._row_ids: Optional[Set[int]] = None  # id() of every row; built by append_rows, dropped by set_rows
+
+    def set_rows(self, rows: List[Dict[str, Any]]):
+        """
+        Swap in a new row list. When the old rows are a prefix of the new ones (the usual
+        import/append case) only the delta is inserted/removed and the rest is repainted in
+        place, so selection and scroll position survive; anything else falls back to a reset.
+        """
+        self._row_ids = None
+        old = self._rows
+        common = min(len(old), len(rows))
+        if any(old[i] is not rows[i] for i in range(common)):
+            self.beginResetModel()
+            self._rows = list(rows)
+            self.endResetModel()
+            return
+        if len(rows) > len(old):
+            self.beginInsertRows(QtCore.QModelIndex(), len(old), len(rows) - 1)
+            self._rows = list(rows)
+            self.endInsertRows()
+        elif len(rows) < len(old):
+            self.beginRemoveRows(QtCore.QModelIndex(), len(rows), len(old) - 1)
+            self._rows = list(rows)
+            self.endRemoveRows()
+        if common:
+            self.dataChanged.emit(self.index(0, 0), self.index(common - 1, len(self.HEADERS) - 1))
+
+    def append_rows(self, rows: List[Dict[str, Any]]):
+        """Append rows not already shown (by identity): a set_rows() on the live list may have taken them in."""
+        if self._row_ids is None:
+            self._row_ids = {id(r) for r in self._rows}
+        ids = self._row_ids
+        rows = [r for r in rows if id(r) not in ids]
+        if not rows:
+            return
+        ids.update(id(r) for r in rows)
+        n = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), n, n + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def row_at(self, row: int) -> Optional[Dict[str, Any]]:
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DisplayRole and orientation == QtCore.Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+
+class ConfigTableModel(_DictRowsModel):
+    """Read-only view over settings["configs"]."""
+
+    HEADERS = ("Name", "Type", "Core", "Added")
+    _FIELDS = (("name", ""), ("type", ""), ("core", "auto"), ("added_at", ""))
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role != QtCore.Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        key, default = self._FIELDS[index.column()]
+        return _as_text(self._rows[index.row()].get(key, default))
+
+
+class AppTableModel(_DictRowsModel):
+    """
+    View over the launcher apps (important + custom dicts, by reference).
+    Column 0 is the "enabled" checkbox; toggling it writes straight into the app dict.
+    """
+
+    HEADERS = ("Enabled", "Name", "Path", "Args", "Group", "Profile", "Last Launch", "Running", "Type")
+    COL_ENABLED = 0
+    COL_RUNNING = 7
+
+    enabled_changed = QtCore.pyqtSignal(dict)
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self._running: FrozenSet[str] = frozenset()
+        self._last_launch: Dict[str, str] = {}
+
+    def set_rows(self, rows: List[Dict[str, Any]], running: FrozenSet[str], last_launch: Dict[str, str]):
+        self._running = running
+        self._last_launch = last_launch
+        super().set_rows(rows)
+
+    def set_running(self, running: FrozenSet[str]):
+        self._running = running
+        if self._rows:
+            col = self.COL_RUNNING
+            self.dataChanged.emit(self.index(0, col), self.index(len(self._rows) - 1, col), [QtCore.Qt.ItemDataRole.DisplayRole])
+
+    # plain dict-backed columns: col -> (key, default); the rest are computed in _cell
+    _FIELDS = {1: ("name", ""), 2: ("path", ""), 3: ("args", ""), 5: ("profile", "Auto"), 8: ("type", "important")}
+
+    def _cell(self, app: Dict[str, Any], col: int) -> str:
+        f = self._FIELDS.get(col)
+        if f is not None:
+            return _as_text(app.get(f[0], f[1]))
+        if col == 4:
+            return _as_text(app.get("group", "Default") or "Default")
+        if col == 6:
+            return _as_text(self._last_launch.get(app.get("name", ""), "-"))
+        if col == self.COL_RUNNING:
+            return "Yes" if _lc(app.get("name")) in self._running else "No"
+        return ""
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        app = self._rows[index.row()]
+        col = index.column()
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self._cell(app, col)
+        if role == QtCore.Qt.ItemDataRole.CheckStateRole and col == self.COL_ENABLED:
+            return QtCore.Qt.CheckState.Checked if bool(app.get("enabled", True)) else QtCore.Qt.CheckState.Unchecked
+        return None
+
+    def flags(self, index):
+        f = super().flags(index)
+        if index.isValid() and index.column() == self.COL_ENABLED:
+            f |= QtCore.Qt.ItemFlag.ItemIsUserCheckable
+        return f
+
+    def setData(self, index, value, role=QtCore.Qt.ItemDataRole.EditRole):
+        if not index.isValid() or index.column() != self.COL_ENABLED or role != QtCore.Qt.ItemDataRole.CheckStateRole:
+            return False
+        app = self._rows[index.row()]
+        enabled = QtCore.Qt.CheckState(value) == QtCore.Qt.CheckState.Checked
+        if enabled == bool(app.get("enabled", True)):
+            return True  # no-op toggle: no repaint, no save
+        app["enabled"] = enabled
+        self.dataChanged.emit(index, index, [role])
+        self.enabled_changed.emit(app)
+        return True
+
+
+class RowFilterProxy(QtCore.QSortFilterProxyModel):
+    """Shows only source rows whose key(row) equals the current value; None shows everything."""
+
+    def __init__(self, key: Callable[[Dict[str, Any]], Any], parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self._key = key
+        self._value: Any = None
+
+    def set_value(self, value: Any):
+        if value == self._value:
+            return
+        if hasattr(self, "beginFilterChange"):  # Qt >= 6.10; invalidateFilter() is deprecated there
+            self.beginFilterChange()
+            self._value = value
+            self.endFilterChange()
+        else:
+            self._value = value
+            self.invalidateFilter()
+
+    def source_row(self, row: int) -> Optional[Dict[str, Any]]:
+        src = self.mapToSource(self.index(row, 0)).row()
+        return self.sourceModel().row_at(src)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._value is None:
+            return True
+        row = self.sourceModel().row_at(source_row)
+        return row is not None and self._key(row) == self._value
+
+
+class DnsRankModel(QtCore.QAbstractTableModel):
+    """DNS optimizer results: OptimizeDnsWorker's (idx, name, server, ping, loss, jitter) tuples, formatted on paint."""
+
+    HEADERS = ("Rank", "Server", "Ping", "Loss", "Jitter")
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self._rows: List[Tuple[Any, ...]] = []
+        self._fmt: Dict[Tuple[int, int], str] = {}  # (row, col) -> text; repaints reuse it until the next reset
+
+    def set_rows(self, rows: List[Tuple[Any, ...]]):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._fmt.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DisplayRole and orientation == QtCore.Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if role != QtCore.Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        key = (index.row(), index.column())
+        text = self._fmt.get(key)
+        if text is None:
+            text = self._fmt[key] = self._format(*key)
+        return text
+
+    def _format(self, row: int, col: int) -> str:
+        _, name, host, ping, loss, jitter = self._rows[row]
+        if col == 0:
+            return _as_text(name)
+        if col == 1:
+            return _as_text(host)
+        if col == 2:
+            return f"{ping:.0f} ms" if ping < 9000 else "-"
+        if col == 3:
+            return f"{loss*100:.0f}%"
+        return f"{jitter:.1f} ms"
+
+
 # ---------------------
 # VPN Manager Page
 # ---------------------
 
+_PROTO_FILTERS = {
+    "SOCKS": "socks",
+    "HTTP": "http",
+    "WireGuard": "wireguard",
+    "Hysteria2": "hysteria2",
+}
+
+
 class VPNManagerPage(QtWidgets.QWidget):
     def __init__(self, engine: EngineManager, settings: SettingsManager):
         super().__init__()
         self.engine = engine
         self.settings = settings
+        self._cfg_cols_sized = False
+        self._imports_inflight: Set[Optional[str]] = set()
+        self._import_added: Dict[Optional[str], int] = {}
+        self._sub_signals = ConfigImportSignals(self)
+        self._text_signals = ConfigImportSignals(self)
 
         self._build()
         self._wire()
@@ -844,8 +1607,11 @@ class VPNManagerPage(QtWidgets.QWidget):
         self.btn_import = QtWidgets.QPushButton("Import")
         self.btn_import.setMinimumHeight(44)
 
-        self.tbl_cfg = QtWidgets.QTableWidget(0, 4)
-        self.tbl_cfg.setHorizontalHeaderLabels(["Name", "Type", "Core", "Added"])
+        self._cfg_model = ConfigTableModel(self)
+        self._cfg_proxy = RowFilterProxy(lambda c: c.get("type"), self)
+        self._cfg_proxy.setSourceModel(self._cfg_model)
+        self.tbl_cfg = QtWidgets.QTableView()
+        self.tbl_cfg.setModel(self._cfg_proxy)
         self.tbl_cfg.horizontalHeader().setStretchLastSection(True)
         self.tbl_cfg.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
         self.tbl_cfg.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -879,6 +1645,8 @@ class VPNManagerPage(QtWidgets.QWidget):
         self.lst_subs = QtWidgets.QListWidget()
         self.btn_update_sub = QtWidgets.QPushButton("Update Selected Subscription")
         self.btn_update_sub.setMinimumHeight(44)
+        self.btn_update_all_subs = QtWidgets.QPushButton("Update All Subscriptions")
+        self.btn_update_all_subs.setMinimumHeight(44)
 
         self.btn_clip_import = QtWidgets.QPushButton("Import from Clipboard")
         self.btn_clip_import.setMinimumHeight(44)
@@ -889,6 +1657,7 @@ class VPNManagerPage(QtWidgets.QWidget):
         r.addWidget(self.btn_add_sub)
         r.addWidget(self.lst_subs, 1)
         r.addWidget(self.btn_update_sub)
+        r.addWidget(self.btn_update_all_subs)
         r.addSpacing(10)
         r.addWidget(self.btn_clip_import)
         r.addWidget(self.btn_clip_export)
@@ -923,40 +1692,31 @@ class VPNManagerPage(QtWidgets.QWidget):
         self.btn_clip_export.clicked.connect(self._export_clipboard)
         self.btn_add_sub.clicked.connect(self._add_sub)
         self.btn_update_sub.clicked.connect(self._update_sub)
+        self.btn_update_all_subs.clicked.connect(self._update_all_subs)
+        self._sub_signals.parsed.connect(self._on_import_parsed)
+        self._sub_signals.done.connect(self._on_sub_done)
+        self._sub_signals.failed.connect(self._on_sub_failed)
+        self._text_signals.parsed.connect(self._on_import_parsed)
+        self._text_signals.done.connect(self._on_text_import_done)
+        self._text_signals.failed.connect(self._on_text_import_failed)
         self.btn_set_active.clicked.connect(self._set_active_config)
         self.btn_set_profile.clicked.connect(self._set_profile_for_vpn)
-        self.cmb_proto_filter.currentTextChanged.connect(self._refresh)
+        self.cmb_proto_filter.currentTextChanged.connect(self._on_proto_filter_changed)
         self.btn_start_core.clicked.connect(self._start_core)
         self.btn_stop_core.clicked.connect(self._stop_core)
 
     def _refresh(self):
         # configs table
         cfgs = self.settings.data.get("configs", []) or []
-        filter_text = self.cmb_proto_filter.currentText() if hasattr(self, "cmb_proto_filter") else "All protocols"
-        selected_type = {
-            "SOCKS": "socks",
-            "HTTP": "http",
-            "WireGuard": "wireguard",
-            "Hysteria2": "hysteria2",
-        }.get(filter_text)
-
-        shown_cfgs = [c for c in cfgs if (not selected_type or str(c.get("type", "")).lower() == selected_type)]
-
-        self.tbl_cfg.setRowCount(0)
-        for c in shown_cfgs:
-            row = self.tbl_cfg.rowCount()
-            self.tbl_cfg.insertRow(row)
-            self.tbl_cfg.setItem(row, 0, QtWidgets.QTableWidgetItem(str(c.get("name", ""))))
-            self.tbl_cfg.setItem(row, 1, QtWidgets.QTableWidgetItem(str(c.get("type", ""))))
-            self.tbl_cfg.setItem(row, 2, QtWidgets.QTableWidgetItem(str(c.get("core", "auto"))))
-            self.tbl_cfg.setItem(row, 3, QtWidgets.QTableWidgetItem(str(c.get("added_at", ""))))
-        self.tbl_cfg.resizeColumnsToContents()
-
-        counts = {"socks": 0, "http": 0, "wireguard": 0, "hysteria2": 0}
-        for c in cfgs:
-            t = str(c.get("type", "")).lower()
-            if t in counts:
-                counts[t] += 1
+        self._on_proto_filter_changed(self.cmb_proto_filter.currentText())
+        self._cfg_model.set_rows(cfgs)
+        if cfgs and not self._cfg_cols_sized:
+            # size once from real content, after the first paint; later refreshes keep the user's widths
+            QtCore.QTimer.singleShot(200, self.tbl_cfg.resizeColumnsToContents)
+            self._cfg_cols_sized = True
+
+        # single pass, counted in C; "type" is stored already normalized by SettingsManager._detect_type
+        counts = Counter(c.get("type") for c in cfgs)
         self.lbl_proto_status.setText(
             f"Protocol support: SOCKS {counts['socks']} | HTTP {counts['http']} | WireGuard {counts['wireguard']} | Hysteria2 {counts['hysteria2']}"
         )
@@ -968,8 +1728,7 @@ class VPNManagerPage(QtWidgets.QWidget):
 
         # active config label
         active_profile = self.settings.get_active_profile()
-        if hasattr(self, "cmb_profile_select"):
-            self.cmb_profile_select.setCurrentText(active_profile)
+        self.cmb_profile_select.setCurrentText(active_profile)
         active_idx = (self.settings.data.get("profiles", {}) or {}).get("items", {}).get(active_profile, {}).get("active_config_idx")
         if active_idx is not None and 0 <= active_idx < len(cfgs):
             self.lbl_active_core.setText(f"Active config: {cfgs[active_idx].get('name','')}")
@@ -978,23 +1737,60 @@ class VPNManagerPage(QtWidgets.QWidget):
 
     def _import_text(self):
         txt = self.txt_import.toPlainText().strip()
-        n = self.settings.process_smart_input(txt)
         self.txt_import.clear()
-        self._refresh()
-        QtWidgets.QMessageBox.information(self, "Import", f"Imported {n} configs.")
+        self._start_text_import(txt, "text")
 
     def _import_clipboard(self):
-        txt = QtWidgets.QApplication.clipboard().text()
-        n = self.settings.process_smart_input(txt)
+        # QClipboard is GUI-thread only, so the read stays here; parsing moves to the pool
+        self._start_text_import(QtWidgets.QApplication.clipboard().text(), "clipboard")
+
+    def _start_text_import(self, text: str, key: str):
+        if key in self._imports_inflight:
+            return
+        self._imports_inflight.add(key)
+        self._sync_import_buttons()
+        QtCore.QThreadPool.globalInstance().start(TextImportWorker(self.settings, text, key, self._text_signals))
+
+    def _on_import_parsed(self, key: Optional[str], entries: List[str]):
+        # UI thread: the only place an import touches settings["configs"]. Rows show up per batch;
+        # the write is coalesced and forced out when the import finishes (or by flush_save() on exit).
+        n = self.settings.import_entries(entries, on_batch=self._cfg_model.append_rows)
+        if n:
+            self._import_added[key] = self._import_added.get(key, 0) + n
+            self.settings.schedule_save()
+
+    def _finish_import(self, key: Optional[str]) -> int:
+        self._imports_inflight.discard(key)
+        self._sync_import_buttons()
+        self.settings.flush_save()
+        return self._import_added.pop(key, 0)
+
+    def _on_text_import_done(self, key: str):
+        n = self._finish_import(key)
+        self._sync_import_buttons()
         self._refresh()
-        QtWidgets.QMessageBox.information(self, "Clipboard Import", f"Imported {n} configs from clipboard.")
+        if key == "clipboard":
+            QtWidgets.QMessageBox.information(self, "Clipboard Import", f"Imported {n} configs from clipboard.")
+        else:
+            QtWidgets.QMessageBox.information(self, "Import", f"Imported {n} configs.")
+
+    def _on_text_import_failed(self, key: str, err: str):
+        self._finish_import(key)
+        QtWidgets.QMessageBox.warning(self, "Import", f"Import failed:\n{err}")
+
+    def _on_proto_filter_changed(self, filter_text: str):
+        # filtering happens in the proxy; the source rows are left alone
+        self._cfg_proxy.set_value(_PROTO_FILTERS.get(filter_text))
+
+    def _selected_config(self) -> Optional[Dict[str, Any]]:
+        ix = self.tbl_cfg.currentIndex()
+        return self._cfg_proxy.source_row(ix.row()) if ix.isValid() else None
 
     def _export_clipboard(self):
-        row = self.tbl_cfg.currentRow()
-        cfgs = self.settings.data.get("configs", []) or []
-        if row < 0 or row >= len(cfgs):
+        cfg = self._selected_config()
+        if cfg is None:
             return
-        QtWidgets.QApplication.clipboard().setText(cfgs[row].get("raw", ""))
+        QtWidgets.QApplication.clipboard().setText(cfg.get("raw", ""))
         QtWidgets.QMessageBox.information(self, "Clipboard Export", "Selected config copied to clipboard.")
 
     def _add_sub(self):
@@ -1009,50 +1805,49 @@ class VPNManagerPage(QtWidgets.QWidget):
         item = self.lst_subs.currentItem()
         if not item:
             return
-        url = item.text()
-        self.btn_update_sub.setEnabled(False)
-        self._w = SubscriptionUpdateWorker(self.settings, url, self)
-        self._w.done.connect(self._on_sub_done)
-        self._w.failed.connect(self._on_sub_failed)
-        self._w.start()
+        self._start_sub_worker(item.text())
+
+    def _update_all_subs(self):
+        if self.lst_subs.count() == 0:
+            return
+        self._start_sub_worker(None)
 
-    def _on_sub_done(self, n: int):
-        self.btn_update_sub.setEnabled(True)
+    def _start_sub_worker(self, url: Optional[str]):
+        # None (= all) and each URL are keys of their own so a double click can't queue twice
+        if url in self._imports_inflight:
+            return
+        self._imports_inflight.add(url)
+        self._sync_import_buttons()
+        # the url list is read here, on the UI thread; the worker never looks at settings.data
+        subs = self.settings.data.get("subscriptions", []) or []
+        urls = [url] if url is not None else [u for u in subs if str(u or "").strip()]
+        worker = SubscriptionUpdateWorker(self.settings, url, urls, self._sub_signals)
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _sync_import_buttons(self):
+        # every import path mutates settings["configs"]; keep them one at a time
+        idle = not self._imports_inflight
+        for b in (self.btn_import, self.btn_clip_import, self.btn_update_sub, self.btn_update_all_subs):
+            b.setEnabled(idle)
+
+    def _on_sub_done(self, url: Optional[str]):
+        n = self._finish_import(url)
         self._refresh()
         QtWidgets.QMessageBox.information(self, "Subscription", f"Added {n} configs from subscription.")
 
-    def _on_sub_failed(self, err: str):
-        self.btn_update_sub.setEnabled(True)
+    def _on_sub_failed(self, url: Optional[str], err: str):
+        self._finish_import(url)
         QtWidgets.QMessageBox.warning(self, "Subscription", f"Update failed:\n{err}")
 
-    def _visible_configs(self) -> List[Dict[str, Any]]:
-        cfgs = self.settings.data.get("configs", []) or []
-        filter_text = self.cmb_proto_filter.currentText() if hasattr(self, "cmb_proto_filter") else "All protocols"
-        selected_type = {
-            "SOCKS": "socks",
-            "HTTP": "http",
-            "WireGuard": "wireguard",
-            "Hysteria2": "hysteria2",
-        }.get(filter_text)
-        return [c for c in cfgs if (not selected_type or str(c.get("type", "")).lower() == selected_type)]
-
     def _set_active_config(self):
-        row = self.tbl_cfg.currentRow()
-        visible = self._visible_configs()
-        all_cfgs = self.settings.data.get("configs", []) or []
-        if row < 0 or row >= len(visible):
-            return
-        selected = visible[row]
-        target_raw = (selected.get("raw") or "").strip()
-        target_idx = -1
-        for i, c in enumerate(all_cfgs):
-            if (c.get("raw") or "").strip() == target_raw:
-                target_idx = i
-                break
+        selected = self._selected_config()
+        if selected is None:
+            return
+        target_idx = self.settings.config_position(selected.get("raw") or "")
         if target_idx < 0:
             return
         active_profile = self.settings.get_active_profile()
-        self.settings.data.setdefault("profiles", {}).setdefault("items", {}).setdefault(active_profile, {})["active_config_idx"] = target_idx
+        self.settings.active_profile_dict()["active_config_idx"] = target_idx
         self.settings.save()
         QtWidgets.QMessageBox.information(self, "Active Config", f"Selected config set for profile: {active_profile}")
         self._refresh()
@@ -1073,7 +1868,7 @@ class VPNManagerPage(QtWidgets.QWidget):
         QtWidgets.QMessageBox.information(self, "Stop Core", "Core stop requested.")
 
     def _set_profile_for_vpn(self):
-        profile = self.cmb_profile_select.currentText() if hasattr(self, "cmb_profile_select") else ""
+        profile = self.cmb_profile_select.currentText()
         if not profile:
             return
         self.settings.set_active_profile(profile)
@@ -1084,19 +1879,99 @@ class VPNManagerPage(QtWidgets.QWidget):
 # App Launcher Page
 # ---------------------
 
+_PROC_SNAPSHOT_TTL_S = 1.0
+
+# "Add Running Apps" skips OS binaries; prefixes are lowercase for a single startswith() per process
+_WIN_SYS_ROOT = os.environ.get("SystemRoot", "C:\\Windows")
+_WIN_SYS_PREFIXES = tuple(os.path.join(_WIN_SYS_ROOT, d).lower() + os.sep for d in ("System32", "SysWOW64"))
+
+
+@lru_cache(maxsize=2048)
+def _lc(value: Any) -> str:
+    """Lowercased str(value); app names/paths repeat on every refresh, so each is lowered once."""
+    return str(value or "").lower()
+
+
+def _auto_refresh_interval_s(settings: SettingsManager) -> int:
+    """Timed page refresh period from settings["ui"]; 0 = off."""
+    ui = settings.ui()
+    if bool(ui.get("disable_automations", False)):
+        return 0
+    if not bool(ui.get("refresh_enabled", True)):
+        return 0
+    return int(ui.get("refresh_interval_s", 60))
+
+
+def _snapshot_processes() -> Tuple[Dict[str, List[psutil.Process]], Dict[str, List[psutil.Process]]]:
+    """Single process_iter pass indexed by lowercase name and lowercase exe path."""
+    by_name: Dict[str, List[psutil.Process]] = defaultdict(list)
+    by_exe: Dict[str, List[psutil.Process]] = defaultdict(list)
+    for p in psutil.process_iter(attrs=["name", "exe"]):
+        try:
+            name = (p.info.get("name") or "").lower()
+            exe = (p.info.get("exe") or "").lower()
+            if name:
+                by_name[name].append(p)
+            if exe:
+                by_exe[exe].append(p)
+        except Exception:
+            continue
+    return dict(by_name), dict(by_exe)
+
+
+def _running_keys(by_name: Dict[str, Any], by_exe: Dict[str, Any]) -> FrozenSet[str]:
+    """Lowercase names and exe paths of everything running; immutable, so safe to hand across threads."""
+    return frozenset(chain(by_name, by_exe))
+
+
+class ProcessScanWorker(QtCore.QThread):
+    done = QtCore.pyqtSignal(dict, dict, object)  # by_name, by_exe, running keys
+
+    def run(self):
+        try:
+            by_name, by_exe = _snapshot_processes()
+        except Exception:
+            by_name, by_exe = {}, {}
+        self.done.emit(by_name, by_exe, _running_keys(by_name, by_exe))
+
+
 class AppLauncherPage(QtWidgets.QWidget):
-    def __init__(self, engine: EngineManager, settings: SettingsManager, is_refresh_paused_cb: Optional[Callable[[], bool]] = None):
+    _settings_saved = QtCore.pyqtSignal()
+
+    def __init__(self, engine: EngineManager, settings: SettingsManager):
         super().__init__()
         self.engine = engine
         self.settings = settings
-        self.is_refresh_paused_cb = is_refresh_paused_cb
+        self._refresh_paused = False
+        self._apps_cols_sized = False
+        self._restoring_selection = False
+        self._proc_cache: Optional[Tuple[float, Dict[str, List[psutil.Process]], Dict[str, List[psutil.Process]]]] = None
+        self._scan_worker: Optional[ProcessScanWorker] = None
+        self._all_apps_cache: Optional[Tuple[Any, Any, int, int, List[Dict[str, Any]]]] = None
+        self._apps_fingerprint: Optional[tuple] = None
+        self._apps_by_group: Dict[str, List[Dict[str, Any]]] = {}  # group -> apps, rebuilt with the table
+        # user actions coalesce into one _refresh; timed refreshes are one-shot, re-armed after each scan
+        self._refresh_debounce = QtCore.QTimer(self)
+        self._refresh_debounce.setSingleShot(True)
+        self._refresh_debounce.setInterval(50)
+        self._refresh_debounce.timeout.connect(self._refresh)
+        self._auto_timer = QtCore.QTimer(self)
+        self._auto_timer.setSingleShot(True)
+        self._auto_timer.timeout.connect(self._maybe_auto_refresh)
+        # page edits (toggles, selection, last-launch stamps of a batch) coalesce into one settings write
+        self._save_debounce = QtCore.QTimer(self)
+        self._save_debounce.setSingleShot(True)
+        self._save_debounce.setInterval(200)
+        self._save_debounce.timeout.connect(self.settings.save)
+
         self._build()
         self._wire()
         self._refresh()
 
-        self._auto_timer = QtCore.QTimer(self)
-        self._auto_timer.timeout.connect(self._maybe_auto_refresh)
-        self._auto_timer.start(1000)
+        # picks up refresh settings changes; saves can happen on import workers, so hop threads via a signal
+        self._settings_saved.connect(self._arm_auto_refresh)
+        self.settings.add_save_listener(self._settings_saved.emit)
+        self._arm_auto_refresh()
 
     def _build(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -1128,8 +2003,11 @@ class AppLauncherPage(QtWidgets.QWidget):
         form.addWidget(self.in_app_group, 1)
         form.addWidget(self.btn_add_app, 0)
 
-        self.tbl_apps = QtWidgets.QTableWidget(0, 9)
-        self.tbl_apps.setHorizontalHeaderLabels(["Enabled", "Name", "Path", "Args", "Group", "Profile", "Last Launch", "Running", "Type"])
+        self._apps_model = AppTableModel(self)
+        self._apps_proxy = RowFilterProxy(lambda a: a.get("group", "Default") or "Default", self)
+        self._apps_proxy.setSourceModel(self._apps_model)
+        self.tbl_apps = QtWidgets.QTableView()
+        self.tbl_apps.setModel(self._apps_proxy)
         self.tbl_apps.horizontalHeader().setStretchLastSection(True)
         self.tbl_apps.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
         self.tbl_apps.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
@@ -1199,7 +2077,7 @@ class AppLauncherPage(QtWidgets.QWidget):
     def _wire(self):
         self.btn_browse.clicked.connect(self._browse_exe)
         self.btn_add_app.clicked.connect(self._add_app)
-        self.btn_refresh.clicked.connect(self._refresh)
+        self.btn_refresh.clicked.connect(self._refresh_debounce.start)
         self.btn_add_running.clicked.connect(self._add_running_apps)
         self.btn_launch.clicked.connect(self._launch_selected)
         self.btn_stop.clicked.connect(self._stop_selected)
@@ -1210,74 +2088,92 @@ class AppLauncherPage(QtWidgets.QWidget):
         self.btn_move_group.clicked.connect(self._move_selected_to_group)
         self.btn_set_profile.clicked.connect(self._set_profile_for_selected)
         self.btn_remove.clicked.connect(self._remove_selected)
-        self.tbl_apps.itemChanged.connect(self._on_item_changed)
-        self.tbl_apps.itemSelectionChanged.connect(self._save_selected_cache)
+        self._apps_model.enabled_changed.connect(self._on_enabled_changed)
+        self.tbl_apps.selectionModel().selectionChanged.connect(self._save_selected_cache)
         self.cmb_group.currentTextChanged.connect(self._on_group_changed)
-        self.chk_filter_group.toggled.connect(self._refresh)
+        self.chk_filter_group.toggled.connect(self._apply_group_filter)
+
+    def set_refresh_paused(self, paused: bool):
+        # pushed by MainWindow on minimize/hide/show
+        self._refresh_paused = paused
+        if paused:
+            self._auto_timer.stop()
+        else:
+            self._arm_auto_refresh()
+
+    def _auto_interval_s(self) -> int:
+        return _auto_refresh_interval_s(self.settings)
+
+    def _arm_auto_refresh(self):
+        try:
+            if self._refresh_paused or self._auto_timer.isActive() or self._scan_worker is not None:
+                return
+            interval_s = self._auto_interval_s()
+            if interval_s > 0:
+                self._auto_timer.start(interval_s * 1000)
+        except RuntimeError:
+            pass  # save listener outliving the widget at exit
 
     def _maybe_auto_refresh(self):
-        if self.is_refresh_paused_cb and self.is_refresh_paused_cb():
+        if self._refresh_paused or self._auto_interval_s() <= 0:
             return
-        ui = (self.settings.data.get("ui", {}) or {})
-        if bool(ui.get("disable_automations", False)):
-            return
-        if not bool(ui.get("refresh_enabled", True)):
-            return
-        interval_s = int(ui.get("refresh_interval_s", 60))
-        if interval_s <= 0:
-            return
-        now = time.time()
-        last = getattr(self, "_last_auto_refresh", 0.0)
-        if now - last < interval_s:
-            return
-        self._last_auto_refresh = now
-        self._refresh()
+        self._start_proc_scan()
+
+    def _apps_store(self) -> Dict[str, Any]:
+        # settings["apps"], resolved once per call site instead of get()/or {} chains per use
+        apps = self.settings.data.get("apps")
+        if not isinstance(apps, dict):
+            apps = self.settings.data["apps"] = {}
+        return apps
 
     def _all_apps(self) -> List[Dict[str, Any]]:
-        apps = self.settings.data.get("apps", {}) or {}
-        important = apps.get("important", []) or []
-        custom = apps.get("custom", []) or []
-        return [*important, *custom]
+        """important + custom, rebuilt only when either list is replaced or resized. Don't mutate."""
+        apps = self._apps_store()
+        # compare the stored objects themselves (an empty list or None must not look "replaced" each call)
+        important = apps.get("important")
+        custom = apps.get("custom")
+        n_imp, n_cus = len(important or ()), len(custom or ())
+        c = self._all_apps_cache
+        if c is not None and c[0] is important and c[1] is custom and c[2] == n_imp and c[3] == n_cus:
+            return c[4]
+        rows = [*(important or ()), *(custom or ())]
+        self._all_apps_cache = (important, custom, n_imp, n_cus, rows)
+        return rows
 
     def _refresh(self):
         running = self._find_running()
         rows = self._all_apps()
-        group_filter = self._selected_group() if self.chk_filter_group.isChecked() else None
-        self.tbl_apps.blockSignals(True)
-        self.tbl_apps.setRowCount(0)
-        groups = set()
+        last_launch = self._apps_store().get("last_launch", {}) or {}
+        # everything the table shows; an idle click on Refresh (or a no-op action) stops here
+        fp = (
+            id(rows),
+            tuple(
+                (a.get("name"), a.get("path"), a.get("args"), a.get("enabled", True), a.get("group"), a.get("profile"),
+                 a.get("type"), last_launch.get(a.get("name", "")), _lc(a.get("name")) in running)
+                for a in rows
+            ),
+        )
+        if fp == self._apps_fingerprint:
+            return
+        self._apps_fingerprint = fp
+        by_group: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         for app in rows:
-            row = self.tbl_apps.rowCount()
-            self.tbl_apps.insertRow(row)
-            name = app.get("name", "")
-            path = app.get("path", "")
-            args = app.get("args", "")
-            app_type = app.get("type", "important")
-            enabled = bool(app.get("enabled", True))
-            group = app.get("group", "Default") or "Default"
-            profile = app.get("profile", "Auto")
-            last_launch = (self.settings.data.get("apps", {}) or {}).get("last_launch", {}).get(name, "-")
-            run_state = "Yes" if running.get(name.lower()) else "No"
-            groups.add(group)
-            if group_filter and group != group_filter:
-                continue
+            by_group[app.get("group") or "Default"].append(app)
+        self._apps_by_group = dict(by_group)
+        self._restoring_selection = True
+        try:
+            self._apps_model.set_rows(rows, running, last_launch)
+            self._refresh_groups(sorted(by_group))
+            self._apply_group_filter()
+            self._restore_selected_cache()
+        finally:
+            self._restoring_selection = False
+        if rows and not self._apps_cols_sized:
+            QtCore.QTimer.singleShot(200, self.tbl_apps.resizeColumnsToContents)
+            self._apps_cols_sized = True
 
-            enabled_item = QtWidgets.QTableWidgetItem("")
-            enabled_item.setFlags(QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
-            enabled_item.setCheckState(QtCore.Qt.CheckState.Checked if enabled else QtCore.Qt.CheckState.Unchecked)
-            self.tbl_apps.setItem(row, 0, enabled_item)
-            self.tbl_apps.setItem(row, 1, QtWidgets.QTableWidgetItem(str(name)))
-            self.tbl_apps.setItem(row, 2, QtWidgets.QTableWidgetItem(str(path)))
-            self.tbl_apps.setItem(row, 3, QtWidgets.QTableWidgetItem(str(args)))
-            self.tbl_apps.setItem(row, 4, QtWidgets.QTableWidgetItem(str(group)))
-            self.tbl_apps.setItem(row, 5, QtWidgets.QTableWidgetItem(str(profile)))
-            self.tbl_apps.setItem(row, 6, QtWidgets.QTableWidgetItem(str(last_launch)))
-            self.tbl_apps.setItem(row, 7, QtWidgets.QTableWidgetItem(run_state))
-            self.tbl_apps.setItem(row, 8, QtWidgets.QTableWidgetItem(app_type))
-        self.tbl_apps.blockSignals(False)
-        self._restore_selected_cache()
-        self.tbl_apps.resizeColumnsToContents()
-        self._refresh_groups(sorted(groups))
+    def _apply_group_filter(self, *_):
+        self._apps_proxy.set_value(self._selected_group() if self.chk_filter_group.isChecked() else None)
 
     def _browse_exe(self):
         path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select application", "", "Executable (*.exe)")
@@ -1298,62 +2194,61 @@ class AppLauncherPage(QtWidgets.QWidget):
             return
 
         app = {"name": name, "path": path, "args": args, "enabled": True, "type": "custom", "group": group, "profile": "Auto"}
-        apps = self.settings.data.setdefault("apps", {}).setdefault("custom", [])
+        apps = self._apps_store().setdefault("custom", [])
         apps.append(app)
-        self.settings.save()
+        self._save_debounce.start()
 
         self.in_app_name.clear()
         self.in_app_path.clear()
         self.in_app_args.clear()
         self.in_app_group.clear()
-        self._refresh()
+        self._refresh_debounce.start()
 
     def _add_running_apps(self):
-        apps = self.settings.data.setdefault("apps", {})
-        custom = apps.setdefault("custom", [])
-        existing_names = {str(a.get("name", "")).lower() for a in custom}
+        custom = self._apps_store().setdefault("custom", [])
+        existing_names = {_lc(a.get("name")) for a in custom}
 
         added = 0
-        for p in psutil.process_iter(attrs=["name", "exe"]):
-            try:
-                name = (p.info.get("name") or "").strip()
-                exe = (p.info.get("exe") or "").strip()
-                if not name or not exe:
-                    continue
-                lower_exe = exe.lower()
-                if "\\windows\\system32" in lower_exe or "\\windows\\syswow64" in lower_exe:
-                    continue
-                if name.lower() in existing_names:
-                    continue
-                custom.append(
-                    {
-                        "name": name,
-                        "path": exe,
-                        "args": "",
-                        "enabled": True,
-                        "type": "custom",
-                        "group": "Detected",
-                        "profile": "Auto",
-                    }
-                )
-                existing_names.add(name.lower())
-                added += 1
-            except Exception:
+        by_name, _ = self._proc_snapshot()  # reuse the refresh snapshot instead of another process_iter
+        # snapshot keys are already lowercase names: skip known apps before looking at any process
+        for lname, procs in by_name.items():
+            if lname in existing_names:
                 continue
+            for p in procs:
+                try:
+                    name = (p.info.get("name") or "").strip()
+                    exe = (p.info.get("exe") or "").strip()
+                    if not name or not exe or exe.lower().startswith(_WIN_SYS_PREFIXES):
+                        continue
+                    custom.append(
+                        {
+                            "name": name,
+                            "path": exe,
+                            "args": "",
+                            "enabled": True,
+                            "type": "custom",
+                            "group": "Detected",
+                            "profile": "Auto",
+                        }
+                    )
+                    existing_names.add(lname)
+                    added += 1
+                    break  # one entry per process name
+                except Exception:
+                    continue
 
         if added:
-            self.settings.save()
-        self._refresh()
+            self._save_debounce.start()
+        self._refresh_debounce.start()
         QtWidgets.QMessageBox.information(self, "Detected Apps", f"Added {added} running app(s).")
 
     def _selected_app_names(self) -> List[str]:
-        items = self.tbl_apps.selectedItems()
-        rows = sorted({it.row() for it in items})
+        rows = sorted(ix.row() for ix in self.tbl_apps.selectionModel().selectedRows())
         names = []
         for r in rows:
-            name_item = self.tbl_apps.item(r, 1)
-            if name_item:
-                names.append(name_item.text())
+            app = self._apps_proxy.source_row(r)
+            if app is not None:
+                names.append(str(app.get("name", "")))
         return names
 
     def _selected_apps(self) -> List[Dict[str, Any]]:
@@ -1363,53 +2258,80 @@ class AppLauncherPage(QtWidgets.QWidget):
         return [app for app in self._all_apps() if app.get("name") in names]
 
     def _save_selected_cache(self):
-        apps = self.settings.data.setdefault("apps", {})
+        if self._restoring_selection:
+            return
+        apps = self._apps_store()
         current = self._selected_app_names()
         prev = apps.get("last_selected", []) or []
         if prev == current:
             return
         apps["last_selected"] = current
-        self.settings.save()
+        self._save_debounce.start()
 
     def _restore_selected_cache(self):
-        saved = (self.settings.data.get("apps", {}) or {}).get("last_selected", []) or []
+        saved = self._apps_store().get("last_selected", []) or []
         if not saved:
             return
         wanted = set(str(x) for x in saved)
-        self.tbl_apps.blockSignals(True)
-        for row in range(self.tbl_apps.rowCount()):
-            name_item = self.tbl_apps.item(row, 1)
-            if name_item and name_item.text() in wanted:
-                self.tbl_apps.selectRow(row)
-        self.tbl_apps.blockSignals(False)
-
-    def _find_running(self) -> Dict[str, bool]:
-        running = {}
-        for p in psutil.process_iter(attrs=["name", "exe"]):
-            try:
-                name = (p.info.get("name") or "").lower()
-                exe = (p.info.get("exe") or "").lower()
-                if name:
-                    running[name] = True
-                if exe:
-                    running[exe] = True
-            except Exception:
-                continue
-        return running
+        proxy = self._apps_proxy
+        last_col = proxy.columnCount() - 1
+        sel = QtCore.QItemSelection()
+        for row in range(proxy.rowCount()):
+            app = proxy.source_row(row)
+            if app is not None and str(app.get("name", "")) in wanted:
+                sel.select(proxy.index(row, 0), proxy.index(row, last_col))
+        # one select() call -> one selectionChanged, instead of one per selectRow()
+        flags = QtCore.QItemSelectionModel.SelectionFlag.ClearAndSelect | QtCore.QItemSelectionModel.SelectionFlag.Rows
+        self.tbl_apps.selectionModel().select(sel, flags)
+
+    def _proc_snapshot(self) -> Tuple[Dict[str, List[psutil.Process]], Dict[str, List[psutil.Process]]]:
+        # one process_iter per operation: refresh + launch/stop of N apps share it
+        now = time.monotonic()
+        if self._proc_cache is not None and now - self._proc_cache[0] < _PROC_SNAPSHOT_TTL_S:
+            return self._proc_cache[1], self._proc_cache[2]
+        by_name, by_exe = _snapshot_processes()
+        self._proc_cache = (now, by_name, by_exe)
+        return by_name, by_exe
+
+    def _find_running(self) -> FrozenSet[str]:
+        return _running_keys(*self._proc_snapshot())
+
+    def _start_proc_scan(self):
+        if self._scan_worker is not None:
+            return  # previous scan still in flight
+        w = ProcessScanWorker(self)
+        w.done.connect(self._on_proc_scan_done)
+        w.finished.connect(w.deleteLater)
+        self._scan_worker = w
+        w.start()
+
+    def _on_proc_scan_done(self, by_name: dict, by_exe: dict, running: FrozenSet[str]):
+        self._scan_worker = None
+        self._proc_cache = (time.monotonic(), by_name, by_exe)
+        # rows are unchanged on a timed refresh; only the Running column can move
+        self._apps_model.set_running(running)
+        self._arm_auto_refresh()
+
+    def shutdown(self):
+        try:
+            self._auto_timer.stop()
+            self._refresh_debounce.stop()
+            if self._save_debounce.isActive():
+                self._save_debounce.stop()
+                self.settings.save()
+            if self._scan_worker is not None:
+                self._scan_worker.wait(3000)
+        except Exception:
+            pass
 
     def _match_processes(self, app: Dict[str, Any]) -> List[psutil.Process]:
-        matches = []
-        name = (app.get("name") or "").lower()
-        path = (app.get("path") or "").lower()
-        for p in psutil.process_iter(attrs=["name", "exe"]):
-            try:
-                pname = (p.info.get("name") or "").lower()
-                pexe = (p.info.get("exe") or "").lower()
-                if (path and pexe == path) or (name and pname == name):
-                    matches.append(p)
-            except Exception:
-                continue
-        return matches
+        by_name, by_exe = self._proc_snapshot()
+        name = _lc(app.get("name"))
+        path = _lc(app.get("path"))
+        matches = {}
+        for p in (by_exe.get(path, []) if path else []) + (by_name.get(name, []) if name else []):
+            matches[p.pid] = p
+        return list(matches.values())
 
     def _set_active_profile_runtime(self, profile: str):
         profile = str(profile or "").strip()
@@ -1425,6 +2347,16 @@ class AppLauncherPage(QtWidgets.QWidget):
                 self._launch_app(app, relaunch)
         finally:
             self._set_active_profile_runtime(prev_profile)
+            self._proc_cache = None  # launched/terminated; next refresh must rescan
+
+    def _stop_apps(self, apps: List[Dict[str, Any]]):
+        for app in apps:
+            for p in self._match_processes(app):
+                try:
+                    p.terminate()
+                except Exception:
+                    continue
+        self._proc_cache = None
 
     def _launch_app(self, app: Dict[str, Any], relaunch: bool):
         matches = self._match_processes(app)
@@ -1452,37 +2384,23 @@ class AppLauncherPage(QtWidgets.QWidget):
         relaunch = self.chk_relaunch.isChecked()
         selected = [app for app in apps if app.get("name") in names]
         self._launch_apps_batch(selected, relaunch)
-        self._refresh()
+        self._refresh_debounce.start()
 
     def _launch_enabled(self):
         apps = self._all_apps()
         relaunch = self.chk_relaunch.isChecked()
         enabled = [app for app in apps if app.get("enabled", True)]
         self._launch_apps_batch(enabled, relaunch)
-        self._refresh()
+        self._refresh_debounce.start()
 
     def _stop_selected(self):
         names = self._selected_app_names()
-        apps = self._all_apps()
-        for app in apps:
-            if app.get("name") in names:
-                for p in self._match_processes(app):
-                    try:
-                        p.terminate()
-                    except Exception:
-                        continue
-        self._refresh()
+        self._stop_apps([app for app in self._all_apps() if app.get("name") in names])
+        self._refresh_debounce.start()
 
     def _stop_enabled(self):
-        apps = self._all_apps()
-        for app in apps:
-            if app.get("enabled", True):
-                for p in self._match_processes(app):
-                    try:
-                        p.terminate()
-                    except Exception:
-                        continue
-        self._refresh()
+        self._stop_apps([app for app in self._all_apps() if app.get("enabled", True)])
+        self._refresh_debounce.start()
 
     def _move_selected_to_group(self):
         apps = self._selected_apps()
@@ -1492,76 +2410,45 @@ class AppLauncherPage(QtWidgets.QWidget):
         if not ok:
             return
         group = group.strip() or "Default"
-        store = self.settings.data.get("apps", {}) or {}
-        for app in store.get("important", []):
-            if app.get("name") in {a.get("name") for a in apps}:
-                app["group"] = group
-        for app in store.get("custom", []):
-            if app.get("name") in {a.get("name") for a in apps}:
-                app["group"] = group
-        self.settings.data["apps"] = store
-        self.settings.save()
-        self._refresh()
+        # _selected_apps() returns the stored dicts themselves, so one pass updates settings
+        for app in apps:
+            app["group"] = group
+        self._save_debounce.start()
+        self._refresh_debounce.start()
 
     def _set_profile_for_selected(self):
         apps = self._selected_apps()
         if not apps:
             return
         profile = self.cmb_app_profile.currentText()
-        store = self.settings.data.get("apps", {}) or {}
-        names = {a.get("name") for a in apps}
-        for app in store.get("important", []):
-            if app.get("name") in names:
-                app["profile"] = profile
-        for app in store.get("custom", []):
-            if app.get("name") in names:
-                app["profile"] = profile
-        self.settings.data["apps"] = store
-        self.settings.save()
-        self._refresh()
+        for app in apps:
+            app["profile"] = profile
+        self._save_debounce.start()
+        self._refresh_debounce.start()
 
     def _remove_selected(self):
         names = set(self._selected_app_names())
-        apps = self.settings.data.get("apps", {}) or {}
+        apps = self._apps_store()
         custom = apps.get("custom", []) or []
         apps["custom"] = [a for a in custom if a.get("name") not in names]
-        self.settings.data["apps"] = apps
-        self.settings.save()
-        self._refresh()
+        self._save_debounce.start()
+        self._refresh_debounce.start()
 
-    def _on_item_changed(self, item: QtWidgets.QTableWidgetItem):
-        if item.column() != 0:
-            return
-        row = item.row()
-        name_item = self.tbl_apps.item(row, 1)
-        type_item = self.tbl_apps.item(row, 8)
-        if not name_item or not type_item:
-            return
-        name = name_item.text()
-        app_type = type_item.text()
-        enabled = item.checkState() == QtCore.Qt.CheckState.Checked
-
-        apps = self.settings.data.get("apps", {}) or {}
-        bucket = apps.get("custom", []) if app_type == "custom" else apps.get("important", [])
-        for app in bucket:
-            if app.get("name") == name:
-                app["enabled"] = enabled
-                break
-        self.settings.data["apps"] = apps
-        self.settings.save()
+    def _on_enabled_changed(self, app: Dict[str, Any]):
+        # the model already flipped app["enabled"] on the settings dict; just persist it
+        self._save_debounce.start()
 
     def _mark_last_launch(self, name: str):
         name = (name or "").strip()
         if not name:
             return
-        apps = self.settings.data.setdefault("apps", {})
-        last = apps.setdefault("last_launch", {})
+        last = self._apps_store().setdefault("last_launch", {})
         last[name] = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.settings.save()
+        self._save_debounce.start()
 
     def _refresh_groups(self, groups: List[str]):
         current = self.cmb_group.currentText()
-        saved = (self.settings.data.get("apps", {}) or {}).get("last_group", "All groups")
+        saved = self._apps_store().get("last_group", "All groups")
         self.cmb_group.blockSignals(True)
         self.cmb_group.clear()
         self.cmb_group.addItem("All groups")
@@ -1580,57 +2467,174 @@ class AppLauncherPage(QtWidgets.QWidget):
         return group
 
     def _on_group_changed(self, group: str):
-        apps = self.settings.data.setdefault("apps", {})
-        apps["last_group"] = group
-        self.settings.save()
+        self._apps_store()["last_group"] = group
+        self._save_debounce.start()
+        self._apply_group_filter()
+
+    def _group_apps(self, group: str) -> List[Dict[str, Any]]:
+        # buckets are built by _refresh; run a pending one first so a just-moved app lands right
+        if self._refresh_debounce.isActive():
+            self._refresh_debounce.stop()
+            self._refresh()
+        return self._apps_by_group.get(group, [])
 
     def _launch_group(self):
         group = self._selected_group()
         if not group:
             return
         relaunch = self.chk_relaunch.isChecked()
-        grouped = [app for app in self._all_apps() if (app.get("group") or "Default") == group]
-        self._launch_apps_batch(grouped, relaunch)
-        self._refresh()
+        self._launch_apps_batch(self._group_apps(group), relaunch)
+        self._refresh_debounce.start()
 
     def _stop_group(self):
         group = self._selected_group()
         if not group:
             return
-        for app in self._all_apps():
-            if (app.get("group") or "Default") == group:
-                for p in self._match_processes(app):
-                    try:
-                        p.terminate()
-                    except Exception:
-                        continue
-        self._refresh()
+        self._stop_apps(self._group_apps(group))
+        self._refresh_debounce.start()
 
 
 # ---------------------
 # App Routing Page
 # ---------------------
 
+# interface addresses and the default-route table rarely move; the route command is a fork+exec
+_IFACE_META_TTL_S = 10.0
+# dotted netmask -> prefix length for every contiguous IPv4 mask
+_NETMASK_PREFIX = {str(ipaddress.IPv4Network(f"0.0.0.0/{n}").netmask): n for n in range(33)}
+_RTF_UP_GATEWAY = 0x0003
+
+
+def _read_proc_net_route() -> Optional[Dict[str, str]]:
+    """
+    Default gateways per interface straight from the kernel table (no `ip route` fork).
+    Addresses are hex in host byte order. Returns None when /proc/net/route is unreadable.
+    """
+    gw: Dict[str, str] = {}
+    try:
+        with open("/proc/net/route", "r", encoding="ascii", errors="ignore") as f:
+            next(f, None)  # header
+            for line in f:
+                cols = line.split()
+                if len(cols) < 8 or cols[1] != "00000000" or cols[7] != "00000000":
+                    continue
+                if int(cols[3], 16) & _RTF_UP_GATEWAY != _RTF_UP_GATEWAY:
+                    continue
+                gw.setdefault(cols[0], socket.inet_ntoa(struct.pack("=L", int(cols[2], 16))))
+    except (OSError, ValueError):
+        return None
+    return gw
+
+
+# crude classification for the app filter
+_SYSTEM_PROCS = frozenset((
+    "system", "system idle process", "idle", "services.exe", "wininit.exe", "csrss.exe", "lsass.exe",
+    "smss.exe", "fontdrvhost.exe", "dwm.exe", "spoolsv.exe",
+))
+_SYSTEM_USERS = frozenset((
+    "nt authority\\system", "system", "local service", "nt authority\\local service", "nt authority\\network service",
+))
+
+
+def _is_os_owned(p: Any) -> bool:
+    """Binary in the Windows system dirs or running as a system account (list_processes(with_owner=True))."""
+    exe = (p.exe or "").lower()
+    return "\\windows\\system32" in exe or "\\windows\\syswow64" in exe or (p.username or "").lower() in _SYSTEM_USERS
+
+
+def _route_filter_needs_owner(mode: str) -> bool:
+    return mode.startswith("Apps only") or mode.startswith("Apps + background")
+
+
+def _filter_route_procs(procs: List[Any], mode: str) -> List[Any]:
+    """Apply the Apps only / Apps + background / Include services filter to scanner results."""
+    apps_only = mode.startswith("Apps only")
+    background = mode.startswith("Apps + background")
+    my_pid = os.getpid()
+    filtered = []
+    for p in procs:
+        if p.pid == my_pid:
+            continue
+        nm = (p.name or "").lower()
+        if "umbra" in nm:
+            continue
+
+        is_system = nm in _SYSTEM_PROCS
+        # Apps only checks every process; Apps + background only hides OS-owned system names
+        if apps_only or (background and is_system):
+            if (apps_only and is_system) or _is_os_owned(p):
+                continue
+        # else Include services => no filtering
+
+        filtered.append(p)
+    return filtered
+
+
+class RouteScanWorker(QtCore.QThread):
+    """Process scan + app filter for the routing page; the list is rendered on the UI thread."""
+
+    done = QtCore.pyqtSignal(list)
+
+    def __init__(self, scanner: NetworkScanner, active_only: bool, mode: str, parent=None):
+        super().__init__(parent)
+        self.scanner = scanner
+        self.active_only = active_only
+        self.mode = mode
+
+    def run(self):
+        try:
+            procs = self.scanner.list_processes(
+                only_network_active=self.active_only, with_owner=_route_filter_needs_owner(self.mode)
+            )
+            filtered = _filter_route_procs(procs, self.mode)
+        except Exception:
+            filtered = []
+        self.done.emit(filtered)
+
+
 class AppRoutingPage(QtWidgets.QWidget):
+    _settings_saved = QtCore.pyqtSignal()
+
     def __init__(
         self,
         engine: EngineManager,
         settings: SettingsManager,
-        is_refresh_paused_cb: Optional[Callable[[], bool]] = None,
     ):
         super().__init__()
         self.engine = engine
         self.settings = settings
-        self.is_refresh_paused_cb = is_refresh_paused_cb
+        self._refresh_paused = False
         self.scanner = NetworkScanner()
+        self._iface_meta_cached: Optional[Dict[str, Dict[str, str]]] = None
+        self._iface_meta_ts = 0.0
+        self._iface_order: List[str] = []
+        self._iface_order_names: FrozenSet[str] = frozenset()
+        self._scan_worker: Optional[RouteScanWorker] = None
+        self._scan_pending = False  # filters changed while a scan was running
+        self._combo_index: Dict[QtWidgets.QComboBox, Dict[str, int]] = {}
+        self._last_scan_at = 0.0
+
+        # one user action can emit several signals (and arrow keys one per row); act on the last
+        self._refresh_debounce = QtCore.QTimer(self)
+        self._refresh_debounce.setSingleShot(True)
+        self._refresh_debounce.setInterval(50)
+        self._refresh_debounce.timeout.connect(self._refresh)
+        self._rule_debounce = QtCore.QTimer(self)
+        self._rule_debounce.setSingleShot(True)
+        self._rule_debounce.setInterval(50)
+        self._rule_debounce.timeout.connect(self._load_app_rule)
+
+        # timed refresh: one-shot, armed for the configured interval and re-armed after each scan
+        self._auto_timer = QtCore.QTimer(self)
+        self._auto_timer.setSingleShot(True)
+        self._auto_timer.timeout.connect(self._maybe_auto_refresh)
 
         self._build()
         self._wire()
         self._refresh()
 
-        self._auto_timer = QtCore.QTimer(self)
-        self._auto_timer.timeout.connect(self._maybe_auto_refresh)
-        self._auto_timer.start(1000)
+        self._settings_saved.connect(self._arm_auto_refresh)
+        self.settings.add_save_listener(self._settings_saved.emit)
 
     def _build(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -1716,10 +2720,10 @@ class AppRoutingPage(QtWidgets.QWidget):
         layout.addLayout(top, 1)
 
     def _wire(self):
-        self.btn_refresh.clicked.connect(self._refresh)
-        self.chk_active_only.toggled.connect(self._refresh)
-        self.cmb_app_filter.currentIndexChanged.connect(self._refresh)
-        self.lst_apps.currentItemChanged.connect(lambda *_: self._load_app_rule())
+        self.btn_refresh.clicked.connect(self._refresh_clicked)
+        self.chk_active_only.toggled.connect(lambda *_: self._refresh_debounce.start())
+        self.cmb_app_filter.currentIndexChanged.connect(lambda *_: self._refresh_debounce.start())
+        self.lst_apps.currentItemChanged.connect(lambda *_: self._rule_debounce.start())
         self.cmb_iface.currentTextChanged.connect(lambda *_: self._update_iface_info())
         self.btn_apply.clicked.connect(self._apply)
         self.btn_apply_policy_win.clicked.connect(self._apply_windows_policy_route)
@@ -1729,101 +2733,141 @@ class AppRoutingPage(QtWidgets.QWidget):
     def refresh_now(self):
         self._refresh()
 
-    def _maybe_auto_refresh(self):
-        if self.is_refresh_paused_cb and self.is_refresh_paused_cb():
-            return
-        ui = (self.settings.data.get("ui", {}) or {})
-        if bool(ui.get("disable_automations", False)):
-            return
-        if not bool(ui.get("refresh_enabled", True)):
-            return
-        interval_s = int(ui.get("refresh_interval_s", 60))
-        if interval_s <= 0:
-            return
-        now = time.time()
-        last = getattr(self, "_last_auto_refresh", 0.0)
-        if now - last < interval_s:
-            return
-        self._last_auto_refresh = now
+    def _refresh_clicked(self):
+        self._iface_meta_ts = 0.0  # explicit refresh re-reads interfaces and routes
         self._refresh()
 
-    def _refresh(self):
-        self.lst_apps.clear()
+    def set_refresh_paused(self, paused: bool):
+        # pushed by MainWindow on minimize/hide/show
+        self._refresh_paused = paused
+        if paused:
+            self._auto_timer.stop()
+        else:
+            self._resume_auto_refresh()
 
-        active_only = self.chk_active_only.isChecked()
-        procs = self.scanner.list_processes(only_network_active=active_only)
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._resume_auto_refresh()
 
-        # Filter processes: Apps only / Apps+background / Include services
-        mode = self.cmb_app_filter.currentText() if hasattr(self, "cmb_app_filter") else "Apps only (recommended)"
-        filtered = []
-        my_pid = os.getpid()
-
-        for p in procs:
-            if p.pid == my_pid:
-                continue
-            nm = (p.name or "").lower()
-            if "umbra" in nm:
-                continue
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._auto_timer.stop()  # another tab is up: nobody would see the result
 
-            # crude classification
-            is_system = nm in ("system", "system idle process", "idle", "services.exe", "wininit.exe", "csrss.exe", "lsass.exe", "smss.exe", "fontdrvhost.exe", "dwm.exe", "spoolsv.exe")
-            exe_is_system = False
-            user_is_system = False
-            try:
-                pr = psutil.Process(p.pid)
-                exe = (pr.exe() or "").lower()
-                exe_is_system = ("\\windows\\system32" in exe) or ("\\windows\\syswow64" in exe)
-                user = (pr.username() or "").lower()
-                user_is_system = user in ("nt authority\\system", "system", "local service", "nt authority\\local service", "nt authority\\network service")
-            except Exception:
-                pass
+    def _resume_auto_refresh(self):
+        # catch up at once if a timed refresh came due while hidden/paused, else re-arm
+        interval_s = _auto_refresh_interval_s(self.settings)
+        if interval_s > 0 and time.monotonic() - self._last_scan_at >= interval_s:
+            self._maybe_auto_refresh()
+        else:
+            self._arm_auto_refresh()
 
-            if mode.startswith("Apps only"):
-                if is_system or exe_is_system or user_is_system:
-                    continue
-            elif mode.startswith("Apps + background"):
-                # hide core Windows services, but allow non-system background apps
-                if is_system and (exe_is_system or user_is_system):
-                    continue
-            # else Include services => no filtering
+    def _arm_auto_refresh(self):
+        try:
+            if self._refresh_paused or not self.isVisible() or self._auto_timer.isActive() or self._scan_worker is not None:
+                return
+            interval_s = _auto_refresh_interval_s(self.settings)
+            if interval_s > 0:
+                self._auto_timer.start(interval_s * 1000)
+        except RuntimeError:
+            pass  # save listener outliving the widget at exit
 
-            filtered.append(p)
+    def _maybe_auto_refresh(self):
+        if self._refresh_paused or not self.isVisible() or _auto_refresh_interval_s(self.settings) <= 0:
+            return
+        self._refresh()
 
-        for p in filtered[:250]:
-            self.lst_apps.addItem(f"{p.name} (PID {p.pid})")
+    def _refresh(self):
+        self._start_scan()
 
         # dns
-        self.cmb_dns.clear()
-        self.cmb_dns.addItem("AUTO")
         servers = (self.settings.data.get("dns", {}) or {}).get("servers", [])
-        for s in servers:
-            self.cmb_dns.addItem(f"{s.get('name','')} - {s.get('server','')} [{s.get('loc','')}]")
+        self._fill_combo(self.cmb_dns, [f"{s.get('name','')} - {s.get('server','')} [{s.get('loc','')}]" for s in servers])
 
         # vpn configs
-        self.cmb_vpn.clear()
-        self.cmb_vpn.addItem("AUTO")
         cfgs = self.settings.data.get("configs", []) or []
-        for i, c in enumerate(cfgs):
-            self.cmb_vpn.addItem(f"{i}: {c.get('name','')}")
+        self._fill_combo(self.cmb_vpn, [f"{i}: {c.get('name','')}" for i, c in enumerate(cfgs)])
 
         # interfaces
         self._iface_meta = self._collect_interface_meta()
-        self.cmb_iface.clear()
-        self.cmb_iface.addItem("AUTO")
-        for name in self._iface_meta:
-            self.cmb_iface.addItem(name)
+        self._fill_combo(self.cmb_iface, list(self._iface_meta))
 
+        # combos were rebuilt silently; _load_app_rule re-selects from the stored rule
         self._load_app_rule()
         self._update_iface_info()
 
+    def _start_scan(self):
+        if self._scan_worker is not None:
+            self._scan_pending = True  # one more pass once the running scan lands
+            return
+        self._scan_pending = False
+        # Filter processes: Apps only / Apps+background / Include services
+        mode = self.cmb_app_filter.currentText()
+        w = RouteScanWorker(self.scanner, self.chk_active_only.isChecked(), mode, self)
+        w.done.connect(self._on_scan_done)
+        w.finished.connect(w.deleteLater)
+        self._scan_worker = w
+        self._last_scan_at = time.monotonic()
+        w.start()
+
+    def _on_scan_done(self, filtered: list):
+        self._scan_worker = None
+        if self._scan_pending:
+            self._start_scan()  # filters moved on; this result is already stale
+            return
+        self._arm_auto_refresh()
+        prev_pid = self._selected_app_pid()
+        shown = filtered[:250]
+        row_by_pid = {p.pid: i for i, p in enumerate(shown)}
+        with _bulk_update(self.lst_apps):
+            self.lst_apps.clear()
+            for p in shown:
+                item = QtWidgets.QListWidgetItem(f"{p.name} (PID {p.pid})")
+                item.setData(QtCore.Qt.ItemDataRole.UserRole, (p.name, p.pid))  # rule key + pid, no text parsing
+                self.lst_apps.addItem(item)
+            if prev_pid in row_by_pid:
+                self.lst_apps.setCurrentRow(row_by_pid[prev_pid])
+        self._load_app_rule()
+
+    def shutdown(self):
+        try:
+            self._auto_timer.stop()
+            self._refresh_debounce.stop()
+            self._rule_debounce.stop()
+            if self._scan_worker is not None:
+                self._scan_worker.wait(3000)
+        except Exception:
+            pass
+
+    def _fill_combo(self, cmb: QtWidgets.QComboBox, items: List[str]):
+        texts = ["AUTO", *items]
+        with _bulk_update(cmb):
+            cmb.clear()
+            cmb.addItems(texts)
+        # text -> row for _select_combo_by_prefix; saved rules hold the full item text, and the
+        # "Name" / "3" heads (before " - " / ":") cover the short forms. First row wins, like the scan.
+        index: Dict[str, int] = {}
+        for i, t in enumerate(texts):
+            index.setdefault(t, i)
+            for sep in (" - ", ":"):
+                if sep in t:
+                    index.setdefault(t.split(sep, 1)[0], i)
+                    break
+        self._combo_index[cmb] = index
+
+    def _selected_app_pid(self) -> Optional[int]:
+        item = self.lst_apps.currentItem()
+        return item.data(QtCore.Qt.ItemDataRole.UserRole)[1] if item else None
+
     def _selected_app_key(self) -> Optional[str]:
         item = self.lst_apps.currentItem()
-        if not item:
-            return None
         # keep key as app name (without pid) for stable routing
-        text = item.text()
-        name = text.split("(PID")[0].strip()
-        return name
+        return item.data(QtCore.Qt.ItemDataRole.UserRole)[0] if item else None
+
+    def _flush_rule_load(self):
+        # Apply reads the combos; they must show the selected app's rule, not the previous one
+        if self._rule_debounce.isActive():
+            self._rule_debounce.stop()
+            self._load_app_rule()
 
     def _load_app_rule(self):
         key = self._selected_app_key()
@@ -1852,6 +2896,9 @@ class AppRoutingPage(QtWidgets.QWidget):
         self._update_iface_info()
 
     def _collect_interface_meta(self) -> Dict[str, Dict[str, str]]:
+        now = time.monotonic()
+        if self._iface_meta_cached is not None and now - self._iface_meta_ts < _IFACE_META_TTL_S:
+            return self._iface_meta_cached
         iface_addrs = psutil.net_if_addrs() or {}
         gw_by_iface = self._default_gateways_by_iface()
         meta: Dict[str, Dict[str, str]] = {}
@@ -1864,24 +2911,30 @@ class AppRoutingPage(QtWidgets.QWidget):
                 if a.address:
                     ipv4 = str(a.address)
                 if a.netmask:
-                    try:
-                        subnet = str(ipaddress.IPv4Network(f"0.0.0.0/{a.netmask}").prefixlen)
-                        subnet = f"/{subnet}"
-                    except Exception:
-                        subnet = str(a.netmask)
+                    prefix = _NETMASK_PREFIX.get(a.netmask)
+                    subnet = f"/{prefix}" if prefix is not None else str(a.netmask)
                 break
             meta[iface] = {
                 "ip": ipv4,
                 "subnet": subnet,
                 "gateway": gw_by_iface.get(iface, "-"),
             }
-        return dict(sorted(meta.items(), key=lambda kv: kv[0].lower()))
+        # display order only changes when interfaces come or go
+        if meta.keys() != self._iface_order_names:
+            self._iface_order = sorted(meta, key=str.lower)
+            self._iface_order_names = frozenset(meta)
+        meta = {name: meta[name] for name in self._iface_order}
+        self._iface_meta_cached, self._iface_meta_ts = meta, now
+        return meta
 
     def _default_gateways_by_iface(self) -> Dict[str, str]:
         gw: Dict[str, str] = {}
         try:
-            sys_name = platform.system().lower()
+            sys_name = _SYS_NAME
             if sys_name.startswith("linux"):
+                table = _read_proc_net_route()
+                if table is not None:
+                    return table
                 out = subprocess.check_output(["ip", "route", "show", "default"], text=True, stderr=subprocess.DEVNULL)
                 for line in out.splitlines():
                     parts = line.split()
@@ -1921,7 +2974,7 @@ class AppRoutingPage(QtWidgets.QWidget):
         return gw
 
     def _update_iface_info(self):
-        iface = self.cmb_iface.currentText() if hasattr(self, "cmb_iface") else "AUTO"
+        iface = self.cmb_iface.currentText()
         if iface == "AUTO":
             self.lbl_iface_info.setText("Interface info: AUTO (system default route)")
             return
@@ -1935,6 +2988,7 @@ class AppRoutingPage(QtWidgets.QWidget):
         )
 
     def _apply(self):
+        self._flush_rule_load()
         key = self._selected_app_key()
         if not key:
             return
@@ -1967,7 +3021,7 @@ class AppRoutingPage(QtWidgets.QWidget):
         dns_server = self._dns_server_from_setting(dns_val)
         if not dns_server or not iface_val or iface_val == "AUTO":
             return
-        if not platform.system().lower().startswith("win"):
+        if not _IS_WIN:
             return
 
         mb = QtWidgets.QMessageBox(self)
@@ -1992,6 +3046,7 @@ class AppRoutingPage(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, "DNS Apply", f"Failed to apply DNS on interface '{iface_val}'.\n{exc}")
 
     def _apply_windows_policy_route(self):
+        self._flush_rule_load()
         app = self._selected_app_key()
         if not app:
             return
@@ -2010,7 +3065,7 @@ class AppRoutingPage(QtWidgets.QWidget):
         self.settings.data.setdefault("policy_routing_rules", {})[app] = policy
         self.settings.save()
 
-        if not platform.system().lower().startswith("win"):
+        if not _IS_WIN:
             QtWidgets.QMessageBox.information(
                 self,
                 "Windows Policy",
@@ -2076,7 +3131,8 @@ class AppRoutingPage(QtWidgets.QWidget):
             "Quick profile saved for OBS (obs64.exe / obs.exe).",
         )
 
-    def _extract_setting(self, cmb: QtWidgets.QComboBox) -> str:
+    @staticmethod
+    def _extract_setting(cmb: QtWidgets.QComboBox) -> str:
         text = cmb.currentText()
         if text.startswith("AUTO"):
             return "AUTO"
@@ -2084,16 +3140,19 @@ class AppRoutingPage(QtWidgets.QWidget):
 
     def _select_combo_by_prefix(self, cmb: QtWidgets.QComboBox, pref: str):
         pref = str(pref or "")
+        idx = self._combo_index.get(cmb, {}).get(pref)
+        if idx is not None:
+            cmb.setCurrentIndex(idx)
+            return
         for i in range(cmb.count()):
             if cmb.itemText(i).startswith(pref):
                 cmb.setCurrentIndex(i)
                 return
         cmb.setCurrentIndex(0)
 
-    def _select_combo_exact(self, cmb: QtWidgets.QComboBox, val: str):
-        val = str(val or "")
-        idx = cmb.findText(val)
-        cmb.setCurrentIndex(idx if idx >= 0 else 0)
+    @staticmethod
+    def _select_combo_exact(cmb: QtWidgets.QComboBox, val: str):
+        cmb.setCurrentIndex(max(0, cmb.findText(str(val or ""))))
 
 
 # ---------------------
@@ -2105,12 +3164,40 @@ class SettingsPage(QtWidgets.QWidget):
         super().__init__()
         self.engine = engine
         self.settings = settings
-        self.updater = CoreUpdater(log=self._append_log)
+
+        # core updates run on the thread pool; lines and results come back through these signals
+        self._update_signals = CoreUpdateSignals(self)
+        self._update_signals.log.connect(self._append_log)
+        self._update_signals.finished.connect(self._on_core_update_finished)
+        self._updates_inflight: Set[str] = set()
+
+        # behavior widgets fire one signal each; a burst of edits is written once
+        self._behavior_save = QtCore.QTimer(self)
+        self._behavior_save.setSingleShot(True)
+        self._behavior_save.setInterval(250)
+        self._behavior_save.timeout.connect(self.settings.save)
+        self._loading_behavior = False
+        self._dns_cols_sized = False
+
+        # update log lines are queued and appended to the terminal in one go
+        self._log_buf: List[str] = []
+        self._log_flush = QtCore.QTimer(self)
+        self._log_flush.setSingleShot(True)
+        self._log_flush.setInterval(100)
+        self._log_flush.timeout.connect(self._flush_log)
 
         self._build()
         self._wire()
         self._refresh()
 
+    def shutdown(self):
+        try:
+            if self._behavior_save.isActive():
+                self._behavior_save.stop()
+                self.settings.save()
+        except Exception:
+            pass
+
     def _build(self):
         layout = QtWidgets.QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -2170,9 +3257,21 @@ class SettingsPage(QtWidgets.QWidget):
         self.btn_optimize.setMinimumHeight(46)
         self.lbl_opt = QtWidgets.QLabel("Status: -")
 
-        self.tbl_opt = QtWidgets.QTableWidget(0, 5)
-        self.tbl_opt.setHorizontalHeaderLabels(["Rank", "Server", "Ping", "Loss", "Jitter"])
-        self.tbl_opt.horizontalHeader().setStretchLastSection(True)
+        self._opt_model = DnsRankModel(self)
+        self.tbl_opt = QtWidgets.QTableView()
+        self.tbl_opt.setModel(self._opt_model)
+        self.tbl_opt.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tbl_opt.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        # widths from sample text once, rows one fixed height; results never need a measuring pass over their rows
+        fm = self.tbl_opt.fontMetrics()
+        vhdr = self.tbl_opt.verticalHeader()
+        vhdr.setVisible(False)
+        vhdr.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        vhdr.setDefaultSectionSize(fm.height() + 8)
+        hdr = self.tbl_opt.horizontalHeader()
+        for col, sample in enumerate(("Cloudflare Family", "255.255.255.255", "9999 ms", "100%")):
+            hdr.resizeSection(col, fm.horizontalAdvance(sample) + 24)
+        hdr.setStretchLastSection(True)
 
         lb.addWidget(self.chk_auto_suggest)
         lb.addWidget(self.btn_optimize)
@@ -2203,9 +3302,10 @@ class SettingsPage(QtWidgets.QWidget):
         ):
             b.setMinimumHeight(44)
 
-        self.term = QtWidgets.QTextEdit()
+        self.term = QtWidgets.QPlainTextEdit()
         self.term.setReadOnly(True)
         self.term.setFixedHeight(230)
+        self.term.setMaximumBlockCount(2000)  # oldest lines drop off
 
         u.addWidget(self.btn_upd_sing)
         u.addWidget(self.btn_upd_mihomo)
@@ -2318,20 +3418,24 @@ class SettingsPage(QtWidgets.QWidget):
         paths = cores.setdefault("paths", {})
         paths[name] = path
         self.settings.save()
+        self.engine.invalidate_core_paths()
         self._refresh()
 
     def _refresh(self):
-        # behavior
-        ui = (self.settings.data.get("ui", {}) or {})
-        self.chk_tray.setChecked(bool(ui.get("tray_enabled", True)))
-        self.cmb_close.setCurrentText(str(ui.get("close_action", "minimize_to_tray")))
-        self.chk_show_bitrate.setChecked(bool(ui.get("show_stream_bitrate_on_dashboard", True)))
-        self.chk_refresh.setChecked(bool(ui.get("refresh_enabled", True)))
-        self.spin_refresh.setValue(int(ui.get("refresh_interval_s", 60)))
-        self.chk_pause_min.setChecked(bool(ui.get("pause_refresh_when_minimized", True)))
-        self.chk_disable_auto.setChecked(bool(ui.get("disable_automations", False)))
-        if hasattr(self, "cmb_copilot_mode"):
+        # behavior (widgets are half-loaded until the last line; don't let them save back)
+        ui = self.settings.ui()
+        self._loading_behavior = True
+        try:
+            self.chk_tray.setChecked(bool(ui.get("tray_enabled", True)))
+            self.cmb_close.setCurrentText(str(ui.get("close_action", "minimize_to_tray")))
+            self.chk_show_bitrate.setChecked(bool(ui.get("show_stream_bitrate_on_dashboard", True)))
+            self.chk_refresh.setChecked(bool(ui.get("refresh_enabled", True)))
+            self.spin_refresh.setValue(int(ui.get("refresh_interval_s", 60)))
+            self.chk_pause_min.setChecked(bool(ui.get("pause_refresh_when_minimized", True)))
+            self.chk_disable_auto.setChecked(bool(ui.get("disable_automations", False)))
             self.cmb_copilot_mode.setCurrentText(self.settings.get_copilot_mode())
+        finally:
+            self._loading_behavior = False
 
         # auto suggestions
         beh = (self.settings.data.get("behavior", {}) or {})
@@ -2348,29 +3452,38 @@ class SettingsPage(QtWidgets.QWidget):
         self.lbl_openconnect_path.setText(f"OpenConnect binary: {cpaths.get('openconnect') or '-'}")
 
     def _save_behavior(self):
-        self.settings.create_snapshot("Apply: Behavior/Copilot")
-        self.settings.data.setdefault("ui", {})["tray_enabled"] = self.chk_tray.isChecked()
-        self.settings.data.setdefault("ui", {})["close_action"] = self.cmb_close.currentText()
-        self.settings.data.setdefault("ui", {})["show_stream_bitrate_on_dashboard"] = self.chk_show_bitrate.isChecked()
-        self.settings.data.setdefault("ui", {})["refresh_enabled"] = self.chk_refresh.isChecked()
-        self.settings.data.setdefault("ui", {})["refresh_interval_s"] = int(self.spin_refresh.value())
-        self.settings.data.setdefault("ui", {})["pause_refresh_when_minimized"] = self.chk_pause_min.isChecked()
-        self.settings.data.setdefault("ui", {})["disable_automations"] = self.chk_disable_auto.isChecked()
-        # copilot mode
-        if hasattr(self, "cmb_copilot_mode"):
-            self.settings.set_copilot_mode(self.cmb_copilot_mode.currentText())
-        self.settings.save()
+        if self._loading_behavior:
+            return
+        values = {
+            "tray_enabled": self.chk_tray.isChecked(),
+            "close_action": self.cmb_close.currentText(),
+            "show_stream_bitrate_on_dashboard": self.chk_show_bitrate.isChecked(),
+            "refresh_enabled": self.chk_refresh.isChecked(),
+            "refresh_interval_s": int(self.spin_refresh.value()),
+            "pause_refresh_when_minimized": self.chk_pause_min.isChecked(),
+            "disable_automations": self.chk_disable_auto.isChecked(),
+        }
+        mode = self.cmb_copilot_mode.currentText()
+        ui = self.settings.data.setdefault("ui", {})
+        mode_changed = mode != self.settings.get_copilot_mode()
+        if not mode_changed and all(ui.get(k) == v for k, v in values.items()):
+            return  # no-op edit: no snapshot, no write
+
+        # one snapshot per burst, taken before its first change lands
+        if not self._behavior_save.isActive():
+            self.settings.create_snapshot("Apply: Behavior/Copilot")
+        ui.update(values)
+        if mode_changed:
+            self.settings.set_copilot_mode(mode)
+        self._behavior_save.start()
 
     def _refresh_dns_table(self):
         servers = (self.settings.data.get("dns", {}) or {}).get("servers", []) or []
-        self.tbl_dns.setRowCount(0)
-        for s in servers:
-            r = self.tbl_dns.rowCount()
-            self.tbl_dns.insertRow(r)
-            self.tbl_dns.setItem(r, 0, QtWidgets.QTableWidgetItem(str(s.get("name", ""))))
-            self.tbl_dns.setItem(r, 1, QtWidgets.QTableWidgetItem(str(s.get("server", ""))))
-            self.tbl_dns.setItem(r, 2, QtWidgets.QTableWidgetItem(str(s.get("loc", ""))))
-        self.tbl_dns.resizeColumnsToContents()
+        _fill_table(self.tbl_dns, [(_as_text(s.get("name", "")), _as_text(s.get("server", "")), _as_text(s.get("loc", ""))) for s in servers])
+        if servers and not self._dns_cols_sized:
+            # size from the first real content only; edits keep the current (or user's) widths
+            self.tbl_dns.resizeColumnsToContents()
+            self._dns_cols_sized = True
 
     def _add_dns(self):
         name = self.in_dns_name.text().strip()
@@ -2389,7 +3502,7 @@ class SettingsPage(QtWidgets.QWidget):
         self._refresh_dns_table()
 
     def _apply_dns_preset(self):
-        preset = self.cmb_dns_preset.currentText() if hasattr(self, "cmb_dns_preset") else ""
+        preset = self.cmb_dns_preset.currentText()
         if not preset:
             return
         if self.settings.apply_dns_preset(preset):
@@ -2404,53 +3517,80 @@ class SettingsPage(QtWidgets.QWidget):
 
         self.btn_optimize.setEnabled(False)
         self.lbl_opt.setText("Status: testing (ping)...")
-        self.tbl_opt.setRowCount(0)
+        self._opt_model.set_rows([])
 
         self._wopt = OptimizeDnsWorker(servers, self)
         self._wopt.done.connect(self._on_opt_done)
         self._wopt.failed.connect(self._on_opt_fail)
+        self._wopt.progress.connect(self._on_opt_progress)
         self._wopt.start()
 
+    def _on_opt_progress(self, finished: int, total: int):
+        self.lbl_opt.setText(f"Status: testing (ping)... {finished}/{total}")
+
     def _on_opt_done(self, out: dict):
         self.btn_optimize.setEnabled(True)
         ranked = out.get("ranked", [])
         self.lbl_opt.setText(f"Status: done (top: {ranked[0][1] if ranked else '-'})")
-        self.tbl_opt.setRowCount(0)
-
-        for _, name, host, ping, loss, jitter in ranked[:10]:
-            r = self.tbl_opt.rowCount()
-            self.tbl_opt.insertRow(r)
-            self.tbl_opt.setItem(r, 0, QtWidgets.QTableWidgetItem(str(name)))
-            self.tbl_opt.setItem(r, 1, QtWidgets.QTableWidgetItem(str(host)))
-            self.tbl_opt.setItem(r, 2, QtWidgets.QTableWidgetItem(f"{ping:.0f} ms" if ping < 9000 else "-"))
-            self.tbl_opt.setItem(r, 3, QtWidgets.QTableWidgetItem(f"{loss*100:.0f}%"))
-            self.tbl_opt.setItem(r, 4, QtWidgets.QTableWidgetItem(f"{jitter:.1f} ms"))
-        self.tbl_opt.resizeColumnsToContents()
+        self._opt_model.set_rows(ranked[:10])
 
         # Suggest applying best DNS (Accept/Deny)
         if not ranked:
             return
 
         beh = (self.settings.data.get("behavior", {}) or {})
-        if not bool(beh.get("auto_suggestions", True)):
+        self._record_dns_samples(ranked)
+        best = self._pick_suggested_dns() if bool(beh.get("auto_suggestions", True)) else None
+        if not best:
             return
 
-        best_idx = ranked[0][0]
-        servers = (self.settings.data.get("dns", {}) or {}).get("servers", []) or []
-        best = servers[best_idx] if best_idx < len(servers) else None
-        if not best:
+        # one answer per server and profile: skip the dialog when this was the last one offered
+        server = best.get("server")
+        prof = self.settings.active_profile_dict()
+        if server in (prof.get("suggested_dns"), prof.get("last_suggested_dns")):
             return
 
         mb = QtWidgets.QMessageBox(self)
         mb.setWindowTitle("Apply suggestion?")
         mb.setIcon(QtWidgets.QMessageBox.Icon.Question)
-        mb.setText(f"Suggested DNS: {best.get('name')} - {best.get('server')}\nApply as top suggestion for current profile?")
+        mb.setText(f"Suggested DNS: {best.get('name')} - {server}\nApply as top suggestion for current profile?")
         mb.setStandardButtons(QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No)
+        prof["last_suggested_dns"] = server
         if mb.exec() == QtWidgets.QMessageBox.StandardButton.Yes:
             # store as profile override (does not force OS dns)
-            prof = self.settings.get_active_profile()
-            self.settings.data.setdefault("profiles", {}).setdefault("items", {}).setdefault(prof, {})["suggested_dns"] = best.get("server")
-            self.settings.save()
+            prof["suggested_dns"] = server
+        self.settings.schedule_save()
+
+    def _record_dns_samples(self, ranked: list):
+        """Fold this run into each server's sample window (dns.rank_cache.samples)."""
+        self.settings.rank_cache_push(
+            {host: [round(ping, 1), round(loss, 3), round(jitter, 1)] for _idx, _name, host, ping, loss, jitter in ranked},
+            _DNS_SCORE_WINDOW,
+        )
+
+    def _pick_suggested_dns(self) -> Optional[Dict[str, Any]]:
+        """Weighted-random pick among the top window scores; None when nothing has a usable score."""
+        get = self.settings.get_path
+        windows = get(("dns", "rank_cache", "samples"), {})
+        by_host = {(s.get("server") or "").strip(): s for s in get(("dns", "servers"), [])}
+        scored = sorted(
+            ((_dns_window_score(windows[h]), h) for h in by_host if h in windows),
+            reverse=True,
+        )[:_DNS_SUGGEST_TOP_K]
+        scored = [(sc, h) for sc, h in scored if sc > 0.0]
+        if not scored:
+            return None
+
+        # explore while the lead changes hands; once one server held it for a few runs, suggest that one
+        top = scored[0][1]
+        leader = dict(get(("dns", "rank_cache", "leader"), {}))
+        leader["runs"] = int(leader.get("runs", 0)) + 1 if leader.get("server") == top else 1
+        leader["server"] = top
+        self.settings.rank_cache_set("leader", leader)
+        if leader["runs"] >= _DNS_SUGGEST_SETTLE_RUNS:
+            return by_host.get(top)
+        pick = random.choices([h for _, h in scored], weights=[sc for sc, _ in scored])[0]
+        return by_host.get(pick)
 
     def _on_opt_fail(self, err: str):
         self.btn_optimize.setEnabled(True)
@@ -2461,37 +3601,53 @@ class SettingsPage(QtWidgets.QWidget):
     # ---------------------
 
     def _append_log(self, line: str):
-        self.term.append(line)
-        self.term.moveCursor(QtGui.QTextCursor.MoveOperation.End)
+        self._log_buf.append(line)
+        if not self._log_flush.isActive():
+            self._log_flush.start()
+
+    def _flush_log(self):
+        if not self._log_buf:
+            return
+        text = "\n".join(self._log_buf)
+        self._log_buf.clear()
+        sb = self.term.verticalScrollBar()
+        at_bottom = sb.value() == sb.maximum()  # don't yank the view if the user scrolled up
+        with _bulk_update(self.term):
+            self.term.appendPlainText(text)
+        if at_bottom:
+            sb.setValue(sb.maximum())
 
     def _update_core(self, name: str):
+        if name in self._updates_inflight:
+            return
         repos = (self.settings.data.get("core_updates", {}) or {}).get("repos", {}) or {}
         if name == "singbox":
             repo = repos.get("singbox", "SagerNet/sing-box")
-            self._append_log(f"[INFO] Checking latest release: {repo}")
-            try:
-                tag = self.updater.update_singbox(repo)
-                self._append_log(f"[INFO] sing-box updated to {tag}")
-            except Exception as e:
-                self._append_log(f"[ERROR] sing-box update failed: {e}")
-            finally:
-                self.updater.cleanup_tmp()
-
-        if name == "clash":
+        elif name == "clash":
             repo = repos.get("clash", "MetaCubeX/mihomo")
-            self._append_log(f"[INFO] Checking latest release: {repo}")
-            try:
-                tag = self.updater.update_mihomo(repo)
-                self._append_log(f"[INFO] mihomo updated to {tag}")
-            except Exception as e:
-                self._append_log(f"[ERROR] mihomo update failed: {e}")
-            finally:
-                self.updater.cleanup_tmp()
+        else:
+            return
+        self._updates_inflight.add(name)
+        self._sync_update_buttons()
+        QtCore.QThreadPool.globalInstance().start(CoreUpdateWorker(name, repo, self._update_signals))
 
     def _update_all(self):
+        # independent downloads; both run at once
         self._update_core("singbox")
         self._update_core("clash")
 
+    def _on_core_update_finished(self, name: str, ok: bool):
+        self._updates_inflight.discard(name)
+        if ok:
+            self.engine.invalidate_core_paths()
+        self._sync_update_buttons()
+
+    def _sync_update_buttons(self):
+        busy = self._updates_inflight
+        self.btn_upd_sing.setEnabled("singbox" not in busy)
+        self.btn_upd_mihomo.setEnabled("clash" not in busy)
+        self.btn_upd_all.setEnabled(not busy)
+
 
 # ---------------------
 # First run wizard
@@ -2534,9 +3690,11 @@ class FirstRunWizard(QtWidgets.QDialog):
         f = QtWidgets.QFormLayout(gb)
         f.setLabelAlignment(QtCore.Qt.AlignmentFlag.AlignLeft)
         self.chk_default_dns = QtWidgets.QCheckBox("Enable curated DNS list (Iran + Global)")
-        self.chk_default_dns.setChecked(bool(self.settings.data.get("assist", {}) or {}).get("default_dns_packs_enabled", True))
+        assist = self.settings.data.get("assist") or {}
+        ui = self.settings.ui()
+        self.chk_default_dns.setChecked(bool(assist.get("default_dns_packs_enabled", True)))
         self.chk_bitrate = QtWidgets.QCheckBox("Show bitrate helper on Dashboard (Streaming profile)")
-        self.chk_bitrate.setChecked(bool(self.settings.data.get("ui", {}) or {}).get("show_stream_bitrate_on_dashboard", True))
+        self.chk_bitrate.setChecked(bool(ui.get("show_stream_bitrate_on_dashboard", True)))
         self.chk_ping_check = QtWidgets.QCheckBox("Run one-time safe checks now (DNS ping only)")
         self.chk_ping_check.setChecked(False)
 
@@ -2554,6 +3712,8 @@ class FirstRunWizard(QtWidgets.QDialog):
         btns.accepted.connect(self._apply)
         btns.rejected.connect(self.reject)
         root.addWidget(btns)
+        self._btns = btns
+        self._ping_worker: Optional[DnsSafeCheckWorker] = None
 
     def _selected_mode(self) -> str:
         if self.rb_basic.isChecked():
@@ -2563,49 +3723,55 @@ class FirstRunWizard(QtWidgets.QDialog):
         return "Helpful"
 
     def _apply(self):
-        # snapshot, then apply
-        self.settings.create_snapshot("First Run Setup")
+        with self.settings.batch():
+            # snapshot, then apply
+            self.settings.create_snapshot("First Run Setup")
 
-        # copilot
-        self.settings.set_copilot_mode(self._selected_mode())
+            # copilot
+            self.settings.set_copilot_mode(self._selected_mode())
 
-        # defaults
-        self.settings.data.setdefault("assist", {})["default_dns_packs_enabled"] = self.chk_default_dns.isChecked()
-        self.settings.data.setdefault("ui", {})["show_stream_bitrate_on_dashboard"] = self.chk_bitrate.isChecked()
+            # defaults
+            self.settings.data.setdefault("assist", {})["default_dns_packs_enabled"] = self.chk_default_dns.isChecked()
+            self.settings.data.setdefault("ui", {})["show_stream_bitrate_on_dashboard"] = self.chk_bitrate.isChecked()
 
-        if self.chk_ping_check.isChecked():
-            self._run_safe_dns_ping_check()
+            self.settings.mark_first_run_completed()
 
-        self.settings.mark_first_run_completed()
-        self.accept()
+        if self.chk_ping_check.isChecked():
+            self._run_safe_dns_ping_check()  # accepts once the pings are back
+        else:
+            self.accept()
 
     def _run_safe_dns_ping_check(self):
         # user-approved: only ICMP pings (no downloads/uploads)
+        servers = self.settings.get_path(("dns", "servers"), [])
+        # cap for speed
+        hosts = [h for h in (str(s.get("server", "")).strip() for s in servers[:8]) if h]
+        if not hosts:
+            self.accept()
+            return
+
         self.lbl_log.setText("Running safe DNS ping checks...")
-        QtWidgets.QApplication.processEvents()
+        self._btns.setEnabled(False)
+        self._ping_worker = DnsSafeCheckWorker(hosts, self)
+        self._ping_worker.progress.connect(self._on_safe_ping_progress)
+        self._ping_worker.done.connect(self._on_safe_ping_done)
+        self._ping_worker.start()
 
-        servers = (self.settings.data.get("dns", {}) or {}).get("servers", []) or []
-        # cap for speed
-        servers = servers[:8]
-        results = []
-        for s in servers:
-            ip = str(s.get("ip", "")).strip()
-            if not ip:
-                continue
-            ms = None
-            try:
-                out = subprocess.check_output(_ping_cmd(ip), stderr=subprocess.STDOUT, text=True, timeout=3)
-                ms = _parse_ping_ms(out)
-            except Exception:
-                ms = None
-            results.append((ip, ms))
+    def _on_safe_ping_progress(self, finished: int, total: int):
+        self.lbl_log.setText(f"Running safe DNS ping checks... ({finished}/{total})")
 
-        cache = self.settings.data.setdefault("dns", {}).setdefault("rank_cache", {})
-        cache["safe_ping"] = {ip: {"ping_ms": ms, "at": _now_hms()} for ip, ms in results}
-        self.settings.save()
+    def _on_safe_ping_done(self, results: list):
+        self.settings.rank_cache_set("safe_ping", {ip: {"ping_ms": ms, "at": _now_hms()} for ip, ms in results})
 
         ok = [r for r in results if r[1] is not None]
         self.lbl_log.setText(f"Safe checks complete. ({len(ok)}/{len(results)}) DNS targets responded.")
+        self._btns.setEnabled(True)
+        self.accept()
+
+    def reject(self):
+        if self._ping_worker is not None and self._ping_worker.isRunning():
+            return  # settings are already applied; wait for the pings to be recorded
+        super().reject()
 
 
 # ---------------------